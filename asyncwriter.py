@@ -0,0 +1,77 @@
+import queue
+import threading
+import time
+
+
+class WriterError(Exception):
+    """Raised in the simulation thread when a write on the writer thread failed."""
+
+
+class BackgroundWriter:
+    """
+    Runs file writes on one daemon thread, in the order they were submitted.
+    The simulation hands over a function and arguments it no longer touches; the
+    bounded queue makes submit() wait when the disk falls behind (backpressure).
+    A failed write is sticky: the writes queued after it are not attempted, and every
+    later submit, check, drain or close raises WriterError, so the run stops instead
+    of carrying on with a gap in its logs. Writes keep their order, and the simulation's
+    checkpoint write fsyncs the logs before it, so every checkpoint that reached the disk
+    has all of its log rows on disk too.
+    """
+
+    def __init__(self, max_pending=64, name='simulation-writer'):
+        self._queue = queue.Queue(maxsize=max_pending)
+        self.error = None
+        self._closed = False
+        self.stalls = 0  # Submits that found the queue full
+        self.stall_seconds = 0.0
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            task = self._queue.get()
+            try:
+                if task is None:
+                    return
+                if self.error is None:
+                    fn, args = task
+                    fn(*args)
+            except Exception as e:
+                self.error = e
+            finally:
+                self._queue.task_done()
+
+    def check(self):
+        """Raises WriterError if a write has failed."""
+        if self.error is not None:
+            raise WriterError(f"Background write failed: {self.error!r}") from self.error
+
+    def submit(self, fn, *args):
+        """Queues fn(*args); blocks while the queue is full."""
+        self.check()
+        if self._closed:
+            raise WriterError("Writer is closed")
+        try:
+            self._queue.put_nowait((fn, args))
+        except queue.Full:
+            start = time.perf_counter()
+            self._queue.put((fn, args))
+            self.stalls += 1
+            self.stall_seconds += time.perf_counter() - start
+
+    def drain(self):
+        """Waits until every queued write has finished."""
+        self._queue.join()
+        self.check()
+
+    def close(self):
+        """Finishes the queued writes and stops the thread; safe to call again after an interruption."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join()
+        self.check()
+
+    def is_alive(self):
+        return self._thread.is_alive()
@@ -0,0 +1,77 @@
+"""
+Scraper throughput benchmark against the local mock PokéAPI.
+
+Runs a full PokemonDataScraper pass (no response cache, no rate limit) at each
+worker count and reports wall time, requests/sec and bytes transferred.
+
+    python benchmarks/bench_scraper.py --count 300 --workers 1 4 8 16 --latency 0.02
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_pokeapi import MockPokeAPI, load_fixtures
+from pokeapi import PokemonDataScraper
+
+
+def bench_scraper(names, bodies, workers, latency=0.02, jitter=0.0, error_rate=0.0, seed=0):
+    """One scrape of the mock at the given concurrency. Returns a result row."""
+    with MockPokeAPI(names, bodies, latency=latency, jitter=jitter, error_rate=error_rate, seed=seed) as api, \
+            tempfile.TemporaryDirectory() as temp_dir:
+        scraper = PokemonDataScraper(base_url=api.base_url, max_workers=workers, requests_per_second=0,
+                                     backoff=0.05, cache_mode='off')
+        start_time = time.perf_counter()
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            df = scraper.scrape_all_pokemon(output=os.path.join(temp_dir, 'bench.csv'))
+        wall_time = time.perf_counter() - start_time
+
+    return {
+        'workers': workers,
+        'pokemon': len(df),
+        'requests': scraper.stats['requests'],
+        'bytes': scraper.stats['bytes'],
+        'errors_injected': api.stats['errors'],
+        'wall_time_s': wall_time,
+        'requests_per_s': scraper.stats['requests'] / wall_time,
+        'pokemon_per_s': len(df) / wall_time
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PokemonDataScraper against the local mock PokéAPI.")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8, 16], help="Concurrency settings to run")
+    parser.add_argument('--count', type=int, default=300, help="Pokémon served by the mock")
+    parser.add_argument('--latency', type=float, default=0.02, help="Mock response latency in seconds")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Standard deviation of the latency")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument('--database', default='pokemon_complete_database.csv')
+    parser.add_argument('--cache-dir', default=None, help="Use fixtures recorded in a pokeapi.py response cache")
+    parser.add_argument('--json', default=None, help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    names, bodies = load_fixtures(args.database, args.cache_dir, args.count)
+    print(f"Mock PokéAPI: {len(names)} Pokémon, {args.latency * 1000:.0f} ms latency, "
+          f"{args.error_rate:.0%} errors\n")
+    print(f"{'Workers':>8} {'Wall (s)':>10} {'Req/s':>10} {'Pokémon/s':>10} {'Requests':>10} {'MB':>8}")
+
+    results = []
+    for workers in args.workers:
+        result = bench_scraper(names, bodies, workers, args.latency, args.jitter, args.error_rate)
+        results.append(result)
+        print(f"{workers:>8} {result['wall_time_s']:>10.2f} {result['requests_per_s']:>10.1f} "
+              f"{result['pokemon_per_s']:>10.1f} {result['requests']:>10,} {result['bytes'] / 1e6:>8.2f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=4)
+        print(f"\n✓ Results saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
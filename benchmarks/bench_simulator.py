@@ -0,0 +1,270 @@
+"""
+Reproducible benchmarks for the simulator's hot paths, run headlessly against the
+bundled pokedex.json with fixed seeds:
+
+  - encounters/sec of each engine for a complete run, log writes included (shiny rate
+    'both', guaranteed catch by default, so even the scalar engine finishes in seconds)
+  - ETA latency: full expectation, incremental update per new unique, percentiles
+  - save_checkpoint / load_checkpoint time
+  - output_final_reports, shiny-stat rebuild and CSV export for a synthetic 1M-row shiny log
+
+Results are saved as JSON; --compare prints the change against an earlier result file.
+
+    python benchmarks/bench_simulator.py
+    python benchmarks/bench_simulator.py --engines event batch --compare benchmarks/results/<earlier>.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+import shinylog
+from prediction import expected_completion_encounters
+from simulator import ShinySimulation
+
+DEFAULT_ENGINES = ('scalar', 'batch', 'event')  # 'sharded' depends on the core count; opt in with --engines
+NOISE_THRESHOLD = 0.05  # Relative changes smaller than this are not flagged by --compare
+
+
+@contextmanager
+def _quiet():
+    """Sends stdout to /dev/null for code that prints progress."""
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        yield
+
+
+def _time(fn, repeat=5):
+    """Runs fn `repeat` times. Returns {'median_s', 'min_s', 'runs'}."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return {'median_s': statistics.median(durations), 'min_s': min(durations), 'runs': repeat}
+
+
+def _simulation(args, reports_dir, run_name, engine='event'):
+    with _quiet():
+        return ShinySimulation(excel_path=args.pokedex, reports_dir=reports_dir, run_name=run_name,
+                               shiny_modifier=args.modifier, guaranteed_catch=args.guaranteed, engine=engine,
+                               seed=args.seed, save_master_results=False, register_run=False)
+
+
+def bench_engines(args, reports_dir):
+    """
+    Times each engine for one complete run from the same seed, with the logs, writer
+    thread and monitor thread that run() sets up around the loop.
+    """
+    results = {}
+    for engine in args.engines:
+        simulation = _simulation(args, reports_dir, f"bench_{engine}", engine)
+        loop = getattr(simulation, f"_run_{engine}_loop")
+        os.makedirs(simulation.REPORTS_DIR, exist_ok=True)
+        with _quiet():
+            start = time.perf_counter()
+            simulation._open_logs()
+            try:
+                simulation._start_monitor()
+                try:
+                    loop()
+                finally:
+                    simulation._stop_monitor()
+            finally:
+                simulation._close_logs()
+            seconds = time.perf_counter() - start
+        results[engine] = {
+            'encounters': simulation.total_encounter,
+            'seconds': seconds,
+            'encounters_per_s': simulation.total_encounter / seconds
+        }
+        print(f"  {engine:<8} {simulation.total_encounter:>14,} encounters in {seconds:7.2f}s "
+              f"= {simulation.total_encounter / seconds:>12,.0f} EPS")
+    return results
+
+
+def bench_eta(simulation):
+    """Latency of the expectation, per-unique incremental updates and the percentile ETAs."""
+    results = {'expected_remaining_full': _time(
+        lambda: expected_completion_encounters(simulation.completion_probabilities), 10)}
+
+    def build_estimator():
+        simulation.eta_estimator = None
+        simulation._update_eta()
+
+    results['eta_estimator_build'] = _time(build_estimator, 5)
+    updates = []
+    for species in range(min(500, simulation.total_pokemon - 1)):
+        start = time.perf_counter()
+        simulation._update_eta(species)
+        updates.append(time.perf_counter() - start)
+    results['eta_incremental_update'] = {'median_s': statistics.median(updates), 'min_s': min(updates),
+                                         'runs': len(updates)}
+    simulation.eta_estimator = None
+
+    def percentiles():
+        simulation._distribution_cache.clear()
+        simulation.completion_distribution()
+
+    results['completion_percentiles'] = _time(percentiles, 5)
+    for name, result in results.items():
+        print(f"  {name:<26} {result['median_s'] * 1000:10.3f} ms")
+    return results
+
+
+def load_synthetic_log(simulation, rows, seed):
+    """
+    Writes a synthetic shiny log of `rows` shiny encounters drawn from the simulation's
+    spawn and catch model, and loads the matching end-of-run state into the simulation.
+    """
+    rng = np.random.default_rng(seed)
+    encounters = np.cumsum(rng.geometric(simulation.SHINY_RATE, rows)).astype(np.int64)
+    species = simulation.species_sampler.draw_many(rows, rng)
+    caught = rng.random(rows) <= simulation.catch_probabilities[species]
+
+    caught_index = np.flatnonzero(caught)
+    _, first_catch = np.unique(species[caught_index], return_index=True)
+    is_new = np.zeros(rows, dtype=bool)
+    is_new[caught_index[first_catch]] = True
+
+    records = np.zeros(rows, dtype=shinylog.RECORD_DTYPE)
+    records['encounter'] = encounters
+    records['species'] = species
+    records['flags'] = caught * shinylog.FLAG_CAUGHT | is_new * shinylog.FLAG_NEW_SHINY
+    os.makedirs(simulation.REPORTS_DIR, exist_ok=True)
+    writer = shinylog.ShinyLogWriter(simulation.SHINY_LOG_FILE, simulation.pokemon_for_encountering)
+    writer.append_records(records)
+    writer.close()
+
+    total = int(encounters[-1])
+    simulation.total_encounter = total
+    simulation.total_shinies_encountered = rows
+    simulation.total_shinies_caught = int(caught.sum())
+    simulation.total_shinies_missed = rows - simulation.total_shinies_caught
+    simulation.total_normals_caught = total - rows
+    simulation.shiny_box_counts[:] = np.bincount(species[caught], minlength=simulation.total_pokemon)
+    simulation.shiny_dex[:] = simulation.shiny_box_counts > 0
+    simulation.unique_shinies = int(simulation.shiny_dex.sum())
+    simulation.normal_box_counts[:] = rng.multinomial(total - rows, simulation.spawn_probabilities)
+    simulation.shiny_stats = shinylog.empty_species_stats(simulation.total_pokemon)
+    shinylog.accumulate_species_stats(simulation.shiny_stats, encounters, species, caught)
+
+
+def bench_state_and_reports(args, reports_dir):
+    """Checkpoint and report timings on the end state of a synthetic 1M-row shiny log."""
+    simulation = _simulation(args, reports_dir, 'bench_reports')
+    load_synthetic_log(simulation, args.log_rows, args.seed)
+    print(f"  Synthetic log: {args.log_rows:,} shiny rows over {simulation.total_encounter:,} encounters "
+          f"({os.path.getsize(simulation.SHINY_LOG_FILE) / 1e6:.1f} MB)")
+
+    results = {}
+    with _quiet():
+        results['save_checkpoint'] = _time(simulation.save_checkpoint, 10)
+        results['load_checkpoint'] = _time(simulation.load_checkpoint, 10)
+        results['output_final_reports'] = _time(simulation.output_final_reports, 3)
+    results['shiny_stats_rebuild'] = _time(lambda: shinylog.species_stats(simulation.SHINY_LOG_FILE), 3)
+    csv_path = os.path.join(simulation.REPORTS_DIR, 'shiny_analysis_log.csv')
+    results['shiny_log_csv_export'] = _time(lambda: shinylog.to_csv(simulation.SHINY_LOG_FILE, csv_path), 1)
+    for name, result in results.items():
+        print(f"  {name:<26} {result['median_s'] * 1000:10.1f} ms")
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _flatten(results):
+    """{'group.name': value} for every timed or throughput figure."""
+    flat = {}
+    for group, entries in results.items():
+        for name, result in entries.items():
+            if 'encounters_per_s' in result:
+                flat[f"{group}.{name}.encounters_per_s"] = result['encounters_per_s']
+            else:
+                flat[f"{group}.{name}.median_s"] = result['median_s']
+    return flat
+
+
+def compare(current, previous):
+    """Prints each figure against an earlier result file. Higher EPS and lower times are better."""
+    old = _flatten(previous['results'])
+    print(f"\nCompared with {previous['meta'].get('commit') or 'previous run'} "
+          f"({previous['meta'].get('timestamp', '?')}):")
+    if previous['meta'].get('settings') != current['meta']['settings']:
+        print(f"  ⚠ Settings differ: {previous['meta'].get('settings')}")
+    for key, value in _flatten(current['results']).items():
+        if key not in old or not old[key]:
+            continue
+        change = value / old[key] - 1
+        better = change > 0 if key.endswith('encounters_per_s') else change < 0
+        marker = " " if abs(change) <= NOISE_THRESHOLD else "✓" if better else "⚠"
+        print(f"  {marker} {key:<50} {change:+8.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the simulator's hot paths.")
+    parser.add_argument('--engines', nargs='+', default=list(DEFAULT_ENGINES), choices=list(ShinySimulation.ENGINES))
+    parser.add_argument('--modifier', default='both', choices=list(ShinySimulation.SHINY_RATES))
+    parser.add_argument('--normal-catch', dest='guaranteed', action='store_false',
+                        help="Use catch rates instead of guaranteed catches (much longer runs)")
+    parser.add_argument('--seed', type=int, default=2024)
+    parser.add_argument('--log-rows', type=int, default=1_000_000, help="Rows in the synthetic shiny log")
+    parser.add_argument('--pokedex', default=os.path.join(ROOT, 'pokedex.json'))
+    parser.add_argument('--output', default=None, help="Result file (default: benchmarks/results/simulator_<time>_<commit>.json)")
+    parser.add_argument('--compare', default=None, help="Earlier result file to compare against")
+    args = parser.parse_args()
+
+    commit = _git_commit()
+    results = {}
+    with tempfile.TemporaryDirectory() as reports_dir:
+        print(f"Engines ({args.modifier}, {'guaranteed' if args.guaranteed else 'normal'} catch, seed {args.seed}):")
+        results['engines'] = bench_engines(args, reports_dir)
+        print("ETA computation:")
+        results['eta'] = bench_eta(_simulation(args, reports_dir, 'bench_eta'))
+        print("Checkpoints and reports:")
+        results['reports'] = bench_state_and_reports(args, reports_dir)
+
+    output = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'commit': commit,
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'settings': {'engines': args.engines, 'modifier': args.modifier, 'guaranteed_catch': args.guaranteed,
+                         'seed': args.seed, 'log_rows': args.log_rows, 'pokedex': os.path.basename(args.pokedex)}
+        },
+        'results': results
+    }
+
+    path = args.output or os.path.join(ROOT, 'benchmarks', 'results',
+                                       f"simulator_{datetime.now():%Y%m%d_%H%M%S}_{commit or 'nogit'}.json")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(output, f, indent=4)
+    print(f"\n✓ Results saved to {path}")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            compare(output, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
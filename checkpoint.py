@@ -0,0 +1,128 @@
+import json
+import os
+import struct
+import tempfile
+import numpy as np
+
+# File layout (little-endian):
+#   8 bytes   magic
+#   uint16    format version
+#   uint32    header length
+#   header    UTF-8 JSON: run state, species order and array descriptors
+#   arrays    raw array bytes, back to back in header order
+MAGIC = b'SHNYCKPT'
+FORMAT_VERSION = 1
+_PREAMBLE = struct.Struct('<8sHI')
+
+
+class CheckpointError(Exception):
+    """Raised when a checkpoint file is missing pieces or has an unknown format."""
+
+
+def pack_bitset(flags):
+    """Packs a boolean array into a bitset."""
+    return np.packbits(np.asarray(flags, dtype=bool))
+
+
+def unpack_bitset(bits, length):
+    """Unpacks a bitset back into a boolean array of the given length."""
+    return np.unpackbits(np.asarray(bits, dtype=np.uint8), count=length).astype(bool)
+
+
+def write_atomic(path, data):
+    """
+    Writes bytes to path via a temp file, fsync and rename, so a crash mid-write
+    leaves the previous file intact. Each call gets its own temp file, so
+    concurrent writers of the same path do not collide; the last rename wins.
+    """
+    directory = os.path.dirname(path) or '.'
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+    # Persist the rename itself where the platform allows it
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def encode_checkpoint(state, species, arrays):
+    """Serializes run state, the species order and named NumPy arrays to bytes."""
+    descriptors = []
+    payload = []
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        descriptors.append({'name': name, 'dtype': array.dtype.str, 'length': int(array.size)})
+        payload.append(array.tobytes())
+
+    header = json.dumps({'state': state, 'species': list(species), 'arrays': descriptors}).encode('utf-8')
+    return _PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)) + header + b''.join(payload)
+
+
+def write_checkpoint(path, state, species, arrays):
+    """Atomically writes a binary checkpoint."""
+    write_atomic(path, encode_checkpoint(state, species, arrays))
+
+
+def read_checkpoint(path):
+    """Reads a binary checkpoint. Returns (state, species, arrays)."""
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    if len(data) < _PREAMBLE.size:
+        raise CheckpointError(f"'{path}' is truncated")
+    magic, version, header_length = _PREAMBLE.unpack_from(data)
+    if magic != MAGIC:
+        raise CheckpointError(f"'{path}' is not a binary checkpoint")
+    if version > FORMAT_VERSION:
+        raise CheckpointError(f"'{path}' uses checkpoint format v{version}; this version reads up to v{FORMAT_VERSION}")
+
+    offset = _PREAMBLE.size
+    header = json.loads(data[offset:offset + header_length].decode('utf-8'))
+    offset += header_length
+
+    arrays = {}
+    for descriptor in header['arrays']:
+        dtype = np.dtype(descriptor['dtype'])
+        size = dtype.itemsize * descriptor['length']
+        if offset + size > len(data):
+            raise CheckpointError(f"'{path}' is truncated in array '{descriptor['name']}'")
+        arrays[descriptor['name']] = np.frombuffer(data, dtype=dtype, count=descriptor['length'], offset=offset).copy()
+        offset += size
+
+    return header['state'], header['species'], arrays
+
+
+def checkpoint_to_json(state, species, arrays):
+    """Builds the name-keyed JSON checkpoint layout used by collectorcalc.py."""
+    total = len(species)
+    shiny_dex = unpack_bitset(arrays['shiny_dex'], total)
+    normal_dex = unpack_bitset(arrays['normal_dex'], total)
+    exported = dict(state)
+    exported.update({
+        'shiny_dex': [name for name, flag in zip(species, shiny_dex) if flag],
+        'normal_dex': [name for name, flag in zip(species, normal_dex) if flag],
+        'shiny_box_counts': {name: int(count) for name, count in zip(species, arrays['shiny_box_counts']) if count},
+        'normal_box_counts': {name: int(count) for name, count in zip(species, arrays['normal_box_counts']) if count}
+    })
+    return exported
+
+
+def export_checkpoint_json(path, json_path):
+    """Exports a binary checkpoint as JSON for collectorcalc-style consumers."""
+    exported = checkpoint_to_json(*read_checkpoint(path))
+    write_atomic(json_path, json.dumps(exported, indent=4).encode('utf-8'))
+    return exported
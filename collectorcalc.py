@@ -5,6 +5,8 @@ This estimate model uses the remaining pokemon from the checkpoint.
 import pandas as pd
 import json
 import os
+from prediction import expected_completion_encounters, completion_percentiles
+from pokedata import load_pokedex, PokedexError
 
 #  FILE PATHS
 # Path to your main simulation's checkpoint file
@@ -14,23 +16,26 @@ EXCEL_PATH = r'C:\Users\rela8\Documents\C VS Code\Project Files\Python Projects\
 
 
 #  1. LOAD AND PROCESS POKEMON DATA 
-try:
-    pokedex_df = pd.read_excel(EXCEL_PATH, sheet_name='Pokedex')
-except FileNotFoundError:
-    print(f"FATAL ERROR: Could not find the Excel file at '{EXCEL_PATH}'")
-    # Exit if we can't load the main data
-    exit()
 
     #  MATCH SIMULATION PARAMETERS 
 STABILITY_CONSTANT = 100
 RARITY_EXPONENT = 1.8
 SHINY_RATE = 1 / 4096
 
-    # Calculate probabilities exactly like your simulation
-pokedex_df['Spawn Weight'] = 1 / ((pokedex_df['base total'] + STABILITY_CONSTANT) ** RARITY_EXPONENT)
-total_spawn_weight = pokedex_df['Spawn Weight'].sum()
-pokedex_df['Spawn Probability'] = pokedex_df['Spawn Weight'] / total_spawn_weight
-pokedex_df['Catch Probability'] = pokedex_df['Catch Rate'] / 255
+    # Same compiled (and cached) pokedex as the simulation, so the spawn weights match exactly
+try:
+    pokedex_columns, _ = load_pokedex(EXCEL_PATH, 'Pokedex', stability=STABILITY_CONSTANT, rarity=RARITY_EXPONENT)
+except PokedexError as e:
+    print(f"FATAL ERROR: {e}")
+    # Exit if we can't load the main data
+    exit()
+
+pokedex_df = pd.DataFrame({
+    'name': pokedex_columns['name'],
+    'base total': pokedex_columns['base_total'],
+    'Spawn Probability': pokedex_columns['spawn_probability'],
+    'Catch Probability': pokedex_columns['catch_probability']
+})
 pokedex_df['p_i'] = pokedex_df['Spawn Probability'] * pokedex_df['Catch Probability'] * SHINY_RATE
 
 
@@ -52,21 +57,10 @@ except (FileNotFoundError, json.JSONDecodeError):
     pass
 
 
-# 3. THE CALCULATION FUNCTION (Same as before) 
+# 3. THE CALCULATION FUNCTION (Same as the simulator's)
 def calculate_expected_encounters(probabilities):
-    """Weighted Coupon Collector's Problem formula."""
-    remaining_probabilities = sorted(probabilities, reverse=True)
-    total_expected_encounters = 0
-    
-    while remaining_probabilities:
-        sum_of_current_probabilities = sum(remaining_probabilities)
-        if sum_of_current_probabilities == 0:
-            break
-        encounters_for_next_unique = 1 / sum_of_current_probabilities
-        total_expected_encounters += encounters_for_next_unique
-        remaining_probabilities.pop(0)
-    
-    return total_expected_encounters
+    """Weighted Coupon Collector's Problem: exact expectation from prediction.py."""
+    return expected_completion_encounters(probabilities)
 
 
 #  4. CALCULATE AND DISPLAY THE PREDICTION 
@@ -108,4 +102,9 @@ print(f"Estimated Hours Remaining: {time_remaining_hours:.2f}")
 if time_remaining_days > 1:
     print(f"Estimated Days Remaining: {time_remaining_days:.2f}")
 
+    # Completion time is heavy-tailed, so plan machine time off the percentiles
+print("\n--- COMPLETION PERCENTILES ---")
+for quantile, encounters in completion_percentiles(remaining_pi_probabilities).items():
+    print(f"P{quantile * 100:g}: {encounters:,.0f} more encounters (~{encounters / EPS / 3600:.1f} hours)")
+
 print("=" * 60)
\ No newline at end of file
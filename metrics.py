@@ -0,0 +1,269 @@
+import collections
+import functools
+import gc
+import json
+import os
+import signal
+import sys
+import threading
+import time
+
+from checkpoint import write_atomic
+
+EXPORT_FORMATS = ('prometheus', 'jsonl')
+METRIC_PREFIX = 'shiny_sim'
+
+
+class Metrics:
+    """
+    Opt-in instrumentation for a simulation run: per-section timers, GC pauses and
+    rolling-window EPS/SPS, exported to a Prometheus textfile or a JSON-lines file.
+    Sections are timed by wrapping methods on the instance (instrument), so a run
+    without a Metrics object executes exactly the uninstrumented code.
+    Section times are exclusive: a flush inside save_checkpoint counts as 'flush' only.
+    Sections timed on other threads (the monitor's progress and ETA refreshes) run
+    alongside the loop, so they are not subtracted from its untimed 'sampling' time.
+    """
+
+    def __init__(self, path, export_format='prometheus', window_seconds=60.0, export_interval=10.0, labels=None):
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown metrics format '{export_format}'. Options: {', '.join(EXPORT_FORMATS)}")
+        self.path = path
+        self.export_format = export_format
+        self.window_seconds = window_seconds
+        self.export_interval = export_interval
+        self.labels = labels or {}
+
+        self.sections = {}  # name -> [calls, exclusive seconds, max seconds]
+        self._local = threading.local()  # Per-thread stack of [name, start, child seconds] for running sections
+        self._owner = threading.get_ident()  # The loop's thread
+        self._owner_seconds = 0.0  # Exclusive section time on the loop's thread
+        self._window = collections.deque()  # (time, encounters, shinies caught) samples
+        self._lock = threading.Lock()
+        self.started = time.perf_counter()
+        self._last_export = 0.0
+        self.gc_collections = 0
+        self.gc_seconds = 0.0
+        self._gc_start = None
+        self.latest = {}
+
+    # --- Section timers ---
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _enter(self, name):
+        self._stack().append([name, time.perf_counter(), 0.0])
+
+    def _exit(self):
+        stack = self._stack()
+        name, start, child_seconds = stack.pop()
+        elapsed = time.perf_counter() - start
+        exclusive = elapsed - child_seconds
+        if stack:
+            stack[-1][2] += elapsed
+
+        with self._lock:
+            section = self.sections.get(name)
+            if section is None:
+                section = self.sections[name] = [0, 0.0, 0.0]
+            section[0] += 1
+            section[1] += exclusive
+            if exclusive > section[2]:
+                section[2] = exclusive
+            if threading.get_ident() == self._owner:
+                self._owner_seconds += exclusive
+
+    def instrument(self, obj, method_name, section):
+        """Replaces obj.method_name with a version timed under the given section name."""
+        method = getattr(obj, method_name)
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            self._enter(section)
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self._exit()
+
+        setattr(obj, method_name, timed)
+
+    def _gc_callback(self, phase, info):
+        if phase == 'start':
+            self._gc_start = time.perf_counter()
+        elif self._gc_start is not None:
+            self.gc_seconds += time.perf_counter() - self._gc_start
+            self.gc_collections += 1
+            self._gc_start = None
+
+    def start(self):
+        gc.callbacks.append(self._gc_callback)
+        return self
+
+    def stop(self):
+        if self._gc_callback in gc.callbacks:
+            gc.callbacks.remove(self._gc_callback)
+
+    # --- Rolling rates ---
+    def sample(self, encounters, shinies_caught, unique_shinies, total_pokemon):
+        """Records a progress sample and exports when the export interval has passed."""
+        now = time.perf_counter()
+        with self._lock:
+            self._window.append((now, encounters, shinies_caught))
+            while len(self._window) > 2 and now - self._window[1][0] >= self.window_seconds:
+                self._window.popleft()
+            first_time, first_encounters, first_shinies = self._window[0]
+            span = now - first_time
+            elapsed = now - self.started
+            self.latest = {
+                'encounters': encounters,
+                'shinies_caught': shinies_caught,
+                'unique_shinies': unique_shinies,
+                'total_pokemon': total_pokemon,
+                'eps_rolling': (encounters - first_encounters) / span if span > 0 else 0.0,
+                'sps_rolling': (shinies_caught - first_shinies) / span if span > 0 else 0.0,
+                'window_seconds': span,
+                'session_seconds': elapsed
+            }
+        if now - self._last_export >= self.export_interval:
+            self.export()
+        return self.latest
+
+    # --- Export ---
+    def snapshot(self):
+        """Current metrics as a dict. 'sampling' is the loop thread's time outside every timed section."""
+        with self._lock:
+            sections = {name: {'calls': calls, 'seconds': seconds, 'max_seconds': longest}
+                        for name, (calls, seconds, longest) in self.sections.items()}
+            timed = self._owner_seconds
+        elapsed = time.perf_counter() - self.started
+        sections['sampling'] = {'calls': 0, 'seconds': max(0.0, elapsed - timed - self.gc_seconds), 'max_seconds': 0.0}
+        return dict(self.latest, timestamp=time.time(), sections=sections,
+                    gc_collections=self.gc_collections, gc_seconds=self.gc_seconds, labels=self.labels)
+
+    def export(self):
+        """Writes the current snapshot: replaces the Prometheus textfile or appends a JSON line."""
+        self._last_export = time.perf_counter()
+        snapshot = self.snapshot()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if self.export_format == 'jsonl':
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(snapshot) + '\n')
+        else:
+            write_atomic(self.path, prometheus_text(snapshot).encode('utf-8'))
+
+    def close(self):
+        """Final export and GC hook removal."""
+        self.stop()
+        self.export()
+
+
+def _label_string(labels):
+    return ','.join(f'{key}="{str(value)}"' for key, value in labels.items())
+
+
+def prometheus_text(snapshot):
+    """Renders a snapshot in the Prometheus text exposition format (node_exporter textfile)."""
+    labels = snapshot['labels']
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+        lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+        for extra, value in samples:
+            label_text = _label_string(dict(labels, **extra))
+            lines.append(f"{METRIC_PREFIX}_{name}{{{label_text}}} {value}")
+
+    if 'encounters' in snapshot:
+        metric('encounters_total', 'counter', "Encounters simulated.", [({}, snapshot['encounters'])])
+        metric('shinies_caught_total', 'counter', "Shiny Pokémon caught.", [({}, snapshot['shinies_caught'])])
+        metric('unique_shinies', 'gauge', "Species in the shiny dex.", [({}, snapshot['unique_shinies'])])
+        metric('eps', 'gauge', "Encounters per second over the rolling window.", [({}, f"{snapshot['eps_rolling']:.3f}")])
+        metric('sps', 'gauge', "Shinies caught per second over the rolling window.", [({}, f"{snapshot['sps_rolling']:.6f}")])
+    sections = snapshot['sections']
+    metric('section_seconds_total', 'counter', "Exclusive wall time spent per section.",
+           [({'section': name}, f"{section['seconds']:.6f}") for name, section in sections.items()])
+    metric('section_calls_total', 'counter', "Calls per timed section.",
+           [({'section': name}, section['calls']) for name, section in sections.items() if section['calls']])
+    metric('section_max_seconds', 'gauge', "Longest single call per timed section.",
+           [({'section': name}, f"{section['max_seconds']:.6f}") for name, section in sections.items() if section['calls']])
+    metric('gc_collections_total', 'counter', "Garbage collections during the session.", [({}, snapshot['gc_collections'])])
+    metric('gc_seconds_total', 'counter', "Time spent in garbage collection.", [({}, f"{snapshot['gc_seconds']:.6f}")])
+    return '\n'.join(lines) + '\n'
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler: samples the running stack every `interval` seconds of CPU time
+    and counts the stacks. write() saves them in the folded format used by flamegraph.pl
+    and speedscope.
+    On Unix the samples come from a SIGPROF timer handled in the main thread, so they land
+    wherever the interpreter is. Elsewhere a daemon thread samples the main thread's frame,
+    which skews towards calls that release the GIL.
+    """
+
+    def __init__(self, interval=0.005, max_depth=64):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks = collections.Counter()
+        self.samples = 0
+        self._thread_id = threading.main_thread().ident
+        self._use_signal = hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread()
+        self._previous_handler = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _record(self, frame):
+        stack = []
+        while frame is not None and len(stack) < self.max_depth:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        self.stacks[';'.join(reversed(stack))] += 1
+        self.samples += 1
+
+    def _on_signal(self, signum, frame):
+        self._record(frame)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                self._record(frame)
+
+    def start(self):
+        if self._use_signal:
+            self._previous_handler = signal.signal(signal.SIGPROF, self._on_signal)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        else:
+            self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._use_signal:
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            if self._previous_handler is not None:
+                signal.signal(signal.SIGPROF, self._previous_handler)
+                self._previous_handler = None
+        else:
+            self._stop.set()
+            if self._thread is not None:
+                self._thread.join()
+
+    def write(self, path):
+        """Writes the collected stacks as 'frame;frame;frame count' lines."""
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def top_functions(self, limit=10):
+        """Leaf functions with the most samples: [(frame, share of samples)]."""
+        leaves = collections.Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(';', 1)[-1]] += count
+        return [(frame, count / self.samples) for frame, count in leaves.most_common(limit)] if self.samples else []
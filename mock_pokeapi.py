@@ -0,0 +1,317 @@
+import argparse
+import csv
+import glob
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+from pokeapi import VERSION_MAP
+
+# Fixture bodies refer to other resources through this base; it is swapped for the server's own URL
+FIXTURE_BASE = 'http://pokeapi.invalid/api/v2'
+REAL_BASE = 'https://pokeapi.co/api/v2'
+
+
+def _value(row, column):
+    """CSV cell as int, bool or str; None when empty."""
+    value = row.get(column, '')
+    if value == '':
+        return None
+    if value.lower() in ('true', 'false'):  # Pandas writes True/False, spreadsheets TRUE/FALSE
+        return value.lower() == 'true'
+    try:
+        number = float(value)
+        return int(number) if number.is_integer() else number
+    except ValueError:
+        return value
+
+
+def _named(row, column):
+    """{'name': value} reference, or None when the cell is empty."""
+    value = _value(row, column)
+    return {'name': value} if value else None
+
+
+# Columns that come from /pokemon-species; forms of one species share all of them
+SPECIES_KEY = ('evolution_chain_id', 'genus', 'capture_rate', 'pokedex_entry')
+
+
+def _chain_link(name, children):
+    """Evolution-chain node for `name`, with the species that evolve from it nested below."""
+    return {'species': {'name': name}, 'evolves_to': [_chain_link(child, children) for child in children.get(name, [])]}
+
+
+def fixtures_from_database(path='pokemon_complete_database.csv', count=None):
+    """
+    Synthesizes PokéAPI-shaped fixtures from a scraped database CSV: one /pokemon resource
+    per row, with move lists and game indices sized like the real responses. As in the real
+    API, the forms of a species (e.g. rotom-wash and rotom-heat) share one /pokemon-species
+    resource, named and numbered after the species' default form, and every species of a
+    family shares one /evolution-chain. Returns (listing names, {path: body}).
+    """
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))[:count]
+
+    species_rows = {}
+    for row in rows:
+        key = tuple(row[column] for column in SPECIES_KEY)
+        if key not in species_rows or _value(row, 'id') < _value(species_rows[key], 'id'):
+            species_rows[key] = row  # The lowest id is the default form
+    chains = {}
+    for row in species_rows.values():
+        chains.setdefault(_value(row, 'evolution_chain_id'), []).append(row)
+
+    game_ids = {f"in_{game}": version_id for version_id, game in VERSION_MAP.items()}
+    names = []
+    resources = {}
+    for row in rows:
+        name = row['name']
+        pokemon_id = _value(row, 'id')
+        names.append(name)
+        species = species_rows[tuple(row[column] for column in SPECIES_KEY)]
+
+        stats = [{'base_stat': _value(row, f"stat_{stat.replace('-', '_')}"), 'stat': {'name': stat}}
+                 for stat in ('hp', 'attack', 'defense', 'special-attack', 'special-defense', 'speed')]
+        abilities = [{'ability': {'name': _value(row, column)}, 'is_hidden': False}
+                     for column in ('ability_1', 'ability_2') if _value(row, column)]
+        if _value(row, 'ability_hidden'):
+            abilities.append({'ability': {'name': _value(row, 'ability_hidden')}, 'is_hidden': True})
+
+        resources[f"pokemon/{name}"] = {
+            'id': pokemon_id,
+            'name': name,
+            'height': _value(row, 'height'),
+            'weight': _value(row, 'weight'),
+            'base_experience': _value(row, 'base_experience'),
+            'order': _value(row, 'order'),
+            'species': {'name': species['name'], 'url': f"{FIXTURE_BASE}/pokemon-species/{_value(species, 'id')}/"},
+            'types': [{'slot': slot, 'type': {'name': _value(row, f"type_{slot}")}}
+                      for slot in (1, 2) if _value(row, f"type_{slot}")],
+            'stats': [stat for stat in stats if stat['base_stat'] is not None],
+            'abilities': abilities,
+            'moves': [{'move': {'name': f"move-{i}", 'url': f"{FIXTURE_BASE}/move/{i}/"}}
+                      for i in range(1, (_value(row, 'total_moves') or 0) + 1)],
+            'sprites': {
+                'front_default': _value(row, 'sprite_front_default'),
+                'front_shiny': _value(row, 'sprite_front_shiny'),
+                'other': {'official-artwork': {'front_default': _value(row, 'sprite_official_artwork')}}
+            },
+            'game_indices': [{'game_index': pokemon_id, 'version': {'url': f"{FIXTURE_BASE}/version/{version_id}/"}}
+                             for column, version_id in game_ids.items() if _value(row, column)]
+        }
+
+    for row in species_rows.values():
+        species_id = _value(row, 'id')
+        chain_id = _value(row, 'evolution_chain_id')
+        resources[f"pokemon-species/{species_id}"] = {
+            'id': species_id,
+            'name': row['name'],
+            'genera': [{'genus': _value(row, 'genus'), 'language': {'name': 'en'}}] if _value(row, 'genus') else [],
+            'generation': {'name': f"generation-{_value(row, 'generation')}"} if _value(row, 'generation') else None,
+            'is_legendary': _value(row, 'is_legendary') or False,
+            'is_mythical': _value(row, 'is_mythical') or False,
+            'is_baby': _value(row, 'is_baby') or False,
+            'color': _named(row, 'color'),
+            'shape': _named(row, 'shape'),
+            'habitat': _named(row, 'habitat'),
+            'growth_rate': _named(row, 'growth_rate'),
+            'capture_rate': _value(row, 'capture_rate'),
+            'base_happiness': _value(row, 'base_happiness'),
+            'gender_rate': _value(row, 'gender_rate'),
+            'hatch_counter': _value(row, 'hatch_counter'),
+            'has_gender_differences': _value(row, 'has_gender_differences') or False,
+            'forms_switchable': _value(row, 'forms_switchable') or False,
+            'egg_groups': [{'name': _value(row, column)} for column in ('egg_group_1', 'egg_group_2') if _value(row, column)],
+            'evolves_from_species': _named(row, 'evolves_from'),
+            'evolution_chain': {'url': f"{FIXTURE_BASE}/evolution-chain/{chain_id}/"} if chain_id else None,
+            'flavor_text_entries': [{'flavor_text': _value(row, 'pokedex_entry'), 'language': {'name': 'en'}}]
+                                   if _value(row, 'pokedex_entry') else []
+        }
+
+    for chain_id, members in chains.items():
+        if not chain_id:
+            continue
+        member_names = {row['name'] for row in members}
+        children = {}
+        for row in members:
+            if _value(row, 'evolves_from') in member_names:
+                children.setdefault(row['evolves_from'], []).append(row['name'])
+        roots = [row['name'] for row in members if _value(row, 'evolves_from') not in member_names]
+        resources[f"evolution-chain/{chain_id}"] = {'id': chain_id, 'chain': _chain_link(roots[0], children)}
+
+    bodies = {path: json.dumps(body).encode('utf-8') for path, body in resources.items()}
+    return names, bodies
+
+
+def fixtures_from_cache(cache_dir='.pokeapi_cache', base_url=REAL_BASE):
+    """
+    Loads responses recorded by pokeapi.py's response cache as fixtures.
+    Returns (listing names, {path: body}).
+    """
+    base_url = base_url.rstrip('/')
+    names = []
+    bodies = {}
+    for index_path in glob.glob(os.path.join(cache_dir, 'index', '*', '*.json')):
+        with open(index_path, 'r') as f:
+            entry = json.load(f)
+        with open(os.path.join(cache_dir, 'objects', entry['sha256'][:2], entry['sha256']), 'rb') as f:
+            body = f.read()
+        if not entry['url'].startswith(base_url):
+            continue
+        path = urlsplit(entry['url'][len(base_url):]).path.strip('/')
+        if path == 'pokemon':
+            names = [result['name'] for result in json.loads(body)['results']]
+        else:
+            bodies[path] = body.replace(base_url.encode('utf-8'), FIXTURE_BASE.encode('utf-8'))
+    return names, bodies
+
+
+class MockPokeAPI:
+    """
+    Local stand-in for the PokéAPI serving fixtures from a ThreadingHTTPServer,
+    with injected latency and errors. Counts requests and bytes served.
+    Use as a context manager, or start()/stop().
+    """
+
+    def __init__(self, names, bodies, host='127.0.0.1', port=0, latency=0.0, jitter=0.0,
+                 error_rate=0.0, error_status=503, seed=None):
+        self.names = list(names)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = random.Random(seed)
+        self.stats = {'requests': 0, 'errors': 0, 'not_modified': 0, 'bytes': 0}
+        self._lock = threading.Lock()
+
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self.base_url = f"http://{host}:{self.server.server_port}/api/v2"
+        self.bodies = {path: body.replace(FIXTURE_BASE.encode('utf-8'), self.base_url.encode('utf-8'))
+                       for path, body in bodies.items()}
+        self.etags = {path: f'"{hashlib.sha1(body).hexdigest()}"' for path, body in self.bodies.items()}
+        self._thread = None
+
+    def _listing(self, query):
+        limit = int(query.get('limit', ['20'])[0])
+        offset = int(query.get('offset', ['0'])[0])
+        results = [{'name': name, 'url': f"{self.base_url}/pokemon/{name}/"}
+                   for name in self.names[offset:offset + limit]]
+        return json.dumps({'count': len(self.names), 'results': results}).encode('utf-8')
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def _roll(self):
+        """Latency for one request and whether it fails."""
+        with self._lock:
+            delay = max(0.0, self.random.gauss(self.latency, self.jitter)) if self.jitter else self.latency
+            return delay, self.random.random() < self.error_rate
+
+    def _handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body=b'', headers=None):
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                api._count('bytes', len(body))
+
+            def do_GET(self):
+                api._count('requests')
+                delay, fail = api._roll()
+                if delay:
+                    time.sleep(delay)
+                if fail:
+                    api._count('errors')
+                    self._send(api.error_status, headers={'Retry-After': '0'} if api.error_status == 429 else None)
+                    return
+
+                url = urlsplit(self.path)
+                path = url.path.strip('/')
+                if not path.startswith('api/v2'):
+                    self._send(404)
+                    return
+                path = path[len('api/v2'):].strip('/')
+
+                if path == 'pokemon':
+                    self._send(200, api._listing(parse_qs(url.query)), {'Content-Type': 'application/json'})
+                    return
+                if path not in api.bodies:
+                    self._send(404)
+                    return
+                if self.headers.get('If-None-Match') == api.etags[path]:
+                    api._count('not_modified')
+                    self._send(304, headers={'ETag': api.etags[path]})
+                    return
+                self._send(200, api.bodies[path], {'Content-Type': 'application/json', 'ETag': api.etags[path]})
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def load_fixtures(database='pokemon_complete_database.csv', cache_dir=None, count=None):
+    """Fixtures recorded in a response cache if given, else synthesized from the database CSV."""
+    if cache_dir:
+        names, bodies = fixtures_from_cache(cache_dir)
+        return names[:count], bodies
+    return fixtures_from_database(database, count)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local mock PokéAPI for scraper testing and benchmarks.")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--database', default='pokemon_complete_database.csv',
+                        help="Database CSV the fixtures are synthesized from")
+    parser.add_argument('--cache-dir', default=None, help="Serve responses recorded in a pokeapi.py response cache instead")
+    parser.add_argument('--count', type=int, default=None, help="Only serve the first N Pokémon")
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Standard deviation of the latency")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with an error")
+    parser.add_argument('--error-status', type=int, default=503, help="Status code for injected errors")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    names, bodies = load_fixtures(args.database, args.cache_dir, args.count)
+    api = MockPokeAPI(names, bodies, port=args.port, latency=args.latency, jitter=args.jitter,
+                      error_rate=args.error_rate, error_status=args.error_status, seed=args.seed)
+    print(f"✓ Serving {len(names)} Pokémon ({len(bodies)} resources) at {api.base_url}")
+    print("Press Ctrl+C to stop.")
+    try:
+        api.server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\nServed {api.stats['requests']:,} requests ({api.stats['bytes'] / 1e6:.1f} MB), "
+              f"{api.stats['errors']:,} injected errors")
+    finally:
+        api.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+# Required libraries: pip install pandas openpyxl numpy
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+
+import numpy as np
+
+from simulator import ShinySimulation
+
+# Replicates already fill the process pool, so the sharded engine would nest a second one per replicate
+REPLICATE_ENGINES = tuple(engine for engine in ShinySimulation.ENGINES if engine != 'sharded')
+
+
+def check_replicate_engine(engine):
+    """Raises ValueError for engines that cannot run inside a replicate worker."""
+    if engine not in REPLICATE_ENGINES:
+        raise ValueError(f"The '{engine}' engine cannot run as a replicate; use one of: {', '.join(REPLICATE_ENGINES)}")
+
+
+def _run_replicate(task):
+    """Runs one replicate in a worker process and returns its results row and registry entry."""
+    run_dir = os.path.join(task['reports_dir'], task['run_name'])
+    os.makedirs(run_dir, exist_ok=True)
+
+    # Each replicate's console output goes to its own log instead of the shared terminal.
+    # The log keeps the milestones only; the once-a-second progress line would grow it without bound.
+    with open(os.path.join(run_dir, 'console.log'), 'a', encoding='utf-8') as log, redirect_stdout(log):
+        simulation = ShinySimulation(
+            excel_path=task['excel_path'],
+            reports_dir=task['reports_dir'],
+            run_name=task['run_name'],
+            shiny_modifier=task['shiny_modifier'],
+            guaranteed_catch=task['guaranteed_catch'],
+            engine=task['engine'],
+            seed=task['seed'],
+            save_master_results=False,
+            register_run=False,
+            stability_constant=task.get('stability_constant', 100),
+            rarity_exponent=task.get('rarity_exponent', 1.8)
+        )
+        simulation.SHOW_PROGRESS = False
+        simulation.run()
+
+    return task['run_name'], simulation.run_results, simulation.registry_entry()
+
+
+def run_replicates(base_name, replicates, shiny_modifier='standard', guaranteed_catch=False,
+                   engine='event', workers=None, seed=None, excel_path='Pokemon Stats.xlsx',
+                   reports_dir='reports'):
+    """
+    Runs N independent replicates of one configuration on a process pool.
+    Each replicate gets its own SeedSequence child stream and its own reports/<run_name>
+    directory; all results are merged into the master results CSV in one pass at the end.
+    Returns the list of results rows that were collected.
+    """
+    check_replicate_engine(engine)
+    seed_seq = np.random.SeedSequence(seed)
+    child_seeds = seed_seq.spawn(replicates)
+    workers = workers or os.cpu_count()
+
+    tasks = [{
+        'run_name': f"{base_name}_r{i:03d}",
+        'shiny_modifier': shiny_modifier,
+        'guaranteed_catch': guaranteed_catch,
+        'engine': engine,
+        'seed': child_seeds[i - 1],
+        'excel_path': excel_path,
+        'reports_dir': reports_dir
+    } for i in range(1, replicates + 1)]
+
+    print("\n" + "="*60)
+    print("REPLICATE RUNNER")
+    print("="*60)
+    print(f"Base Name: {base_name}")
+    print(f"Replicates: {replicates} on {workers} worker(s)")
+    print(f"Shiny Rate: {shiny_modifier}")
+    print(f"Catch Mode: {'Guaranteed' if guaranteed_catch else 'Normal'}")
+    print(f"Engine: {engine}")
+    print(f"Seed Entropy: {seed_seq.entropy}")
+    print("="*60 + "\n")
+
+    results = []
+    registry_entries = {}
+    start_time = time.time()
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    futures = [executor.submit(_run_replicate, task) for task in tasks]
+    try:
+        for future in as_completed(futures):
+            try:
+                run_name, run_results, registry_entry = future.result()
+            except Exception as e:
+                print(f"❌ Replicate failed: {e}")
+                continue
+            registry_entries[run_name] = registry_entry
+            if run_results:
+                results.append(run_results)
+                print(f"✓ {run_name}: {run_results['Total_Encounters']:,} encounters ({run_results['Completion_Status']})")
+        executor.shutdown()
+    except KeyboardInterrupt:
+        # Workers save their own checkpoints on Ctrl+C; keep whatever has already finished
+        print("\n\n⚠ Replicate run paused by user. Collecting finished replicates...")
+        executor.shutdown(wait=True, cancel_futures=True)
+        for future in futures:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                run_name, run_results, registry_entry = future.result()
+                registry_entries[run_name] = registry_entry
+                if run_results and run_results not in results:
+                    results.append(run_results)
+
+    if registry_entries:
+        ShinySimulation._register_runs(registry_entries)
+    ShinySimulation.merge_master_results(results)
+
+    elapsed_hours = (time.time() - start_time) / 3600
+    print(f"\n✓ Merged {len(results)} replicate(s) into {ShinySimulation.MASTER_RESULTS}")
+    print(f"  Wall Time: {elapsed_hours:.2f} hours")
+    return results
+
+
+def run_sharded(run_name, shiny_modifier='standard', guaranteed_catch=False, workers=None,
+                block_size=None, seed=None, excel_path='Pokemon Stats.xlsx', reports_dir='reports'):
+    """
+    Runs a single simulation whose encounter stream is split into contiguous blocks
+    simulated in parallel and merged in order, as if one process had run them.
+    """
+    simulation = ShinySimulation(
+        excel_path=excel_path,
+        reports_dir=reports_dir,
+        run_name=run_name,
+        shiny_modifier=shiny_modifier,
+        guaranteed_catch=guaranteed_catch,
+        engine='sharded',
+        seed=seed
+    )
+    if workers:
+        simulation.SHARD_WORKERS = workers
+    if block_size:
+        simulation.SHARD_BLOCK_SIZE = block_size
+    simulation.run()
+    return simulation.run_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run shiny simulations on a process pool.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    replicate_parser = subparsers.add_parser('replicates', help="Run N independent replicates of one configuration")
+    replicate_parser.add_argument('--name', required=True, help="Base run name; replicates are named <name>_r001, ...")
+    replicate_parser.add_argument('--runs', type=int, required=True, help="Number of replicates")
+    replicate_parser.add_argument('--modifier', default='standard', choices=list(ShinySimulation.SHINY_RATES))
+    replicate_parser.add_argument('--guaranteed', action='store_true', help="Use a 100%% catch rate")
+    replicate_parser.add_argument('--engine', default='event', choices=list(REPLICATE_ENGINES))
+    replicate_parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    replicate_parser.add_argument('--seed', type=int, default=None, help="Root seed for the replicate streams")
+    replicate_parser.add_argument('--excel', default='Pokemon Stats.xlsx')
+
+    shard_parser = subparsers.add_parser('shard', help="Split one run across worker processes")
+    shard_parser.add_argument('--name', required=True, help="Run name")
+    shard_parser.add_argument('--modifier', default='standard', choices=list(ShinySimulation.SHINY_RATES))
+    shard_parser.add_argument('--guaranteed', action='store_true', help="Use a 100%% catch rate")
+    shard_parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    shard_parser.add_argument('--block-size', type=int, default=None, help="Encounters per worker block")
+    shard_parser.add_argument('--seed', type=int, default=None, help="Root seed for the shard streams")
+    shard_parser.add_argument('--excel', default='Pokemon Stats.xlsx')
+
+    args = parser.parse_args()
+
+    if args.command == 'replicates':
+        run_replicates(
+            args.name, args.runs,
+            shiny_modifier=args.modifier,
+            guaranteed_catch=args.guaranteed,
+            engine=args.engine,
+            workers=args.workers,
+            seed=args.seed,
+            excel_path=args.excel
+        )
+    elif args.command == 'shard':
+        run_sharded(
+            args.name,
+            shiny_modifier=args.modifier,
+            guaranteed_catch=args.guaranteed,
+            workers=args.workers,
+            block_size=args.block_size,
+            seed=args.seed,
+            excel_path=args.excel
+        )
+
+
+if __name__ == "__main__":
+    main()
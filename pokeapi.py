@@ -1,32 +1,251 @@
+import argparse
+import csv
+import hashlib
+import os
+import random
+import threading
 import requests
 import pandas as pd
 import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
 from typing import Dict, List, Any
 import json
 
+# Status codes worth retrying: rate limited or a transient server error
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Map PokéAPI version IDs to game names (this is a simplified mapping)
+VERSION_MAP = {
+    1: 'red', 2: 'blue', 3: 'yellow',
+    4: 'gold', 5: 'silver', 6: 'crystal',
+    7: 'ruby', 8: 'sapphire', 9: 'emerald',
+    10: 'firered', 11: 'leafgreen',
+    12: 'diamond', 13: 'pearl', 14: 'platinum',
+    15: 'heartgold', 16: 'soulsilver',
+    17: 'black', 18: 'white', 21: 'black2', 22: 'white2',
+    23: 'x', 24: 'y',
+    25: 'omega_ruby', 26: 'alpha_sapphire',
+    27: 'sun', 28: 'moon', 29: 'ultra_sun', 30: 'ultra_moon',
+    31: 'lets_go_pikachu', 32: 'lets_go_eevee',
+    33: 'sword', 34: 'shield',
+    35: 'brilliant_diamond', 36: 'shining_pearl',
+    37: 'legends_arceus',
+    38: 'scarlet', 39: 'violet'
+}
+
+# Progress manifest is rewritten after this many finished Pokémon (and at the end)
+MANIFEST_SAVE_INTERVAL = 25
+
+
+class ScrapeError(Exception):
+    """Raised when a Pokémon's data could not be fetched completely."""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: allows `rate` requests per second on average,
+    with bursts of up to `capacity`. acquire() blocks until a token is free.
+    """
+    def __init__(self, rate: float, capacity: int = None):
+        self.rate = rate
+        self.capacity = capacity or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_time = (1 - self.tokens) / self.rate
+            time.sleep(wait_time)
+
+
+class ResponseCache:
+    """
+    Content-addressed on-disk cache of API responses.
+    objects/<sha256 of body> holds each distinct body once; index/<sha256 of url>.json
+    maps a URL to its body plus the ETag/Last-Modified validators for revalidation.
+    """
+    def __init__(self, cache_dir: str = '.pokeapi_cache'):
+        self.cache_dir = cache_dir
+    
+    def _index_path(self, url: str) -> str:
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, 'index', key[:2], f"{key}.json")
+    
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, 'objects', digest[:2], digest)
+    
+    @staticmethod
+    def _write_atomic(path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    
+    def get(self, url: str):
+        """Returns (entry, body bytes) for a cached URL, or None."""
+        try:
+            with open(self._index_path(url), 'r') as f:
+                entry = json.load(f)
+            with open(self._object_path(entry['sha256']), 'rb') as f:
+                return entry, f.read()
+        except (OSError, ValueError, KeyError):
+            return None
+    
+    def put(self, url: str, body: bytes, headers) -> Dict:
+        """Stores a response body and its validators."""
+        digest = hashlib.sha256(body).hexdigest()
+        object_path = self._object_path(digest)
+        if not os.path.exists(object_path):
+            self._write_atomic(object_path, body)
+        entry = {
+            'url': url,
+            'sha256': digest,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'fetched_at': time.time()
+        }
+        self._write_atomic(self._index_path(url), json.dumps(entry).encode('utf-8'))
+        return entry
+
+
 class PokemonDataScraper:
-    def __init__(self):
-        self.base_url = "https://pokeapi.co/api/v2"
-        self.session = requests.Session()
+    # use: serve cached responses, fetch misses | revalidate: conditional GET for cached URLs
+    # offline: cache only, no network | off: always fetch, never store
+    CACHE_MODES = ('use', 'revalidate', 'offline', 'off')
+    
+    def __init__(self, base_url: str = "https://pokeapi.co/api/v2", max_workers: int = 8,
+                 requests_per_second: float = 10.0, max_retries: int = 4, backoff: float = 0.5,
+                 timeout: float = 30.0, cache_dir: str = '.pokeapi_cache', cache_mode: str = 'use'):
+        if cache_mode not in self.CACHE_MODES:
+            raise ValueError(f"Unknown cache mode '{cache_mode}'. Options: {', '.join(self.CACHE_MODES)}")
+        self.base_url = base_url.rstrip('/')
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.rate_limiter = TokenBucket(requests_per_second) if requests_per_second else None
+        self._local = threading.local()  # requests.Session is not thread-safe; one per worker thread
+        self.cache_mode = cache_mode
+        self.cache = ResponseCache(cache_dir) if cache_mode != 'off' else None
         
-    def rate_limit(self, delay=0.1):
-        """Be nice to the API"""
-        time.sleep(delay)
+        # Species and evolution chains are shared by many forms; fetch each URL once per process
+        self._memo = {}
+        self._memo_lock = threading.Lock()
+        self.stats = {'requests': 0, 'bytes': 0, 'cache_hits': 0, 'not_modified': 0, 'memo_hits': 0, 'errors': 0}
+        self._stats_lock = threading.Lock()
     
-    def get_data(self, url: str) -> Dict:
-        """Fetch data with error handling"""
+    def _count(self, key: str, amount: int = 1):
+        with self._stats_lock:
+            self.stats[key] += amount
+    
+    @property
+    def session(self) -> requests.Session:
+        """This thread's HTTP session (keeps connections alive between requests)."""
+        if not hasattr(self._local, 'session'):
+            self._local.session = requests.Session()
+        return self._local.session
+    
+    def get_data(self, url: str, revalidate: bool = False) -> Dict:
+        """Fetch data through the response cache, with rate limiting, retries and error handling"""
+        cached = self.cache.get(url) if self.cache else None
+        if cached and self.cache_mode in ('use', 'offline') and not (revalidate and self.cache_mode == 'use'):
+            self._count('cache_hits')
+            return json.loads(cached[1])
+        if self.cache_mode == 'offline':
+            print(f"Error fetching {url}: not in the offline cache")
+            self._count('errors')
+            return {}
+        
+        # Conditional request: the server answers 304 if our cached copy is still current
+        headers = {}
+        if cached:
+            entry = cached[0]
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        
         try:
-            response = self.session.get(url)
+            response = self._request(url, headers)
+            if response.status_code == 304 and cached:
+                self._count('not_modified')
+                return json.loads(cached[1])
             response.raise_for_status()
-            return response.json()
+            data = response.json()
         except Exception as e:
             print(f"Error fetching {url}: {e}")
+            self._count('errors')
             return {}
+        
+        if self.cache:
+            self.cache.put(url, response.content, response.headers)
+        return data
+    
+    def _request(self, url: str, headers: Dict) -> requests.Response:
+        """GET with rate limiting and retry with exponential backoff on errors and 429/5xx"""
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt < self.max_retries:
+                    self._backoff(attempt)
+                    continue
+                raise
+            self._count('requests')
+            self._count('bytes', len(response.content))
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                self._backoff(attempt, response.headers.get('Retry-After'))
+                continue
+            return response
+    
+    def get_shared_data(self, url: str) -> Dict:
+        """get_data memoized per process; concurrent callers for the same URL share one fetch"""
+        with self._memo_lock:
+            entry = self._memo.get(url)
+            owner = entry is None
+            if owner:
+                entry = self._memo[url] = {'ready': threading.Event(), 'data': {}}
+            else:
+                self._count('memo_hits')
+        
+        if owner:
+            try:
+                entry['data'] = self.get_data(url)
+            finally:
+                entry['ready'].set()
+            if not entry['data']:
+                # Don't memoize failures; a later caller may succeed
+                with self._memo_lock:
+                    self._memo.pop(url, None)
+        else:
+            entry['ready'].wait()
+        return entry['data']
+    
+    def _backoff(self, attempt: int, retry_after: str = None):
+        """Sleeps before a retry: the server's Retry-After if given, else exponential with jitter."""
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = self.backoff * (2 ** attempt) * (0.5 + random.random())
+        time.sleep(delay)
     
     def get_all_pokemon_list(self) -> List[Dict]:
         """Get list of all Pokemon"""
         url = f"{self.base_url}/pokemon?limit=100000"
-        data = self.get_data(url)
+        # The listing changes when new Pokémon are added, so never trust a cached copy blindly
+        data = self.get_data(url, revalidate=True)
         return data.get('results', [])
     
     def get_pokemon_games(self, pokemon_data: Dict) -> Dict[str, bool]:
@@ -49,31 +268,12 @@ class PokemonDataScraper:
             'in_scarlet': False, 'in_violet': False
         }
         
-        # Map version IDs to game names (this is a simplified mapping)
-        version_map = {
-            1: 'red', 2: 'blue', 3: 'yellow',
-            4: 'gold', 5: 'silver', 6: 'crystal',
-            7: 'ruby', 8: 'sapphire', 9: 'emerald',
-            10: 'firered', 11: 'leafgreen',
-            12: 'diamond', 13: 'pearl', 14: 'platinum',
-            15: 'heartgold', 16: 'soulsilver',
-            17: 'black', 18: 'white', 21: 'black2', 22: 'white2',
-            23: 'x', 24: 'y',
-            25: 'omega_ruby', 26: 'alpha_sapphire',
-            27: 'sun', 28: 'moon', 29: 'ultra_sun', 30: 'ultra_moon',
-            31: 'lets_go_pikachu', 32: 'lets_go_eevee',
-            33: 'sword', 34: 'shield',
-            35: 'brilliant_diamond', 36: 'shining_pearl',
-            37: 'legends_arceus',
-            38: 'scarlet', 39: 'violet'
-        }
-        
         for game_index in pokemon_data.get('game_indices', []):
             version_id = game_index.get('version', {}).get('url', '').split('/')[-2]
             try:
                 version_id = int(version_id)
-                if version_id in version_map:
-                    game_name = version_map[version_id]
+                if version_id in VERSION_MAP:
+                    game_name = VERSION_MAP[version_id]
                     games_dict[f'in_{game_name}'] = True
             except:
                 continue
@@ -87,20 +287,21 @@ class PokemonDataScraper:
         # Get main Pokemon data
         pokemon_url = f"{self.base_url}/pokemon/{pokemon_name}"
         pokemon_data = self.get_data(pokemon_url)
-        self.rate_limit()
         
         if not pokemon_data:
-            return {}
+            raise ScrapeError(f"could not fetch {pokemon_url}")
         
         # Get species data
         species_url = pokemon_data.get('species', {}).get('url', '')
-        species_data = self.get_data(species_url) if species_url else {}
-        self.rate_limit()
+        species_data = self.get_shared_data(species_url) if species_url else {}
+        if species_url and not species_data:
+            raise ScrapeError(f"could not fetch {species_url}")
         
         # Get evolution chain
         evolution_url = species_data.get('evolution_chain', {}).get('url', '')
-        evolution_data = self.get_data(evolution_url) if evolution_url else {}
-        self.rate_limit()
+        evolution_data = self.get_shared_data(evolution_url) if evolution_url else {}
+        if evolution_url and not evolution_data:
+            raise ScrapeError(f"could not fetch {evolution_url}")
         
         # Build complete data dictionary
         data = {
@@ -176,40 +377,176 @@ class PokemonDataScraper:
         
         return data
     
-    def scrape_all_pokemon(self, limit: int = None) -> pd.DataFrame:
-        """Scrape all Pokemon data"""
-        pokemon_list = self.get_all_pokemon_list()
+    @staticmethod
+    def manifest_path(output: str) -> str:
+        return f"{output}.manifest.json"
+    
+    @staticmethod
+    def _write_atomic(path: str, data: bytes):
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    
+    def _load_progress(self, output: str) -> Dict:
+        """
+        Reads the manifest and cuts the output CSV back to the bytes it committed: the rows
+        of the Pokémon it marks done. Rows written after the last manifest save, including a
+        partial row left by an interrupted write, are dropped and fetched again.
+        """
+        manifest = {'entries': {}, 'committed_bytes': 0}
+        if os.path.exists(self.manifest_path(output)):
+            with open(self.manifest_path(output), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        elif os.path.exists(output) and os.path.getsize(output) > 0:
+            raise ScrapeError(f"{output} exists but has no manifest, so it was not written by a scrape; "
+                              f"choose another output or remove it")
+        
+        size = os.path.getsize(output) if os.path.exists(output) else 0
+        if manifest.get('committed_bytes', size + 1) > size:  # Older manifests did not record it
+            if size or manifest['entries']:
+                print(f"⚠ {output} does not match its manifest; scraping everything again")
+            manifest = {'entries': {}, 'committed_bytes': 0}
+        committed = manifest['committed_bytes']
+        if size != committed:
+            with open(output, 'ab') as f:
+                f.truncate(committed)
+        return manifest
+    
+    def _save_manifest(self, output: str, manifest: Dict):
+        manifest['updated'] = datetime.now().isoformat()
+        self._write_atomic(self.manifest_path(output), json.dumps(manifest, indent=4).encode('utf-8'))
+    
+    def _consolidate(self, output: str, listing: List[Dict]) -> int:
+        """Rewrites the output in listing order, keeping each Pokémon's newest row. Returns the new size."""
+        with open(output, 'r', newline='', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            fieldnames = reader.fieldnames
+            rows = {row['name']: row for row in reader}
+        
+        temp_path = f"{output}.tmp"
+        with open(temp_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows[pokemon['name']] for pokemon in listing if pokemon['name'] in rows)
+        size = os.path.getsize(temp_path)
+        os.replace(temp_path, output)
+        return size
+    
+    def scrape_all_pokemon(self, output: str, limit: int = None) -> pd.DataFrame:
+        """
+        Scrape all Pokemon data on a thread pool, streaming rows to the output CSV as they finish.
+        A manifest next to the output tracks each Pokémon's listing URL and status and how many
+        bytes of the CSV hold finished rows, so a rerun only fetches Pokémon that are missing,
+        failed last time or whose listing entry changed. An existing CSV without a manifest is
+        refused rather than overwritten. When done, the CSV is rewritten in listing order and
+        returned as a DataFrame.
+        """
+        full_listing = self.get_all_pokemon_list()
+        if not full_listing:
+            raise ScrapeError(f"could not fetch the Pokémon listing from {self.base_url}")
+        pokemon_list = full_listing[:limit] if limit else full_listing
+        
+        manifest = self._load_progress(output)
+        entries = manifest['entries']
+        todo = [pokemon for pokemon in pokemon_list
+                if entries.get(pokemon['name'], {}).get('url') != pokemon['url']
+                or entries[pokemon['name']].get('status') != 'done']
+        if manifest['committed_bytes']:
+            print(f"Resuming: {len(pokemon_list) - len(todo)}/{len(pokemon_list)} already in {output}, "
+                  f"{len(todo)} to fetch")
+        
+        total = len(todo)
+        completed = 0
+        failed = {}
         
-        if limit:
-            pokemon_list = pokemon_list[:limit]
+        # Bound the in-flight futures so a huge listing doesn't queue everything at once
+        max_in_flight = self.max_workers * 2
+        pending = {}
+        next_index = 0
+        output_file = open(output, 'a', newline='', encoding='utf-8')
+        writer = None
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                while next_index < total or pending:
+                    while next_index < total and len(pending) < max_in_flight:
+                        future = executor.submit(self.get_complete_pokemon_data, todo[next_index]['name'])
+                        pending[future] = todo[next_index]
+                        next_index += 1
+                    
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        pokemon = pending.pop(future)
+                        try:
+                            data = future.result()
+                        except Exception as e:
+                            failed[pokemon['name']] = str(e)
+                            entries[pokemon['name']] = {'url': pokemon['url'], 'status': 'failed', 'error': str(e)}
+                        else:
+                            if writer is None:
+                                writer = csv.DictWriter(output_file, fieldnames=list(data))
+                                if output_file.tell() == 0:
+                                    writer.writeheader()
+                            writer.writerow(data)
+                            output_file.flush()
+                            manifest['committed_bytes'] = output_file.tell()
+                            entries[pokemon['name']] = {'url': pokemon['url'], 'status': 'done', 'error': None}
+                        completed += 1
+                        print(f"Progress: {completed}/{total}")
+                        if completed % MANIFEST_SAVE_INTERVAL == 0:
+                            self._save_manifest(output, manifest)
+        finally:
+            output_file.close()
+            self._save_manifest(output, manifest)
+        
+        if os.path.getsize(output) == 0:
+            raise ScrapeError(f"no Pokémon could be scraped; see {self.manifest_path(output)}")
         
-        all_data = []
-        total = len(pokemon_list)
+        # Names that dropped out of the listing are left out of the rewritten file
+        manifest['committed_bytes'] = self._consolidate(output, full_listing)
+        self._save_manifest(output, manifest)
         
-        for idx, pokemon in enumerate(pokemon_list, 1):
-            print(f"Progress: {idx}/{total}")
-            data = self.get_complete_pokemon_data(pokemon['name'])
-            if data:
-                all_data.append(data)
+        if failed:
+            print(f"\n⚠ {len(failed)} Pokémon failed and were not updated (rerun to retry them):")
+            for name, error in failed.items():
+                print(f"  - {name}: {error}")
         
-        df = pd.DataFrame(all_data)
-        return df
+        return pd.read_csv(output)
 
 
 # Usage
 if __name__ == "__main__":
-    scraper = PokemonDataScraper()
+    parser = argparse.ArgumentParser(description="Scrape Pokémon data from the PokéAPI.")
+    parser.add_argument('--base-url', default="https://pokeapi.co/api/v2", help="API root (e.g. a local mock server)")
+    parser.add_argument('--workers', type=int, default=8, help="Max requests in flight")
+    parser.add_argument('--rps', type=float, default=10.0, help="Max requests per second (0 = unlimited)")
+    parser.add_argument('--retries', type=int, default=4, help="Retries per request on errors and 429/5xx")
+    parser.add_argument('--limit', type=int, default=None, help="Only scrape the first N Pokémon")
+    parser.add_argument('--output', default='pokemon_scraped_database.csv',
+                        help="CSV to write; kept apart from the bundled pokemon_complete_database.csv")
+    parser.add_argument('--cache-dir', default='.pokeapi_cache', help="On-disk response cache")
+    parser.add_argument('--cache-mode', default='use', choices=PokemonDataScraper.CACHE_MODES,
+                        help="use: cached responses, fetch misses; revalidate: conditional GETs; "
+                             "offline: replay the cache without network; off: no cache")
+    args = parser.parse_args()
+    
+    scraper = PokemonDataScraper(
+        base_url=args.base_url,
+        max_workers=args.workers,
+        requests_per_second=args.rps,
+        max_retries=args.retries,
+        cache_dir=args.cache_dir,
+        cache_mode=args.cache_mode
+    )
     
-    # For testing, scrape first 10 Pokemon
-    # Remove limit parameter to scrape ALL Pokemon (this will take hours)
     print("Starting Pokemon data scrape...")
-    print("This will take a while. Go touch grass or something.")
+    print(f"Up to {args.workers} requests in flight, {args.rps or 'unlimited'} requests/second.")
     
-    df = scraper.scrape_all_pokemon()  # Remove limit=10 for full scrape
+    df = scraper.scrape_all_pokemon(output=args.output, limit=args.limit)
     
-    # Save to CSV
-    output_file = 'pokemon_complete_database.csv'
-    df.to_csv(output_file, index=False)
-    print(f"\nData saved to {output_file}")
+    print(f"\nData saved to {args.output}")
     print(f"Total Pokemon scraped: {len(df)}")
+    stats = scraper.stats
+    print(f"HTTP requests: {stats['requests']:,} ({stats['bytes'] / 1e6:.1f} MB) | Cache hits: {stats['cache_hits']:,} | "
+          f"Not modified: {stats['not_modified']:,} | Shared fetches reused: {stats['memo_hits']:,} | Errors: {stats['errors']:,}")
     print(f"\nColumns: {list(df.columns)}")
\ No newline at end of file
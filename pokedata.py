@@ -0,0 +1,253 @@
+import hashlib
+import io
+import json
+import os
+import numpy as np
+
+from checkpoint import write_atomic
+
+# Compiled pokedexes are cached next to their source file as .npz archives
+CACHE_DIR_NAME = '.pokedex_cache'
+CACHE_VERSION = 1
+
+# Canonical column -> column names used by the supported sources, in priority order
+COLUMN_ALIASES = {
+    'name': ['name'],
+    'pokedex_number': ['pokedex number', 'pokedex_number', 'number', 'id'],
+    'base_total': ['base total', 'base_total', 'stat_total'],
+    'catch_rate': ['Catch Rate', 'catch_rate', 'capture_rate'],
+    'is_legendary': ['is_legendary'],
+    'is_mythical': ['is_mythical']
+}
+
+# Base stats for sources that list them individually but have no total
+STAT_ALIASES = [
+    ['hp', 'stat_hp'],
+    ['attack', 'stat_attack'],
+    ['defense', 'stat_defense'],
+    ['special-attack', 'sp attack', 'stat_special_attack'],
+    ['special-defense', 'sp defense', 'stat_special_defense'],
+    ['speed', 'stat_speed']
+]
+
+REQUIRED_COLUMNS = ('name', 'pokedex_number', 'base_total', 'catch_rate')
+
+# Sources tried, in order, for columns the main source does not have
+DEFAULT_SUPPLEMENTS = ('Pokemon Stats.xlsx', 'pokemon_complete_database.csv')
+
+
+class PokedexError(Exception):
+    """Raised when a pokedex source cannot be read or lacks required columns."""
+
+
+def _file_digest(path):
+    """SHA-1 of a file's contents."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _source_fingerprint(path):
+    """Path, mtime, size and content hash of a source file."""
+    stat = os.stat(path)
+    return [os.path.abspath(path), stat.st_mtime_ns, stat.st_size, _file_digest(path)]
+
+
+def cache_key(source, sheet_name, stability, rarity, supplements=()):
+    """Cache key covering the sources and the spawn-weight parameters."""
+    key = {
+        'version': CACHE_VERSION,
+        'source': _source_fingerprint(source),
+        'sheet_name': sheet_name,
+        'stability': stability,
+        'rarity': rarity,
+        'supplements': [_source_fingerprint(path) for path in supplements]
+    }
+    return hashlib.sha1(json.dumps(key, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def read_source(path, sheet_name='Pokedex'):
+    """Reads an xlsx, JSON or CSV pokedex source into a DataFrame."""
+    import pandas as pd
+
+    extension = os.path.splitext(path)[1].lower()
+    try:
+        if extension in ('.xlsx', '.xls'):
+            return pd.read_excel(path, sheet_name=sheet_name)
+        if extension == '.json':
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                # {"Pokedex": [...]}: use the sheet name, or the only list in the file
+                data = data.get(sheet_name) or next(value for value in data.values() if isinstance(value, list))
+            return pd.DataFrame(data)
+        if extension == '.csv':
+            return pd.read_csv(path, encoding='utf-8-sig')
+    except FileNotFoundError:
+        raise PokedexError(f"Could not find '{path}'")
+    except (ValueError, StopIteration) as e:
+        raise PokedexError(f"Could not read '{path}': {e}")
+    raise PokedexError(f"Unsupported pokedex source '{path}' (use .xlsx, .json or .csv)")
+
+
+def normalize_columns(df):
+    """Maps a source DataFrame onto the canonical columns it has; others are left out."""
+    import pandas as pd
+
+    normalized = pd.DataFrame(index=df.index)
+    for column, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in df.columns:
+                normalized[column] = df[alias]
+                break
+
+    if 'base_total' not in normalized:
+        stat_columns = [next((alias for alias in aliases if alias in df.columns), None) for aliases in STAT_ALIASES]
+        if all(stat_columns):
+            normalized['base_total'] = df[stat_columns].sum(axis=1)
+
+    return normalized
+
+
+def _match_key(name):
+    """Name key for matching across sources ('Mr. Mime' and 'mr-mime' match)."""
+    return ''.join(ch for ch in str(name).lower() if ch.isalnum())
+
+
+def _fill_from_supplements(normalized, supplements, sheet_name):
+    """Fills columns missing from the main source by matching names in supplement sources."""
+    missing = [column for column in COLUMN_ALIASES if column not in normalized]
+    if not missing:
+        return normalized
+
+    keys = normalized['name'].map(_match_key)
+    for path in supplements:
+        supplement = normalize_columns(read_source(path, sheet_name))
+        available = [column for column in missing if column in supplement]
+        if not available:
+            continue
+        lookup = supplement.assign(_key=supplement['name'].map(_match_key)).drop_duplicates('_key', keep='last')
+        lookup = lookup.set_index('_key')
+        for column in available:
+            normalized[column] = keys.map(lookup[column]).to_numpy()
+        missing = [column for column in missing if column not in available]
+        if not missing:
+            break
+
+    return normalized
+
+
+def compile_pokedex(source, sheet_name='Pokedex', stability=100, rarity=1.8, supplements=()):
+    """
+    Compiles a pokedex source into columnar arrays with the derived spawn weights.
+    Rows missing a required value are dropped. Duplicate names keep their first
+    position and their last values, like building a dict row by row.
+    Returns a dict of NumPy arrays.
+    """
+    normalized = normalize_columns(read_source(source, sheet_name))
+    if 'name' not in normalized:
+        raise PokedexError(f"'{source}' has no name column")
+
+    normalized = _fill_from_supplements(normalized, supplements, sheet_name)
+    absent = [column for column in REQUIRED_COLUMNS if column not in normalized]
+    if absent:
+        raise PokedexError(f"'{source}' is missing {', '.join(absent)} and no supplement source provides it")
+
+    for column in ('is_legendary', 'is_mythical'):
+        normalized[column] = normalized[column].fillna(False).astype(bool) if column in normalized else False
+
+    complete = normalized[list(REQUIRED_COLUMNS)].notna().all(axis=1)
+    if not complete.all():
+        print(f"⚠ Warning: Dropped {int((~complete).sum())} Pokémon with no base total or catch rate")
+        normalized = normalized[complete]
+
+    rows = {}
+    for row in zip(*(normalized[column].tolist() for column in COLUMN_ALIASES)):
+        rows[row[0]] = row
+    values = list(zip(*rows.values())) if rows else [[] for _ in COLUMN_ALIASES]
+    columns = dict(zip(COLUMN_ALIASES, values))
+
+    columns['name'] = np.array(columns['name'], dtype=str)
+    columns['pokedex_number'] = np.asarray(columns['pokedex_number']).astype(np.int64)
+    columns['base_total'] = _as_number(columns['base_total'])
+    columns['catch_rate'] = _as_number(columns['catch_rate'])
+    columns['is_legendary'] = np.asarray(columns['is_legendary'], dtype=bool)
+    columns['is_mythical'] = np.asarray(columns['is_mythical'], dtype=bool)
+
+    # Scalar pow, so weights match the per-row formula bit for bit
+    spawn_weight = np.array([1 / ((base_total + stability) ** rarity)
+                             for base_total in columns['base_total'].tolist()], dtype=np.float64)
+    columns['spawn_weight'] = spawn_weight
+    columns['spawn_probability'] = spawn_weight / spawn_weight.sum() if len(spawn_weight) else spawn_weight
+    columns['catch_probability'] = columns['catch_rate'].astype(np.float64) / 255.0
+    return columns
+
+
+def _as_number(values):
+    """Numeric array, kept as int64 when every value is integral (supplemented columns come back as float)."""
+    values = np.asarray(values, dtype=np.float64)
+    if np.all(np.mod(values, 1) == 0):
+        return values.astype(np.int64)
+    return values
+
+
+def _default_supplements(source):
+    """Supplement sources next to the main source, excluding the source itself."""
+    directory = os.path.dirname(os.path.abspath(source))
+    candidates = [os.path.join(directory, name) for name in DEFAULT_SUPPLEMENTS]
+    return [path for path in candidates
+            if os.path.exists(path) and os.path.abspath(path) != os.path.abspath(source)]
+
+
+def load_pokedex(source, sheet_name='Pokedex', stability=100, rarity=1.8, supplements=None, use_cache=True):
+    """
+    Loads a compiled pokedex, from the cache when the sources and parameters are
+    unchanged, otherwise by compiling and caching it. Returns (columns, from_cache).
+    """
+    if not os.path.exists(source):
+        raise PokedexError(f"Could not find '{source}'")
+    if supplements is None:
+        supplements = _default_supplements(source)
+
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(source)), CACHE_DIR_NAME)
+    cache_path = os.path.join(cache_dir, f"{cache_key(source, sheet_name, stability, rarity, supplements)}.npz")
+
+    if use_cache and os.path.exists(cache_path):
+        try:
+            with np.load(cache_path, allow_pickle=False) as archive:
+                return {name: archive[name] for name in archive.files}, True
+        except (OSError, ValueError):
+            pass  # Unreadable cache; recompile below
+
+    columns = compile_pokedex(source, sheet_name, stability, rarity, supplements)
+    if use_cache:
+        os.makedirs(cache_dir, exist_ok=True)
+        buffer = io.BytesIO()
+        np.savez(buffer, **columns)
+        write_atomic(cache_path, buffer.getvalue())
+    return columns, False
+
+
+def pokedex_records(columns):
+    """Builds the name-keyed pokedex dict used by the simulator from compiled columns."""
+    return {
+        name: {
+            'pokedex number': number,
+            'Catch Rate': catch_rate,
+            'Spawn Weight': spawn_weight,
+            'base_total': base_total,
+            'is_legendary': is_legendary,
+            'is_mythical': is_mythical
+        }
+        for name, number, catch_rate, spawn_weight, base_total, is_legendary, is_mythical in zip(
+            columns['name'].tolist(),
+            columns['pokedex_number'].tolist(),
+            columns['catch_rate'].tolist(),
+            columns['spawn_weight'].tolist(),
+            columns['base_total'].tolist(),
+            columns['is_legendary'].tolist(),
+            columns['is_mythical'].tolist()
+        )
+    }
@@ -0,0 +1,57 @@
+import random as rand
+import numpy as np
+
+
+class AliasSampler:
+    """
+    Walker/Vose alias table for weighted sampling in O(1) per draw.
+    Built once from a list of weights; draws return indices into that list.
+    """
+
+    def __init__(self, weights):
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.ndim != 1 or len(weights) == 0:
+            raise ValueError("AliasSampler needs a non-empty 1-D list of weights")
+        if (weights < 0).any() or weights.sum() <= 0:
+            raise ValueError("AliasSampler weights must be non-negative with a positive sum")
+
+        self.size = len(weights)
+        scaled = (weights / weights.sum() * self.size).tolist()
+        prob = [0.0] * self.size
+        alias = list(range(self.size))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] = (scaled[l] + scaled[s]) - 1.0
+            if scaled[l] < 1.0:
+                small.append(l)
+            else:
+                large.append(l)
+
+        # Leftovers are 1.0 up to floating point error
+        for i in small + large:
+            prob[i] = 1.0
+
+        # Python lists for single draws, NumPy arrays for bulk draws
+        self.prob = prob
+        self.alias = alias
+        self.prob_array = np.array(prob, dtype=np.float64)
+        self.alias_array = np.array(alias, dtype=np.int64)
+
+    def draw(self, random=rand.random):
+        """Draws a single index using one uniform variate."""
+        u = random() * self.size
+        i = int(u)
+        return i if (u - i) < self.prob[i] else self.alias[i]
+
+    def draw_many(self, n, rng):
+        """Draws n indices as an int64 array from a NumPy Generator."""
+        u = rng.random(n) * self.size
+        i = u.astype(np.int64)
+        return np.where((u - i) < self.prob_array[i], i, self.alias_array[i])
@@ -0,0 +1,319 @@
+import argparse
+import json
+import os
+import struct
+import numpy as np
+
+# File layout (little-endian):
+#   8 bytes   magic
+#   uint16    format version
+#   uint32    header length
+#   header    UTF-8 JSON: species order for the species ids
+#   records   fixed-width RECORD_DTYPE rows, appended in encounter order
+MAGIC = b'SHNYLOG1'
+FORMAT_VERSION = 1
+_PREAMBLE = struct.Struct('<8sHI')
+
+RECORD_DTYPE = np.dtype([('encounter', '<i8'), ('species', '<u2'), ('flags', 'u1')])
+FLAG_CAUGHT = 1
+FLAG_NEW_SHINY = 2
+
+CSV_COLUMNS = ['Encounter_Number', 'Pokemon', 'Catch_Successful', 'Is_New_Shiny']
+CHUNK_RECORDS = 1_000_000
+
+
+class ShinyLogError(Exception):
+    """Raised when a shiny log has an unknown format or a different species order."""
+
+
+def _read_header(f, path):
+    """Reads the preamble and header. Returns (species, data offset)."""
+    preamble = f.read(_PREAMBLE.size)
+    if len(preamble) < _PREAMBLE.size:
+        raise ShinyLogError(f"'{path}' is truncated")
+    magic, version, header_length = _PREAMBLE.unpack(preamble)
+    if magic != MAGIC:
+        raise ShinyLogError(f"'{path}' is not a binary shiny log")
+    if version > FORMAT_VERSION:
+        raise ShinyLogError(f"'{path}' uses shiny log format v{version}; this version reads up to v{FORMAT_VERSION}")
+    header = json.loads(f.read(header_length).decode('utf-8'))
+    return header['species'], _PREAMBLE.size + header_length
+
+
+def encode_records(rows):
+    """Builds a record array from [encounter, species_id, caught, is_new_shiny] rows."""
+    records = np.zeros(len(rows), dtype=RECORD_DTYPE)
+    if rows:
+        encounters, species, caught, is_new = zip(*rows)
+        records['encounter'] = encounters
+        records['species'] = species
+        records['flags'] = (np.asarray(caught, dtype=np.uint8) * FLAG_CAUGHT
+                            | np.asarray(is_new, dtype=np.uint8) * FLAG_NEW_SHINY)
+    return records
+
+
+def _count_through(f, data_offset, count, max_encounter):
+    """Number of leading records with encounter <= max_encounter, by binary search (records are in encounter order)."""
+    low, high = 0, count
+    while low < high:
+        middle = (low + high) // 2
+        f.seek(data_offset + middle * RECORD_DTYPE.itemsize)
+        if int.from_bytes(f.read(8), 'little', signed=True) <= max_encounter:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def last_encounter(path, max_encounter=None):
+    """Encounter number of the last record (at or before max_encounter), or 0 if there is none."""
+    with open(path, 'rb') as f:
+        _, data_offset = _read_header(f, path)
+        count = (os.path.getsize(path) - data_offset) // RECORD_DTYPE.itemsize
+        if max_encounter is not None:
+            count = _count_through(f, data_offset, count, max_encounter)
+        if count == 0:
+            return 0
+        f.seek(data_offset + (count - 1) * RECORD_DTYPE.itemsize)
+        return int.from_bytes(f.read(8), 'little', signed=True)
+
+
+class ShinyLogWriter:
+    """
+    Append-only writer for the binary shiny log.
+    Opening an existing log checks its species order and drops any partial
+    record left by an interrupted write. With max_encounter (the checkpointed
+    encounter of a resumed run), records after it are dropped too: the run replays
+    those encounters, so keeping them would log them twice.
+    """
+
+    def __init__(self, path, species, max_encounter=None):
+        self.path = path
+        self.species = list(species)
+
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                existing_species, data_offset = _read_header(f, path)
+            if existing_species != self.species:
+                raise ShinyLogError(f"'{path}' was written with a different species order")
+            size = os.path.getsize(path)
+            count = (size - data_offset) // RECORD_DTYPE.itemsize
+            self._file = open(path, 'r+b')
+            if max_encounter is not None:
+                count = _count_through(self._file, data_offset, count, max_encounter)
+            whole = data_offset + count * RECORD_DTYPE.itemsize
+            self._file.truncate(whole)
+            self._file.seek(whole)
+        else:
+            header = json.dumps({'species': self.species}).encode('utf-8')
+            self._file = open(path, 'wb')
+            self._file.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)) + header)
+
+    def append(self, rows):
+        """Appends [encounter, species_id, caught, is_new_shiny] rows."""
+        if rows:
+            self.append_records(encode_records(rows))
+
+    def append_records(self, records):
+        """Appends a RECORD_DTYPE array."""
+        self._file.write(np.ascontiguousarray(records, dtype=RECORD_DTYPE).tobytes())
+
+    def flush(self):
+        """Flushes the appended records and fsyncs them, so a checkpoint written after this never runs ahead of the log."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+def open_shiny_log(path):
+    """
+    Opens a binary shiny log zero-copy. Returns (records, species), where records is
+    a read-only numpy.memmap of RECORD_DTYPE rows and species maps ids to names.
+    """
+    with open(path, 'rb') as f:
+        species, data_offset = _read_header(f, path)
+    count = (os.path.getsize(path) - data_offset) // RECORD_DTYPE.itemsize
+    if count == 0:
+        return np.zeros(0, dtype=RECORD_DTYPE), species
+    return np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=data_offset, shape=(count,)), species
+
+
+SPECIES_STAT_FIELDS = ('shiny_encountered', 'first_shiny_encounter', 'last_shiny_encounter',
+                       'first_shiny_catch', 'last_shiny_catch')
+
+
+def empty_species_stats(size):
+    """Per-species shiny stat arrays. Encounter numbers start at 1, so 0 means 'never'."""
+    return {field: np.zeros(size, dtype=np.int64) for field in SPECIES_STAT_FIELDS}
+
+
+def accumulate_species_stats(stats, encounters, species, caught):
+    """
+    Folds a run of shiny events, in encounter order, into the per-species stats:
+    counts via bincount, first/last rows per species via unique on the ordered run.
+    """
+    encounters = np.asarray(encounters, dtype=np.int64)
+    species = np.asarray(species, dtype=np.int64)
+    caught = np.asarray(caught, dtype=bool)
+    if len(species) == 0:
+        return stats
+
+    size = len(stats['shiny_encountered'])
+    stats['shiny_encountered'] += np.bincount(species, minlength=size)
+    for first_field, last_field, mask in (('first_shiny_encounter', 'last_shiny_encounter', slice(None)),
+                                          ('first_shiny_catch', 'last_shiny_catch', caught)):
+        ids = species[mask]
+        values = encounters[mask]
+        if len(ids) == 0:
+            continue
+        present, first_rows = np.unique(ids, return_index=True)
+        unset = stats[first_field][present] == 0
+        stats[first_field][present[unset]] = values[first_rows[unset]]
+        present, last_rows = np.unique(ids[::-1], return_index=True)
+        stats[last_field][present] = values[::-1][last_rows]
+    return stats
+
+
+def species_stats(path, max_encounter=None, chunk_records=CHUNK_RECORDS):
+    """
+    Recomputes per-species shiny stats from a binary log, chunk by chunk, ignoring
+    records after max_encounter (rows written after the last checkpoint).
+    """
+    records, species = open_shiny_log(path)
+    stats = empty_species_stats(len(species))
+    for start in range(0, len(records), chunk_records):
+        chunk = records[start:start + chunk_records]
+        if max_encounter is not None:
+            chunk = chunk[chunk['encounter'] <= max_encounter]
+        caught = (chunk['flags'] & FLAG_CAUGHT) != 0
+        accumulate_species_stats(stats, chunk['encounter'], chunk['species'], caught)
+    return stats
+
+
+def import_csv(csv_path, log_path, species):
+    """Builds a binary shiny log from an existing shiny_analysis_log.csv."""
+    import pandas as pd
+
+    species_index = {name: i for i, name in enumerate(species)}
+    writer = ShinyLogWriter(log_path, species)
+    try:
+        for chunk in pd.read_csv(csv_path, chunksize=CHUNK_RECORDS):
+            chunk = chunk[chunk['Pokemon'].isin(species_index)]
+            records = np.zeros(len(chunk), dtype=RECORD_DTYPE)
+            records['encounter'] = chunk['Encounter_Number'].to_numpy()
+            records['species'] = chunk['Pokemon'].map(species_index).to_numpy()
+            records['flags'] = (_csv_bool(chunk['Catch_Successful']) * FLAG_CAUGHT
+                                | _csv_bool(chunk['Is_New_Shiny']) * FLAG_NEW_SHINY)
+            writer.append_records(records)
+    finally:
+        writer.close()
+
+
+def remap_species(path, species, chunk_records=CHUNK_RECORDS):
+    """
+    Rewrites a shiny log for a new species order, mapping the ids by name, and replaces
+    the file only when done. Records of species missing from the new order are dropped.
+    Returns the number of dropped records.
+    """
+    records, old_species = open_shiny_log(path)
+    index = {name: i for i, name in enumerate(species)}
+    mapping = np.array([index.get(name, -1) for name in old_species], dtype=np.int64)
+
+    temp_path = path + '.tmp'
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    writer = ShinyLogWriter(temp_path, species)
+    dropped = 0
+    try:
+        for start in range(0, len(records), chunk_records):
+            chunk = np.array(records[start:start + chunk_records])
+            new_ids = mapping[chunk['species']]
+            keep = new_ids >= 0
+            chunk = chunk[keep]
+            chunk['species'] = new_ids[keep]
+            writer.append_records(chunk)
+            dropped += int(len(keep) - keep.sum())
+    finally:
+        writer.close()
+    del records
+    os.replace(temp_path, path)
+    return dropped
+
+
+def _csv_bool(column):
+    """Parses a True/False column that pandas may have read as bool or str."""
+    if column.dtype == bool:
+        return column.to_numpy().astype(np.uint8)
+    return (column.astype(str).str.lower() == 'true').to_numpy().astype(np.uint8)
+
+
+def iter_frames(path, chunk_records=CHUNK_RECORDS):
+    """Yields the log as pandas DataFrames with the CSV column layout, chunk by chunk."""
+    import pandas as pd
+
+    records, species = open_shiny_log(path)
+    names = np.asarray(species, dtype=object)
+    for start in range(0, len(records), chunk_records):
+        chunk = records[start:start + chunk_records]
+        yield pd.DataFrame({
+            'Encounter_Number': chunk['encounter'],
+            'Pokemon': names[chunk['species']],
+            'Catch_Successful': (chunk['flags'] & FLAG_CAUGHT) != 0,
+            'Is_New_Shiny': (chunk['flags'] & FLAG_NEW_SHINY) != 0
+        })
+
+
+def to_csv(path, out_path):
+    """Converts a binary shiny log to the shiny_analysis_log.csv layout, replacing out_path only when done."""
+    wrote_header = False
+    temp_path = out_path + '.tmp'
+    with open(temp_path, 'w', newline='', encoding='utf-8') as f:
+        for frame in iter_frames(path):
+            frame.to_csv(f, index=False, header=not wrote_header)
+            wrote_header = True
+        if not wrote_header:
+            f.write(','.join(CSV_COLUMNS) + '\n')
+    os.replace(temp_path, out_path)
+
+
+def to_parquet(path, out_path):
+    """Converts a binary shiny log to Parquet (requires pyarrow)."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ShinyLogError("Parquet export needs pyarrow: pip install pyarrow")
+
+    writer = None
+    try:
+        for frame in iter_frames(path):
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(out_path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert binary shiny logs for Power BI and other tools.")
+    parser.add_argument('format', choices=['csv', 'parquet'], help="Output format")
+    parser.add_argument('log', help="Path to shiny_log.bin")
+    parser.add_argument('output', nargs='?', help="Output path (default: next to the log)")
+    args = parser.parse_args()
+
+    if args.format == 'csv':
+        output = args.output or os.path.join(os.path.dirname(args.log), 'shiny_analysis_log.csv')
+        to_csv(args.log, output)
+    else:
+        output = args.output or os.path.splitext(args.log)[0] + '.parquet'
+        to_parquet(args.log, output)
+    print(f"✓ Wrote {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,129 @@
-# Required libraries: pip install pandas openpyxl
+# Required libraries: pip install pandas openpyxl numpy
+import argparse
 import random as rand
-import pandas as pd
+import numpy as np
 import json
+import hashlib
+import signal
 import sys
+import threading
 import time
 import os
 import csv
+from contextlib import contextmanager
 from datetime import datetime
+from sampler import AliasSampler
+from prediction import completion_percentiles, completion_moments, last_event_moments, CompletionEstimator
+import checkpoint
+import shinylog
+import pokedata
+import metrics
+from asyncwriter import BackgroundWriter, WriterError
+
+
+def simulate_encounter_block(sampler, catch_probabilities, shiny_rate, rng, block_size,
+                             limit=None, track_first=True, chunk_size=2_000_000):
+    """
+    Draws a block of encounters in chunks and returns a compact summary dict:
+    shiny offsets/species/catch flags, species-indexed normal counts and the offset of
+    each species' first normal encounter (-1 if unseen). Offsets are relative to the
+    block start. With limit set, the same draws are made but only the first `limit`
+    encounters are summarized, so a block can be redrawn exactly up to a given point.
+    """
+    total_species = sampler.size
+    length = block_size if limit is None else min(limit, block_size)
+    normal_counts = np.zeros(total_species, dtype=np.int64)
+    first_offsets = np.full(total_species, -1, dtype=np.int64)
+    shiny_offsets, shiny_species, shiny_caught = [], [], []
+    
+    for chunk_start in range(0, length, chunk_size):
+        n = min(chunk_size, block_size - chunk_start)
+        species = sampler.draw_many(n, rng)
+        shiny_mask = rng.random(n) < shiny_rate
+        shiny_index = np.flatnonzero(shiny_mask)
+        caught = rng.random(len(shiny_index)) <= catch_probabilities[species[shiny_index]]
+        
+        cut = min(n, length - chunk_start)
+        if cut < n:
+            species = species[:cut]
+            shiny_mask = shiny_mask[:cut]
+            keep = shiny_index < cut
+            shiny_index = shiny_index[keep]
+            caught = caught[keep]
+        
+        shiny_offsets.append(shiny_index + chunk_start)
+        shiny_species.append(species[shiny_index])
+        shiny_caught.append(caught)
+        
+        normal_index = np.flatnonzero(~shiny_mask)
+        normal_species = species[normal_index]
+        normal_counts += np.bincount(normal_species, minlength=total_species)
+        
+        if track_first and (first_offsets < 0).any():
+            seen, first_index = np.unique(normal_species, return_index=True)
+            new = first_offsets[seen] < 0
+            first_offsets[seen[new]] = normal_index[first_index[new]] + chunk_start
+    
+    return {
+        'length': length,
+        'shiny_offsets': np.concatenate(shiny_offsets) if shiny_offsets else np.zeros(0, dtype=np.int64),
+        'shiny_species': np.concatenate(shiny_species) if shiny_species else np.zeros(0, dtype=np.int64),
+        'shiny_caught': np.concatenate(shiny_caught) if shiny_caught else np.zeros(0, dtype=bool),
+        'normal_counts': normal_counts,
+        'normal_first_offsets': first_offsets
+    }
+
+
+def simulate_shard(sampler, catch_probabilities, shiny_rate, entropy, block_start, block_size, limit=None,
+                   spawn_key=()):
+    """
+    Simulates one shard of a sharded run. The generator is derived from the run seed
+    (entropy and spawn key) and the block's starting encounter, so any shard can be
+    redrawn deterministically.
+    """
+    rng = np.random.default_rng(np.random.SeedSequence(entropy, spawn_key=tuple(spawn_key) + (block_start,)))
+    return simulate_encounter_block(sampler, catch_probabilities, shiny_rate, rng, block_size, limit=limit)
+
+
+def truncate_timeline(path, max_encounter, chunk_size=1 << 16):
+    """
+    Cuts encounter_timeline.csv after the last row whose milestone is <= max_encounter,
+    dropping rows a crashed run wrote past its checkpoint and any partial last line.
+    Reads backwards from the end, so only the dropped tail is scanned. Returns the last
+    kept milestone, 0 if only the header is left, or None if not even the header is.
+    """
+    with open(path, 'r+b') as f:
+        position = cut = f.seek(0, os.SEEK_END)
+        tail = b''
+        last_milestone = None
+        while True:
+            # tail holds the bytes from `position` to `cut`; look at its last line
+            line_start = tail.rfind(b'\n', 0, len(tail) - 1) + 1
+            if line_start == 0 and position > 0:
+                step = min(chunk_size, position)
+                position -= step
+                f.seek(position)
+                tail = f.read(step) + tail
+                continue
+            line = tail[line_start:]
+            milestone = line.split(b',', 1)[0]
+            complete = line.endswith(b'\n')
+            if complete and (not milestone.isdigit() or int(milestone) <= max_encounter):
+                last_milestone = int(milestone) if milestone.isdigit() else 0
+                break  # Header or a row inside the checkpoint
+            cut -= len(line)
+            tail = tail[:line_start]
+            if not tail:
+                break
+        if cut < f.seek(0, os.SEEK_END):
+            f.truncate(cut)
+    return last_milestone
+
+
+def _ignore_interrupts():
+    """Worker initializer: Ctrl+C is handled by the parent, which stops the pool itself."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
 
 class ShinySimulation:
     """
@@ -18,34 +135,95 @@ class ShinySimulation:
     RUN_REGISTRY = 'reports/run_registry.json'
     MASTER_RESULTS = 'simulation_results.csv'
     TIMELINE_LOG_INTERVAL = 5000  # Log timeline every 5k encounters
+    ENGINES = ('scalar', 'batch', 'event', 'sharded')
+    REPORT_STREAM = 1  # Substream key for report-only draws, which must not touch the run's generators
+    # Methods timed when metrics are on, by section; untimed loop time is reported as 'sampling'
+    INSTRUMENTED_SECTIONS = {
+        '_handle_shiny_encounter': 'shiny',
+        'apply_encounter_block': 'shiny',
+        '_flush_shiny_buffer': 'flush',
+        '_flush_timeline_buffer': 'flush',
+        'save_checkpoint': 'checkpoint',
+        '_write_shiny_rows': 'write',
+        '_write_timeline_rows': 'write',
+        '_write_checkpoint': 'write',
+        '_update_eta': 'eta',
+        '_log_timeline_milestone': 'timeline',
+        '_display_progress': 'progress'
+    }
+    SHINY_RATES = {
+        'standard': 1/4096,
+        'charm': 1/1365.3,
+        'masuda': 1/682.7,
+        'both': 1/512.0
+    }
 
-    def __init__(self, excel_path='Pokemon Stats.xlsx', sheet_name='Pokedex', reports_dir='reports'):
+    def __init__(self, excel_path='Pokemon Stats.xlsx', sheet_name='Pokedex', reports_dir='reports',
+                 run_name=None, shiny_modifier='standard', guaranteed_catch=False, engine='scalar',
+                 seed=None, save_master_results=True, register_run=True,
+                 stability_constant=100, rarity_exponent=1.8, metrics_format=None, profile=False):
         
         self.base_reports_dir = reports_dir
         self.excel_path = excel_path
         self.sheet_name = sheet_name
+        self.save_master_results = save_master_results
+        self.register_run = register_run
+        self.run_results = None
         
-        # --- Interactive Setup ---
-        self._setup_simulation()
+        # --- Spawn model (a resumed interactive run restores its own) ---
+        self.STABILITY_CONSTANT = stability_constant
+        self.RARITY_EXPONENT = rarity_exponent
+        
+        # --- Setup: interactive unless a run name is given ---
+        if run_name is None:
+            self._setup_simulation()
+        else:
+            self._configure_run(run_name, shiny_modifier, guaranteed_catch, engine)
         
         # --- File Paths ---
         self.REPORTS_DIR = os.path.join(reports_dir, self.run_name)
-        self.CHECKPOINT_FILE = os.path.join(self.REPORTS_DIR, 'checkpoint.json')
+        self.CHECKPOINT_FILE = os.path.join(self.REPORTS_DIR, 'checkpoint.bin')
+        self.CHECKPOINT_JSON = os.path.join(self.REPORTS_DIR, 'checkpoint.json')  # Legacy format and export
+        self.SHINY_LOG_FILE = os.path.join(self.REPORTS_DIR, 'shiny_log.bin')
+        self.SHINY_LOG_CSV = os.path.join(self.REPORTS_DIR, 'shiny_analysis_log.csv')
         
         # --- Configuration ---
         self.BUFFER_SIZE = 1000
-        self.PROGRESS_UPDATE_INTERVAL = 100000
-        self.CHECKPOINT_INTERVAL = 25_000_000
-        self.STABILITY_CONSTANT = 100
-        self.RARITY_EXPONENT = 1.8
+        self.WRITE_QUEUE_SIZE = 64  # Batches the writer thread may fall behind before the loop waits for it
+        self.WRITE_SHINY_CSV = True  # Export shiny_analysis_log.csv from shiny_log.bin whenever the run stops
+        self.PROGRESS_SECONDS = 1.0  # Monitor thread: seconds between progress lines and ETA refreshes
+        self.SHOW_PROGRESS = True  # Monitor thread: render the live progress line (off when stdout is a log file)
+        self.CHECKPOINT_SECONDS = 300  # Monitor thread: seconds between checkpoints
+        self.NORMAL_RESOLVE_INTERVAL = 25_000_000  # Event engine: skipped normals get species at least this often
+        self.BATCH_SIZE = 2_000_000  # Encounters per block in the batch engine
+        self.SHARD_BLOCK_SIZE = 50_000_000  # Encounters per worker block in the sharded engine
+        self.SHARD_WORKERS = os.cpu_count() or 1
+        
+        # --- Instrumentation (off unless asked for; see metrics.py) ---
+        self.METRICS_FORMAT = metrics_format  # 'prometheus' or 'jsonl'
+        self.METRICS_FILE = os.path.join(self.REPORTS_DIR, 'metrics.jsonl' if metrics_format == 'jsonl' else 'metrics.prom')
+        self.METRICS_EXPORT_INTERVAL = 10  # Seconds between exports
+        self.METRICS_WINDOW = 60  # Seconds covered by the rolling EPS/SPS
+        self.PROFILE = profile
+        self.PROFILE_FILE = os.path.join(self.REPORTS_DIR, 'profile.folded')
+        self.metrics = None
+        self.profiler = None
 
         # --- Data Loading ---
         self.pokedex = self._load_pokedex_data(excel_path, sheet_name)
         self.total_pokemon = len(self.pokedex)
         self.pokemon_for_encountering, self.spawn_weights = self._prepare_encounter_lists()
+        self.species_index = {name: i for i, name in enumerate(self.pokemon_for_encountering)}
+        self.spawn_probabilities, self.catch_probabilities = self._prepare_batch_arrays()
+        self._catch_probability_list = self.catch_probabilities.tolist()
+        self._species_sampler_key = None
+        self.species_sampler = self._prepare_species_sampler()
+        self._seed_generators(seed)
         
         # --- Calculate probability table for predictions ---
         self.pokemon_probabilities = self._calculate_pokemon_probabilities()
+        self.completion_probabilities = np.array([self.pokemon_probabilities[name]
+                                                  for name in self.pokemon_for_encountering])
 
         # --- State Variables ---
         self.total_encounter = 0
@@ -53,10 +231,22 @@ class ShinySimulation:
         self.total_shinies_caught = 0
         self.total_shinies_missed = 0
         self.total_normals_caught = 0
-        self.shiny_dex = set()
-        self.normal_dex = set()
-        self.shiny_box_counts = {}
-        self.normal_box_counts = {}
+        # Species-indexed state; names are only resolved when writing logs and reports.
+        # The normal dex is every species with a nonzero normal box count.
+        self.shiny_dex = np.zeros(self.total_pokemon, dtype=bool)
+        self.unique_shinies = 0
+        self.shiny_box_counts = np.zeros(self.total_pokemon, dtype=np.int64)
+        self.normal_box_counts = np.zeros(self.total_pokemon, dtype=np.int64)
+        self._normal_counts_view = memoryview(self.normal_box_counts)  # Fast scalar increments
+        self.shiny_stats = shinylog.empty_species_stats(self.total_pokemon)  # First/last shiny encounter and catch
+        self.pending_normals = 0  # Normal encounters not yet assigned to a species (event engine)
+        self.next_shiny_encounter = 0  # Event engine: encounter number of the next shiny, 0 if not drawn yet
+        self._stop_requested = False  # Set by Ctrl+C; the loops stop at their next safe point
+        self._state_consistent = True  # False while a loop runs; only a consistent state may be checkpointed
+        self._checkpoint_requested = False  # Set by the monitor thread; the loops checkpoint at their next safe point
+        self._monitor = None
+        self._monitor_stop = None
+        self._eta_synced = None  # Shiny dex as last seen by the monitor's ETA refresh
         self.start_time = time.time()
         self.simulation_start_time = time.time()
         self.past_elapsed_seconds = 0
@@ -64,7 +254,8 @@ class ShinySimulation:
         
         # Prediction tracking
         self.initial_prediction = None
-        self.last_eta_update = 0
+        self.eta_estimator = None
+        self._distribution_cache = {}
         self.current_eta_encounters = 0
         self.current_eta_hours = 0
         
@@ -72,12 +263,59 @@ class ShinySimulation:
         self.shiny_log_buffer = []
         self.timeline_buffer = []
         
-        # File handles
-        self._active_shiny_writer = None
+        # File handles (written by the background writer thread while the loop runs)
+        self._writer = None
+        self._shiny_log_writer = None
         self._active_timeline_writer = None
-        self._shiny_file_handle = None
         self._timeline_file_handle = None
 
+    def _seed_generators(self, seed):
+        """
+        Creates the run's own generators from one seed: a PCG64 NumPy generator and a
+        random.Random for the scalar paths. Accepts an int, a numpy SeedSequence, or None
+        for fresh OS entropy. The seed and generator states go into every checkpoint.
+        """
+        seed_seq = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        self.seed_given = seed is not None
+        self.seed_entropy = seed_seq.entropy
+        self.seed_spawn_key = tuple(seed_seq.spawn_key)
+        self.np_rng = np.random.default_rng(seed_seq)
+        self.py_rng = rand.Random(int(seed_seq.generate_state(1, np.uint64)[0]))
+        self._random = self.py_rng.random
+    
+    def substream(self, *key):
+        """
+        Independent NumPy generator for `key` (e.g. a worker or block number), derived from
+        the run seed. The same key always gives the same stream; the run's generators are untouched.
+        """
+        return np.random.default_rng(np.random.SeedSequence(self.seed_entropy, spawn_key=self.seed_spawn_key + key))
+    
+    def _rng_state(self):
+        """Seed and generator states for the checkpoint."""
+        version, internal_state, gauss_next = self.py_rng.getstate()
+        return {
+            'seed_entropy': self.seed_entropy,
+            'seed_spawn_key': list(self.seed_spawn_key),
+            'numpy': self.np_rng.bit_generator.state,
+            'python': [version, list(internal_state), gauss_next],
+            'next_shiny_encounter': self.next_shiny_encounter
+        }
+    
+    def _restore_rng_state(self, rng_state):
+        """Restores the checkpointed seed and generator states, so the run continues its own stream."""
+        if rng_state is None:
+            print("⚠ Warning: Checkpoint has no RNG state; continuing with a new random stream.")
+            return
+        if self.seed_given and rng_state['seed_entropy'] != self.seed_entropy:
+            print("⚠ Warning: Ignoring --seed; the checkpoint continues its own random stream.")
+        
+        self.seed_entropy = rng_state['seed_entropy']
+        self.seed_spawn_key = tuple(rng_state['seed_spawn_key'])
+        self.np_rng.bit_generator.state = rng_state['numpy']
+        version, internal_state, gauss_next = rng_state['python']
+        self.py_rng.setstate((version, tuple(internal_state), gauss_next))
+        self.next_shiny_encounter = rng_state.get('next_shiny_encounter', 0)
+
     def _calculate_pokemon_probabilities(self):
         """Calculate p_i for each Pokémon for prediction purposes."""
         probabilities = {}
@@ -91,48 +329,25 @@ class ShinySimulation:
         
         return probabilities
 
-    def _calculate_expected_encounters_remaining(self, remaining_pokemon=None):
-        """
-        Calculates expected encounters using Weighted Coupon Collector formula.
-        If remaining_pokemon is None, calculates for all Pokémon.
-        """
-        if remaining_pokemon is None:
-            probabilities = list(self.pokemon_probabilities.values())
-        else:
-            probabilities = [self.pokemon_probabilities[name] for name in remaining_pokemon 
-                           if name in self.pokemon_probabilities]
-        
-        if not probabilities:
-            return 0
-        
-        # Sort descending for efficiency
-        probabilities = sorted(probabilities, reverse=True)
-        total_expected = 0
-        
-        while probabilities:
-            sum_prob = sum(probabilities)
-            if sum_prob == 0:
-                break
-            total_expected += 1 / sum_prob
-            probabilities.pop(0)
-        
-        return total_expected
-
     def _display_startup_prediction(self):
         """Display expected completion stats at startup."""
-        remaining_pokemon = [name for name in self.pokedex.keys() if name not in self.shiny_dex]
-        expected_encounters = self._calculate_expected_encounters_remaining(remaining_pokemon)
+        remaining_count = self.total_pokemon - self.unique_shinies
+        self._update_eta()
+        expected_encounters = self.current_eta_encounters
         
         # Estimate based on typical EPS (assume 26,000 if starting fresh)
         estimated_eps = 26000
         estimated_hours = expected_encounters / estimated_eps / 3600
         estimated_days = estimated_hours / 24
+        distribution = self.completion_distribution(eps=estimated_eps)
         
         self.initial_prediction = {
             'expected_total_encounters': self.total_encounter + expected_encounters,
             'expected_additional_encounters': expected_encounters,
             'estimated_hours': estimated_hours,
-            'estimated_days': estimated_days
+            'estimated_days': estimated_days,
+            'percentile_additional_encounters': {f"P{q * 100:g}": values['encounters']
+                                                 for q, values in distribution.items()}
         }
         
         print("\n" + "="*60)
@@ -140,7 +355,7 @@ class ShinySimulation:
         print("="*60)
         print(f"Shiny Rate: {self.shiny_modifier} ({self.SHINY_RATE:.10f})")
         print(f"Catch Mode: {'Guaranteed' if self.guaranteed_catch else 'Normal'}")
-        print(f"Pokémon Remaining: {len(remaining_pokemon)}/{self.total_pokemon}")
+        print(f"Pokémon Remaining: {remaining_count}/{self.total_pokemon}")
         
         if self.total_encounter > 0:
             print(f"\nCurrent Progress: {self.total_encounter:,} encounters")
@@ -155,63 +370,101 @@ class ShinySimulation:
         else:
             print(f"  {estimated_hours:.1f} hours")
         
+        print(f"\nCompletion Percentiles (additional encounters):")
+        for q, values in distribution.items():
+            print(f"  P{q * 100:g}: {values['encounters']:,.0f} encounters (~{values['hours']:.1f} hours)")
+        
         print(f"\nNote: This is theoretical. Actual results will vary due to RNG.")
         print("="*60 + "\n")
 
-    def _update_eta(self):
-        """Update ETA calculation based on current progress."""
-        # Only update ETA every 1M encounters to reduce overhead
-        if self.total_encounter - self.last_eta_update < 1_000_000:
-            return
-        
-        self.last_eta_update = self.total_encounter
+    def completion_distribution(self, quantiles=(0.5, 0.9, 0.99), eps=None):
+        """
+        Percentile ETAs for the species still missing from the shiny dex.
+        Encounter percentiles come from the CDF P(T <= n) = prod(1 - (1 - p_i)^n) and
+        are cached per remaining-set fingerprint; hours use `eps`, or the current
+        session's encounter rate when not given.
+        Returns {quantile: {'encounters': ..., 'hours': ...}}.
+        """
+        fingerprint = hashlib.sha1(np.packbits(self.shiny_dex).tobytes()).hexdigest()
+        key = (fingerprint, tuple(quantiles))
         
-        remaining_pokemon = [name for name in self.pokedex.keys() if name not in self.shiny_dex]
-        if not remaining_pokemon:
-            self.current_eta_encounters = 0
-            self.current_eta_hours = 0
-            return
+        if key not in self._distribution_cache:
+            probabilities = self.completion_probabilities[~self.shiny_dex]
+            self._distribution_cache[key] = completion_percentiles(probabilities, quantiles)
+        percentiles = self._distribution_cache[key]
         
-        expected_remaining = self._calculate_expected_encounters_remaining(remaining_pokemon)
+        if eps is None:
+            session_seconds = time.time() - self.simulation_start_time
+            eps = self.total_encounter / session_seconds if session_seconds > 0 and self.total_encounter > 0 else 26000
         
-        # Use actual EPS from current session
-        elapsed = time.time() - self.simulation_start_time
-        if elapsed > 0:
-            actual_eps = self.total_encounter / elapsed
-            self.current_eta_hours = expected_remaining / actual_eps / 3600
-            self.current_eta_encounters = expected_remaining
+        return {q: {'encounters': encounters, 'hours': encounters / eps / 3600}
+                for q, encounters in percentiles.items()}
+
+    def _update_eta(self, caught_species=None):
+        """
+        Updates the expected remaining encounters after a new unique catch.
+        The estimator is built once from the current shiny dex and then only
+        has the newly caught species removed, so this is cheap enough to run
+        on every new unique.
+        """
+        if self.eta_estimator is None:
+            self.eta_estimator = CompletionEstimator(dict(enumerate(self.completion_probabilities.tolist())))
+            for species in np.flatnonzero(self.shiny_dex).tolist():
+                self.eta_estimator.remove(species)
+        elif caught_species is not None:
+            self.eta_estimator.remove(caught_species)
+        
+        self.current_eta_encounters = self.eta_estimator.expected_remaining
 
     # ... (All the registry methods stay the same) ...
-    def _load_run_registry(self):
+    @classmethod
+    def _load_run_registry(cls):
         """Loads the registry of all simulation runs."""
-        if os.path.exists(self.RUN_REGISTRY):
+        if os.path.exists(cls.RUN_REGISTRY):
             try:
-                with open(self.RUN_REGISTRY, 'r') as f:
+                with open(cls.RUN_REGISTRY, 'r') as f:
                     return json.load(f)
             except json.JSONDecodeError:
                 print("⚠ Warning: run_registry.json is corrupted. Starting fresh.")
                 return {'runs': {}, 'last_active': None}
         return {'runs': {}, 'last_active': None}
 
-    def _save_run_registry(self, registry):
-        """Saves the run registry."""
-        with open(self.RUN_REGISTRY, 'w') as f:
+    @classmethod
+    def _save_run_registry(cls, registry):
+        """Saves the run registry, replacing the file in one step."""
+        os.makedirs(os.path.dirname(cls.RUN_REGISTRY), exist_ok=True)
+        temp_path = cls.RUN_REGISTRY + '.tmp'
+        with open(temp_path, 'w') as f:
             json.dump(registry, f, indent=4)
+        os.replace(temp_path, cls.RUN_REGISTRY)
 
-    def _update_run_registry(self):
-        """Updates the registry with current run info."""
-        registry = self._load_run_registry()
-        
-        registry['runs'][self.run_name] = {
+    @classmethod
+    def _register_runs(cls, entries, last_active=None):
+        """Adds or updates several registry entries in a single read/write."""
+        registry = cls._load_run_registry()
+        registry['runs'].update(entries)
+        if last_active:
+            registry['last_active'] = last_active
+        cls._save_run_registry(registry)
+
+    def registry_entry(self):
+        """Returns this run's entry for the run registry."""
+        return {
             'shiny_modifier': self.shiny_modifier,
             'guaranteed_catch': self.guaranteed_catch,
+            'engine': self.engine,
+            'stability_constant': self.STABILITY_CONSTANT,
+            'rarity_exponent': self.RARITY_EXPONENT,
             'last_updated': datetime.now().isoformat(),
             'checkpoint_path': self.CHECKPOINT_FILE,
             'reports_dir': self.REPORTS_DIR
         }
-        registry['last_active'] = self.run_name
-        
-        self._save_run_registry(registry)
+
+    def _update_run_registry(self):
+        """Updates the registry with current run info."""
+        if not self.register_run:
+            return
+        self._register_runs({self.run_name: self.registry_entry()}, last_active=self.run_name)
 
     def _list_available_runs(self):
         """Lists all runs with checkpoints."""
@@ -225,6 +478,36 @@ class ShinySimulation:
         
         return available_runs, registry.get('last_active')
 
+    @classmethod
+    def resume_settings(cls, run_name='last'):
+        """
+        Looks up a registered run's settings for a non-interactive resume, without
+        scanning the other runs. 'last' picks the last active run.
+        Returns kwargs for ShinySimulation(); raises ValueError if there is nothing to resume.
+        """
+        registry = cls._load_run_registry()
+        if run_name == 'last':
+            run_name = registry.get('last_active')
+            if not run_name:
+                raise ValueError("No last active run to resume")
+        
+        info = registry['runs'].get(run_name)
+        if info is None:
+            raise ValueError(f"Run '{run_name}' is not in {cls.RUN_REGISTRY}")
+        checkpoint_path = info.get('checkpoint_path', '')
+        legacy_path = os.path.join(os.path.dirname(checkpoint_path), 'checkpoint.json')
+        if not (os.path.exists(checkpoint_path) or os.path.exists(legacy_path)):
+            raise ValueError(f"Run '{run_name}' has no checkpoint to resume")
+        
+        return {
+            'run_name': run_name,
+            'shiny_modifier': info.get('shiny_modifier', 'standard'),
+            'guaranteed_catch': info.get('guaranteed_catch', False),
+            'engine': info.get('engine', 'scalar'),
+            'stability_constant': info.get('stability_constant', 100),
+            'rarity_exponent': info.get('rarity_exponent', 1.8)
+        }
+
     def _setup_simulation(self):
         """Interactive setup for new or resumed simulation."""
         print("\n" + "="*60)
@@ -241,6 +524,7 @@ class ShinySimulation:
                 print(f"  {i}. {run_name}{marker}")
                 print(f"     - Shiny Rate: {info.get('shiny_modifier', 'unknown')}")
                 print(f"     - Catch Mode: {'Guaranteed' if info.get('guaranteed_catch') else 'Normal'}")
+                print(f"     - Engine: {info.get('engine', 'scalar')}")
                 print(f"     - Last Updated: {info.get('last_updated', 'unknown')}")
             
             print(f"  {len(available_runs) + 1}. Start a new simulation")
@@ -253,11 +537,15 @@ class ShinySimulation:
                     self.run_name, info = available_runs[choice_num - 1]
                     self.shiny_modifier = info.get('shiny_modifier')
                     self.guaranteed_catch = info.get('guaranteed_catch')
+                    self.engine = info.get('engine', 'scalar')
+                    self.STABILITY_CONSTANT = info.get('stability_constant', self.STABILITY_CONSTANT)
+                    self.RARITY_EXPONENT = info.get('rarity_exponent', self.RARITY_EXPONENT)
                     self.SHINY_RATE = self._get_shiny_rate_from_modifier(self.shiny_modifier)
                     
                     print(f"\n✓ Resuming run: '{self.run_name}'")
                     print(f"  Shiny Rate: {self.shiny_modifier}")
                     print(f"  Catch Mode: {'Guaranteed' if self.guaranteed_catch else 'Normal'}")
+                    print(f"  Engine: {self.engine}")
                     return
             except ValueError:
                 pass
@@ -306,56 +594,62 @@ class ShinySimulation:
         catch_choice = input("Select option (1-2): ").strip()
         self.guaranteed_catch = (catch_choice == '2')
         
+        # Get engine
+        print("\n--- Engine Options ---")
+        print("1. Scalar (one encounter at a time)")
+        print("2. Batch (NumPy blocks of encounters)")
+        print("3. Event-driven (skip ahead from shiny to shiny)")
+        print("4. Sharded (one run split across all CPU cores)")
+        
+        engine_choice = input("Select option (1-4): ").strip()
+        engine_map = {'1': 'scalar', '2': 'batch', '3': 'event', '4': 'sharded'}
+        self.engine = engine_map.get(engine_choice, 'scalar')
+        
         print(f"\n✓ Simulation configured:")
         print(f"  Run Name: {self.run_name}")
         print(f"  Shiny Rate: {self.shiny_modifier} ({self.SHINY_RATE:.10f})")
         print(f"  Catch Mode: {'Guaranteed' if self.guaranteed_catch else 'Normal'}")
+        print(f"  Engine: {self.engine}")
+
+    def _configure_run(self, run_name, shiny_modifier, guaranteed_catch, engine):
+        """Non-interactive setup for scripted and parallel runs."""
+        if not run_name.replace('_', '').replace('-', '').isalnum():
+            raise ValueError(f"Invalid run name '{run_name}'. Use only letters, numbers, hyphens, and underscores.")
+        if shiny_modifier not in self.SHINY_RATES:
+            raise ValueError(f"Unknown shiny modifier '{shiny_modifier}'. Options: {', '.join(self.SHINY_RATES)}")
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown engine '{engine}'. Options: {', '.join(self.ENGINES)}")
+        
+        self.run_name = run_name
+        self.shiny_modifier = shiny_modifier
+        self.SHINY_RATE = self.SHINY_RATES[shiny_modifier]
+        self.guaranteed_catch = bool(guaranteed_catch)
+        self.engine = engine
 
     def _get_shiny_rate_from_modifier(self, modifier):
         """Converts modifier string to shiny rate."""
-        rate_map = {
-            'standard': 1/4096,
-            'charm': 1/1365.3,
-            'masuda': 1/682.7,
-            'both': 1/512.0
-        }
-        return rate_map.get(modifier, 1/4096)
+        return self.SHINY_RATES.get(modifier, 1/4096)
 
     def _load_pokedex_data(self, excel_path, sheet_name):
-        """Loads Pokedex data and calculates spawn weights."""
-        try:
-            df = pd.read_excel(excel_path, sheet_name=sheet_name)
-        except FileNotFoundError:
-            print(f"FATAL ERROR: Could not find '{excel_path}'")
-            return {}
-        except ValueError as e:
-            print(f"FATAL ERROR: Could not find sheet '{sheet_name}': {e}")
-            return {}
-
-        processed_pokedex = {}
-        
+        """Loads Pokedex data and spawn weights from the compiled pokedex cache (compiling it on a miss)."""
         print(f"\nLoading Pokémon data...")
         print(f"  Stability Constant: {self.STABILITY_CONSTANT}")
         print(f"  Rarity Exponent: {self.RARITY_EXPONENT}")
 
-        for index, pokemon in df.iterrows():
-            name = pokemon['name']
-            base_total = pokemon['base total']
-            is_legendary = pokemon.get('is_legendary', False)
-            is_mythical = pokemon.get('is_mythical', False)
-
-            spawn_weight = 1 / ((base_total + self.STABILITY_CONSTANT) ** self.RARITY_EXPONENT)
-
-            processed_pokedex[name] = {
-                'pokedex number': pokemon['pokedex number'],
-                'Catch Rate': pokemon['Catch Rate'],
-                'Spawn Weight': spawn_weight,
-                'base_total': base_total,
-                'is_legendary': is_legendary,
-                'is_mythical': is_mythical
-            }
+        try:
+            columns, from_cache = pokedata.load_pokedex(
+                excel_path, sheet_name,
+                stability=self.STABILITY_CONSTANT,
+                rarity=self.RARITY_EXPONENT
+            )
+        except pokedata.PokedexError as e:
+            print(f"FATAL ERROR: {e}")
+            return {}
+
+        self.pokedex_columns = columns
+        processed_pokedex = pokedata.pokedex_records(columns)
         
-        print(f"✓ Loaded {len(processed_pokedex)} Pokémon")
+        print(f"✓ Loaded {len(processed_pokedex)} Pokémon{' (cached)' if from_cache else ''}")
         return processed_pokedex
 
     def _prepare_encounter_lists(self):
@@ -366,24 +660,47 @@ class ShinySimulation:
         weights = [self.pokedex[name]['Spawn Weight'] for name in pokemon_names]
         return pokemon_names, weights
 
-    def _attempt_catch(self, pokemon_name):
+    def _prepare_batch_arrays(self):
+        """Prepares species-indexed spawn and catch probability arrays for the batch engine."""
+        if not self.pokedex:
+            return np.zeros(0), np.zeros(0)
+        spawn_probs = self.pokedex_columns['spawn_probability']
+        if self.guaranteed_catch:
+            catch_probs = np.ones(len(spawn_probs))
+        else:
+            catch_probs = self.pokedex_columns['catch_probability']
+        return spawn_probs, catch_probs
+
+    def _prepare_species_sampler(self):
+        """
+        Builds the alias-table species sampler, reusing the cached one unless
+        the pokedex or the spawn-weight parameters have changed.
+        """
+        if not self.pokedex:
+            return None
+        key = (self.STABILITY_CONSTANT, self.RARITY_EXPONENT, tuple(self.pokemon_for_encountering))
+        if key != self._species_sampler_key:
+            self.species_sampler = AliasSampler(self.spawn_weights)
+            self._species_sampler_key = key
+        return self.species_sampler
+
+    def _attempt_catch(self, species):
         """Simulates a catch attempt based on catch rate."""
         if self.guaranteed_catch:
             return True
         
-        catch_rate = self.pokedex[pokemon_name]['Catch Rate']
-        return rand.random() <= (catch_rate / 255.0)
+        return self._random() <= self._catch_probability_list[species]
 
-    def _handle_shiny_encounter(self, encountered_pokemon):
+    def _handle_shiny_encounter(self, species):
         """Handles all logic for a shiny encounter."""
         self.total_shinies_encountered += 1
-        catch_successful = self._attempt_catch(encountered_pokemon)
-        is_new_shiny = encountered_pokemon not in self.shiny_dex
+        catch_successful = self._attempt_catch(species)
+        is_new_shiny = not self.shiny_dex[species]
 
-        # Buffer the shiny log entry
+        # Buffer the shiny log entry (species id; resolved to a name on flush)
         self.shiny_log_buffer.append([
             self.total_encounter, 
-            encountered_pokemon, 
+            species, 
             catch_successful, 
             is_new_shiny
         ])
@@ -392,41 +709,76 @@ class ShinySimulation:
         if len(self.shiny_log_buffer) >= self.BUFFER_SIZE:
             self._flush_shiny_buffer()
 
+        self._record_shiny_stats(species, self.total_encounter, catch_successful)
+
         if catch_successful:
             self.total_shinies_caught += 1
-            self.shiny_box_counts[encountered_pokemon] = self.shiny_box_counts.get(encountered_pokemon, 0) + 1
+            self.shiny_box_counts[species] += 1
             
             if is_new_shiny:
-                self.shiny_dex.add(encountered_pokemon)
-                # Update ETA when catching a new unique
-                self._update_eta()
-                
-                catch_timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-                remaining = self.total_pokemon - len(self.shiny_dex)
-                print(f"\r\x1b[K{catch_timestamp} - Gotcha! Shiny ✨ {encountered_pokemon} ✨ has been caught! Only {remaining} left to go!")
+                self._register_new_shiny(species)
         else:
             self.total_shinies_missed += 1
 
-    def _handle_normal_encounter(self, encountered_pokemon):
+    def _record_shiny_stats(self, species, encounter, caught):
+        """Updates the per-species shiny stats for one shiny encounter."""
+        stats = self.shiny_stats
+        stats['shiny_encountered'][species] += 1
+        if not stats['first_shiny_encounter'][species]:
+            stats['first_shiny_encounter'][species] = encounter
+        stats['last_shiny_encounter'][species] = encounter
+        if caught:
+            if not stats['first_shiny_catch'][species]:
+                stats['first_shiny_catch'][species] = encounter
+            stats['last_shiny_catch'][species] = encounter
+
+    def _register_new_shiny(self, species):
+        """Adds a species to the shiny dex, updates the ETA and announces the catch."""
+        self.shiny_dex[species] = True
+        self.unique_shinies += 1
+        # The monitor thread refreshes the ETA when it runs; otherwise update it here
+        if self._monitor is None:
+            self._update_eta(species)
+        
+        catch_timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        remaining = self.total_pokemon - self.unique_shinies
+        print(f"\r\x1b[K{catch_timestamp} - Gotcha! Shiny ✨ {self.pokemon_for_encountering[species]} ✨ has been caught! Only {remaining} left to go!")
+
+    def _handle_normal_encounter(self, species):
         """Handles all logic for a normal encounter."""
         self.total_normals_caught += 1
-        self.normal_dex.add(encountered_pokemon)
-        self.normal_box_counts[encountered_pokemon] = self.normal_box_counts.get(encountered_pokemon, 0) + 1
+        self._normal_counts_view[species] += 1
+
+    def _unique_normals(self):
+        """Number of species seen in a normal encounter."""
+        return int(np.count_nonzero(self.normal_box_counts))
 
     def _log_timeline_milestone(self):
         """Logs a timeline milestone for time-series analysis."""
-        elapsed = time.time() - self.simulation_start_time
-        current_eps = self.total_encounter / elapsed if elapsed > 0 else 0
-        current_sps = self.total_shinies_caught / elapsed if elapsed > 0 else 0
-        
-        self.timeline_buffer.append([
+        self._log_timeline_row(
             self.total_encounter,
-            datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             self.total_shinies_encountered,
             self.total_shinies_caught,
             self.total_shinies_missed,
-            len(self.shiny_dex),
-            len(self.normal_dex),
+            self.unique_shinies,
+            self._unique_normals()
+        )
+
+    def _log_timeline_row(self, encounter, shinies_encountered, shinies_caught, shinies_missed,
+                          unique_shinies, unique_normals):
+        """Buffers one timeline row for the given encounter milestone."""
+        elapsed = time.time() - self.simulation_start_time
+        current_eps = encounter / elapsed if elapsed > 0 else 0
+        current_sps = shinies_caught / elapsed if elapsed > 0 else 0
+        
+        self.timeline_buffer.append([
+            encounter,
+            datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            shinies_encountered,
+            shinies_caught,
+            shinies_missed,
+            unique_shinies,
+            unique_normals,
             round(current_eps, 2),
             round(current_sps, 4),
             round(elapsed, 2)
@@ -436,37 +788,488 @@ class ShinySimulation:
         if len(self.timeline_buffer) >= self.BUFFER_SIZE:
             self._flush_timeline_buffer()
         
+    def _write(self, fn, *args):
+        """Runs a write on the background writer thread if one is running, otherwise right away."""
+        if self._writer is not None:
+            self._writer.submit(fn, *args)
+        else:
+            fn(*args)
+
     def _flush_shiny_buffer(self):
-        """Writes all buffered shiny encounters to CSV."""
-        if self._active_shiny_writer and self.shiny_log_buffer:
-            try:
-                self._active_shiny_writer.writerows(self.shiny_log_buffer)
-                self.shiny_log_buffer.clear()
-            except (ValueError, AttributeError):
-                pass
+        """Hands the buffered shiny encounters to the writer as one batch."""
+        if self._shiny_log_writer and self.shiny_log_buffer:
+            rows, self.shiny_log_buffer = self.shiny_log_buffer, []
+            self._write(self._write_shiny_rows, rows)
+
+    def _write_shiny_rows(self, rows):
+        """Appends shiny rows to the binary log."""
+        self._shiny_log_writer.append(rows)
 
     def _flush_timeline_buffer(self):
-        """Writes all buffered timeline entries to CSV."""
+        """Hands the buffered timeline entries to the writer as one batch."""
         if self._active_timeline_writer and self.timeline_buffer:
+            rows, self.timeline_buffer = self.timeline_buffer, []
+            self._write(self._write_timeline_rows, rows)
+
+    def _write_timeline_rows(self, rows):
+        """Appends timeline rows to the CSV."""
+        self._active_timeline_writer.writerows(rows)
+
+    def _start_writer(self):
+        """Starts the background writer thread for log batches and checkpoints."""
+        self._writer = BackgroundWriter(self.WRITE_QUEUE_SIZE)
+
+    def _stop_writer(self):
+        """
+        Waits for every queued write, then stops the writer thread; safe to call more than once.
+        Raises WriterError if a write failed. The writer is only dropped once its thread has exited.
+        """
+        writer = self._writer
+        if writer is None:
+            return
+        try:
+            writer.close()
+        except WriterError:
+            self._state_consistent = False  # The logs on disk end before the state in memory
+            raise
+        finally:
+            if not writer.is_alive():
+                self._writer = None
+        if writer.stalls:
+            print(f"\n⚠ The loop waited {writer.stall_seconds:.1f}s for the disk "
+                  f"({writer.stalls:,} times the write queue was full)")
+
+    def _open_logs(self):
+        """
+        Opens the shiny and timeline logs for the current run position and starts the writer thread.
+        Rows past the checkpoint are cut, since the run replays those encounters. Logs that end
+        before the checkpoint are refused with a ValueError, since the missing rows cannot be
+        recreated.
+        """
+        timeline_log_path = os.path.join(self.REPORTS_DIR, 'encounter_timeline.csv')
+        last_milestone = None
+        if os.path.exists(timeline_log_path):
+            last_milestone = truncate_timeline(timeline_log_path, self.total_encounter)
+        last_shiny = 0
+        if os.path.exists(self.SHINY_LOG_FILE):
             try:
-                self._active_timeline_writer.writerows(self.timeline_buffer)
-                self.timeline_buffer.clear()
-            except (ValueError, AttributeError):
-                pass
+                last_shiny = shinylog.last_encounter(self.SHINY_LOG_FILE, self.total_encounter)
+            except shinylog.ShinyLogError as e:
+                raise ValueError(f"Cannot resume '{self.run_name}': {e}")
+        self._check_log_lengths(last_milestone or 0, last_shiny)
+
+        # Open shiny log - append if resuming, write if new
+        self._shiny_log_writer = shinylog.ShinyLogWriter(self.SHINY_LOG_FILE, self.pokemon_for_encountering,
+                                                         max_encounter=self.total_encounter)
+
+        # Open timeline log - append if resuming, write if new (or left without its header)
+        write_header = last_milestone is None
+        timeline_mode = 'w' if write_header else 'a'
+        self._timeline_file_handle = open(timeline_log_path, timeline_mode, newline='', encoding='utf-8')
+        self._active_timeline_writer = csv.writer(self._timeline_file_handle)
+
+        if write_header:
+            self._active_timeline_writer.writerow([
+                'Encounter_Milestone',
+                'Timestamp',
+                'Cumulative_Shinies_Encountered',
+                'Cumulative_Shinies_Caught',
+                'Cumulative_Shinies_Missed',
+                'Unique_Shinies_Caught',
+                'Unique_Normals_Encountered',
+                'Current_EPS',
+                'Current_SPS',
+                'Elapsed_Seconds'
+            ])
+
+        self._start_writer()
+
+    def _check_log_lengths(self, last_milestone, last_shiny):
+        """Raises ValueError if the timeline or shiny log ends before the checkpoint it is resumed from."""
+        expected_milestone = self.total_encounter - self.total_encounter % self.TIMELINE_LOG_INTERVAL
+        expected_shiny = int(self.shiny_stats['last_shiny_encounter'].max()) if self.total_pokemon else 0
+        for log, last, expected in (('encounter_timeline.csv', last_milestone, expected_milestone),
+                                    ('shiny_log.bin', last_shiny, expected_shiny)):
+            if last < expected:
+                raise ValueError(f"Cannot resume '{self.run_name}': {log} ends at encounter {last:,}, but the "
+                                 f"checkpoint has logged up to {expected:,}. Restore the log or start the run over.")
+
+    def _close_logs(self):
+        """Flushes the log buffers, drains the writer and closes the log files; safe to call more than once."""
+        try:
+            self._flush_shiny_buffer()
+            self._flush_timeline_buffer()
+        finally:
+            try:
+                self._stop_writer()
+            finally:
+                if self._writer is None:  # Nothing is writing to the files any more
+                    self._close_log_files()
+
+    def _sync_logs(self):
+        """Flushes the open shiny and timeline logs to disk (on the writer thread while it runs)."""
+        if self._shiny_log_writer:
+            self._shiny_log_writer.flush()
+        if self._timeline_file_handle:
+            self._timeline_file_handle.flush()
+            os.fsync(self._timeline_file_handle.fileno())
+
+    def _close_log_files(self):
+        for handle in (self._shiny_log_writer, self._timeline_file_handle):
+            if handle:
+                handle.close()
+        self._shiny_log_writer = None
+        self._active_timeline_writer = None
+        self._timeline_file_handle = None
 
     def run_encounter(self):
         """Executes a single encounter."""
         self.total_encounter += 1
-        encountered_pokemon = rand.choices(self.pokemon_for_encountering, self.spawn_weights, k=1)[0]
+        species = self.species_sampler.draw(self._random)
         
         # Log timeline milestone
         if self.total_encounter % self.TIMELINE_LOG_INTERVAL == 0:
             self._log_timeline_milestone()
         
-        if rand.random() < self.SHINY_RATE:
-            self._handle_shiny_encounter(encountered_pokemon)
+        if self._random() < self.SHINY_RATE:
+            self._handle_shiny_encounter(species)
         else:
-            self._handle_normal_encounter(encountered_pokemon)
+            self._handle_normal_encounter(species)
+
+    def _block_completion_offset(self, block):
+        """Returns the block offset of the catch that completes the shiny dex, or None."""
+        needed = self.total_pokemon - self.unique_shinies
+        new_species = set()
+        for offset, species, caught in zip(block['shiny_offsets'].tolist(),
+                                           block['shiny_species'].tolist(),
+                                           block['shiny_caught'].tolist()):
+            if caught and species not in new_species and not self.shiny_dex[species]:
+                new_species.add(species)
+                if len(new_species) >= needed:
+                    return offset
+        return None
+
+    def apply_encounter_block(self, block, block_start):
+        """
+        Commits a block summary from simulate_encounter_block starting after encounter block_start.
+        Shiny events are replayed in order so shiny_dex semantics match the scalar loop, and
+        timeline milestones inside the block are reconstructed exactly.
+        The block must already be truncated at the encounter that completes the dex.
+        """
+        block_length = block['length']
+        shiny_offsets = block['shiny_offsets']
+        shiny_caught = block['shiny_caught']
+        
+        # Replay shiny events in encounter order; only these can change shiny_dex
+        new_unique_offsets = []
+        shiny_rows = []
+        for offset, species, caught in zip(shiny_offsets.tolist(),
+                                           block['shiny_species'].tolist(),
+                                           shiny_caught.tolist()):
+            is_new_shiny = not self.shiny_dex[species]
+            shiny_rows.append([block_start + offset + 1, species, caught, is_new_shiny])
+            
+            if caught:
+                self.shiny_box_counts[species] += 1
+                if is_new_shiny:
+                    new_unique_offsets.append(offset)
+                    self._register_new_shiny(species)
+        shinylog.accumulate_species_stats(self.shiny_stats, block_start + shiny_offsets + 1,
+                                          block['shiny_species'], shiny_caught)
+        
+        # First normal sighting of species not yet in the normal dex (for timeline milestones)
+        first_offsets = block['normal_first_offsets']
+        unseen = self.normal_box_counts == 0
+        unique_normal_base = self.total_pokemon - int(unseen.sum())
+        new_normal_offsets = np.sort(first_offsets[unseen & (first_offsets >= 0)])
+        
+        # Timeline milestones inside the block
+        first_milestone = (block_start // self.TIMELINE_LOG_INTERVAL + 1) * self.TIMELINE_LOG_INTERVAL
+        if first_milestone <= block_start + block_length:
+            milestone_offsets = np.arange(first_milestone, block_start + block_length + 1,
+                                          self.TIMELINE_LOG_INTERVAL) - block_start - 1
+            # Milestones are logged before the milestone encounter itself is handled
+            shinies_before = np.searchsorted(shiny_offsets, milestone_offsets, side='left')
+            caught_cumulative = np.concatenate(([0], np.cumsum(shiny_caught)))
+            caught_before = caught_cumulative[shinies_before]
+            uniques_before = np.searchsorted(np.asarray(new_unique_offsets, dtype=np.int64), milestone_offsets, side='left')
+            normals_before = np.searchsorted(new_normal_offsets, milestone_offsets, side='left')
+            unique_shiny_base = self.unique_shinies - len(new_unique_offsets)
+            
+            for j, offset in enumerate(milestone_offsets.tolist()):
+                shinies = int(shinies_before[j])
+                caught = int(caught_before[j])
+                self._log_timeline_row(
+                    block_start + offset + 1,
+                    self.total_shinies_encountered + shinies,
+                    self.total_shinies_caught + caught,
+                    self.total_shinies_missed + shinies - caught,
+                    unique_shiny_base + int(uniques_before[j]),
+                    unique_normal_base + int(normals_before[j])
+                )
+            if len(self.timeline_buffer) >= self.BUFFER_SIZE:
+                self._flush_timeline_buffer()
+        
+        # Commit block totals
+        self._add_normal_counts(block['normal_counts'])
+        
+        shiny_count = len(shiny_rows)
+        caught_count = int(shiny_caught.sum())
+        self.total_encounter = block_start + block_length
+        self.total_normals_caught += block_length - shiny_count
+        self.total_shinies_encountered += shiny_count
+        self.total_shinies_caught += caught_count
+        self.total_shinies_missed += shiny_count - caught_count
+        
+        self.shiny_log_buffer.extend(shiny_rows)
+        if len(self.shiny_log_buffer) >= self.BUFFER_SIZE:
+            self._flush_shiny_buffer()
+
+    def run_encounter_block(self):
+        """
+        Executes a block of up to BATCH_SIZE encounters as NumPy arrays.
+        The block is truncated at the encounter that completes the dex.
+        Returns the number of encounters consumed.
+        """
+        block_start = self.total_encounter
+        rng_state = self.np_rng.bit_generator.state
+        track_first = self._unique_normals() < self.total_pokemon
+        
+        block = simulate_encounter_block(self.species_sampler, self.catch_probabilities, self.SHINY_RATE,
+                                         self.np_rng, self.BATCH_SIZE, track_first=track_first)
+        
+        completion_offset = self._block_completion_offset(block)
+        if completion_offset is not None and completion_offset + 1 < block['length']:
+            # Redraw the identical prefix up to the completing encounter
+            self.np_rng.bit_generator.state = rng_state
+            block = simulate_encounter_block(self.species_sampler, self.catch_probabilities, self.SHINY_RATE,
+                                             self.np_rng, self.BATCH_SIZE, limit=completion_offset + 1,
+                                             track_first=track_first)
+        
+        self.apply_encounter_block(block, block_start)
+        return block['length']
+
+    def _add_normal_counts(self, counts):
+        """Adds species-indexed normal encounter counts to the boxes (and so the normal dex)."""
+        self.normal_box_counts += counts
+
+    def _resolve_pending_normals(self):
+        """Assigns species to skipped-over normal encounters with a single multinomial draw."""
+        if self.pending_normals <= 0:
+            return
+        counts = self.np_rng.multinomial(self.pending_normals, self.spawn_probabilities)
+        self._add_normal_counts(counts)
+        self.pending_normals = 0
+
+    def _report_normal_counts(self):
+        """
+        Normal box counts for reports. Normals a paused event-engine run has not assigned
+        yet are apportioned on a side stream, leaving the run's own generators untouched.
+        """
+        if self.pending_normals <= 0:
+            return self.normal_box_counts
+        rng = self.substream(self.REPORT_STREAM, self.total_encounter)
+        return self.normal_box_counts + rng.multinomial(self.pending_normals, self.spawn_probabilities)
+    
+    def _add_normal_span(self, count):
+        """Records a run of normal encounters whose species are drawn later in bulk."""
+        self.total_normals_caught += count
+        self.pending_normals += count
+
+    def _run_event_loop(self):
+        """
+        Runs the simulation by jumping from shiny to shiny.
+        The gap to the next shiny is geometric; the normal encounters in between are
+        only counted and get their species from a multinomial draw when needed.
+        Timeline milestones stop the jump at their exact encounter numbers and are the
+        loop's safe points; skipped normals also get their species every NORMAL_RESOLVE_INTERVAL.
+        """
+        timeline_interval = self.TIMELINE_LOG_INTERVAL
+        resolve_interval = self.NORMAL_RESOLVE_INTERVAL
+        # A resumed run continues with the shiny it had already drawn
+        if self.next_shiny_encounter <= self.total_encounter:
+            self.next_shiny_encounter = self.total_encounter + int(self.np_rng.geometric(self.SHINY_RATE))
+        next_shiny = self.next_shiny_encounter
+        next_milestone = (self.total_encounter // timeline_interval + 1) * timeline_interval
+        next_resolve = (self.total_encounter // resolve_interval + 1) * resolve_interval
+        
+        while self.unique_shinies < self.total_pokemon:
+            target = min(next_shiny, next_milestone, next_resolve)
+            
+            # Every encounter before the target is a normal one
+            self._add_normal_span(target - 1 - self.total_encounter)
+            self.total_encounter = target
+            
+            at_milestone = target == next_milestone
+            if at_milestone:
+                # Unique normals only need exact species while the normal dex is filling up
+                if self._unique_normals() < self.total_pokemon:
+                    self._resolve_pending_normals()
+                self._log_timeline_milestone()
+                next_milestone += timeline_interval
+            
+            if target == next_shiny:
+                self._handle_shiny_encounter(self.species_sampler.draw(self.np_rng.random))
+                next_shiny = self.next_shiny_encounter = target + int(self.np_rng.geometric(self.SHINY_RATE))
+            else:
+                self._add_normal_span(1)
+            
+            if target == next_resolve:
+                self._resolve_pending_normals()
+                next_resolve += resolve_interval
+            
+            if at_milestone and self._at_safe_point():
+                return  # Pending normals stay pending, exactly as in an uninterrupted run
+        
+        self._resolve_pending_normals()
+
+    def _run_batch_loop(self):
+        """Runs the simulation in NumPy blocks until the shiny dex is complete; block boundaries are its safe points."""
+        while self.unique_shinies < self.total_pokemon:
+            self.run_encounter_block()
+            if self._at_safe_point():
+                break
+
+    def _run_sharded_loop(self):
+        """
+        Splits the encounter stream into contiguous SHARD_BLOCK_SIZE blocks simulated by
+        worker processes, then merges them strictly in encounter order. The block holding
+        the completing catch is redrawn up to that encounter; later blocks are discarded.
+        """
+        block_size = self.SHARD_BLOCK_SIZE
+        max_in_flight = self.SHARD_WORKERS * 2
+        next_block_start = self.total_encounter
+        pending = {}
+        
+        print(f"Sharding {block_size:,}-encounter blocks across {self.SHARD_WORKERS} worker(s)\n")
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        
+        # Spawned, not forked: the monitor and writer threads are running and hold locks, and
+        # Ctrl+C belongs to this process's deferred handler, not the workers
+        executor = ProcessPoolExecutor(max_workers=self.SHARD_WORKERS, mp_context=multiprocessing.get_context('spawn'),
+                                       initializer=_ignore_interrupts)
+        try:
+            while self.unique_shinies < self.total_pokemon:
+                while len(pending) < max_in_flight:
+                    pending[next_block_start] = executor.submit(
+                        simulate_shard, self.species_sampler, self.catch_probabilities, self.SHINY_RATE,
+                        self.seed_entropy, next_block_start, block_size, spawn_key=self.seed_spawn_key)
+                    next_block_start += block_size
+                
+                block_start = self.total_encounter
+                block = pending.pop(block_start).result()
+                
+                completion_offset = self._block_completion_offset(block)
+                if completion_offset is not None and completion_offset + 1 < block['length']:
+                    block = simulate_shard(self.species_sampler, self.catch_probabilities, self.SHINY_RATE,
+                                           self.seed_entropy, block_start, block_size, limit=completion_offset + 1,
+                                           spawn_key=self.seed_spawn_key)
+                
+                self.apply_encounter_block(block, block_start)
+                if self._at_safe_point():
+                    break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run_encounter_span(self, count):
+        """
+        Runs up to `count` scalar encounters that contain no timeline milestone, stopping
+        early if the dex completes. Same draws as run_encounter, with the loop state in locals.
+        """
+        draw = self.species_sampler.draw
+        random = self._random
+        shiny_rate = self.SHINY_RATE
+        normal_counts = self._normal_counts_view
+        total_pokemon = self.total_pokemon
+        start = end = self.total_encounter
+        end += count
+        shinies = 0
+        for encounter in range(start + 1, end + 1):
+            species = draw(random)
+            if random() < shiny_rate:
+                self.total_encounter = encounter
+                self._handle_shiny_encounter(species)
+                shinies += 1
+                if self.unique_shinies >= total_pokemon:
+                    end = encounter
+                    break
+            else:
+                normal_counts[species] += 1
+        self.total_normals_caught += end - start - shinies
+        self.total_encounter = end
+
+    def _run_scalar_loop(self):
+        """
+        Runs the simulation one encounter at a time until the shiny dex is complete.
+        Encounters run in spans ending on timeline milestones, which are the loop's safe points.
+        """
+        interval = self.TIMELINE_LOG_INTERVAL
+        while self.unique_shinies < self.total_pokemon:
+            next_milestone = (self.total_encounter // interval + 1) * interval
+            self._run_encounter_span(next_milestone - 1 - self.total_encounter)
+            if self.unique_shinies >= self.total_pokemon:
+                break
+            self.run_encounter()  # Logs the milestone row
+            if self._at_safe_point():
+                break
+
+    def _at_safe_point(self):
+        """
+        Called by the loops between encounters, where the state is consistent: writes the
+        checkpoint the monitor asked for and returns True if Ctrl+C asked the run to stop.
+        Checkpoints leave skipped normals pending, so their timing never changes the random stream.
+        A failed background write stops the run here at the latest.
+        """
+        if self._writer is not None:
+            self._writer.check()
+        if self._checkpoint_requested:
+            self._checkpoint_requested = False
+            self.save_checkpoint(resolve_pending=False)
+        return self._stop_requested
+
+    # --- Monitor thread ---
+    def _start_monitor(self):
+        """
+        Starts the monitor thread: it renders the progress line and refreshes the ETA every
+        PROGRESS_SECONDS and requests a checkpoint every CHECKPOINT_SECONDS. It only reads
+        the counters; the loop writes the checkpoint itself at its next safe point.
+        """
+        self._update_eta()
+        self._eta_synced = self.shiny_dex.copy()
+        self._monitor_stop = threading.Event()
+        self._monitor = threading.Thread(target=self._monitor_loop, name='simulation-monitor', daemon=True)
+        self._monitor.start()
+
+    def _monitor_loop(self):
+        next_checkpoint = time.monotonic() + self.CHECKPOINT_SECONDS
+        while not self._monitor_stop.wait(self.PROGRESS_SECONDS):
+            try:
+                self._sync_eta()
+                self._display_progress()
+            except Exception as e:
+                print(f"\n⚠ Warning: Progress update failed: {e}")
+            if time.monotonic() >= next_checkpoint:
+                self._checkpoint_requested = True
+                next_checkpoint = time.monotonic() + self.CHECKPOINT_SECONDS
+
+    def _stop_monitor(self):
+        """Stops the monitor thread, then brings the ETA and progress line up to date."""
+        if self._monitor is None:
+            return
+        self._monitor_stop.set()
+        self._monitor.join()
+        self._monitor = None
+        self._checkpoint_requested = False
+        self._sync_eta()
+        self._display_progress()
+
+    def _sync_eta(self):
+        """Removes the species caught since the last refresh from the ETA estimator."""
+        caught = np.flatnonzero(self.shiny_dex & ~self._eta_synced)
+        for species in caught.tolist():
+            self._update_eta(species)
+        self._eta_synced[caught] = True
 
     def _display_progress(self):
         """Displays real-time progress in terminal with ETA."""
@@ -478,10 +1281,15 @@ class ShinySimulation:
 
         enc_per_sec = self.total_encounter / total_elapsed_seconds
         shinies_per_sec = self.total_shinies_caught / total_elapsed_seconds
-        percentage_shiny = (len(self.shiny_dex) / self.total_pokemon) * 100
+        percentage_shiny = (self.unique_shinies / self.total_pokemon) * 100
         
         duration_str = f"{(total_elapsed_seconds / 3600):.2f} Hours" if total_elapsed_seconds > 3600 else f"{(total_elapsed_seconds / 60):.2f} Mins"
         
+        # ETA hours use this session's encounter rate
+        session_seconds = time.time() - self.simulation_start_time
+        if session_seconds > 0 and self.total_encounter > 0:
+            self.current_eta_hours = self.current_eta_encounters / (self.total_encounter / session_seconds) / 3600
+        
         # Build ETA string
         eta_str = ""
         if self.current_eta_encounters > 0:
@@ -496,14 +1304,81 @@ class ShinySimulation:
         progress_line = (
             f"\r_Enc: {self.total_encounter:,} ({enc_per_sec:.1f} EPS) | "
             f"Shinies: {self.total_shinies_caught:,} ({shinies_per_sec:.2f} SPS) | "
-            f"Unique: {len(self.shiny_dex)}/{self.total_pokemon} ({percentage_shiny:.2f}%){eta_str} | "
+            f"Unique: {self.unique_shinies}/{self.total_pokemon} ({percentage_shiny:.2f}%){eta_str} | "
             f"Time: {duration_str}"
         )
-        sys.stdout.write(progress_line)
-        sys.stdout.flush()
+        if self.SHOW_PROGRESS:
+            sys.stdout.write(progress_line)
+            sys.stdout.flush()
+        
+        if self.metrics is not None:
+            self.metrics.sample(self.total_encounter, self.total_shinies_caught, self.unique_shinies, self.total_pokemon)
 
-    def save_checkpoint(self):
-        """Saves the current simulation state to JSON."""
+    def _start_instrumentation(self):
+        """Wraps the timed sections and starts the metrics exporter and profiler, if enabled."""
+        if self.METRICS_FORMAT:
+            self.metrics = metrics.Metrics(self.METRICS_FILE, self.METRICS_FORMAT, self.METRICS_WINDOW,
+                                           self.METRICS_EXPORT_INTERVAL, labels={'run': self.run_name, 'engine': self.engine})
+            for method_name, section in self.INSTRUMENTED_SECTIONS.items():
+                self.metrics.instrument(self, method_name, section)
+            self.metrics.start()
+            print(f"Exporting metrics to {self.METRICS_FILE} every {self.METRICS_EXPORT_INTERVAL}s")
+        if self.PROFILE:
+            self.profiler = metrics.SamplingProfiler().start()
+            print(f"Sampling profiler on; stacks go to {self.PROFILE_FILE}")
+    
+    def _stop_instrumentation(self):
+        """Final metrics export, profile output and a short summary; restores the untimed methods."""
+        if self.metrics is not None:
+            self.metrics.close()
+            for method_name in self.INSTRUMENTED_SECTIONS:
+                self.__dict__.pop(method_name, None)
+            sections = self.metrics.snapshot()['sections']
+            total = sum(section['seconds'] for section in sections.values()) or 1
+            print("\nTime by section: " + " | ".join(
+                f"{name} {section['seconds'] / total:.1%}"
+                for name, section in sorted(sections.items(), key=lambda item: -item[1]['seconds'])))
+            print(f"✓ Metrics saved to {self.METRICS_FILE}")
+            self.metrics = None
+        if self.profiler is not None:
+            self.profiler.stop()
+            self.profiler.write(self.PROFILE_FILE)
+            print("Top profiled functions: " + " | ".join(
+                f"{frame} {share:.1%}" for frame, share in self.profiler.top_functions(5)))
+            print(f"✓ Profile saved to {self.PROFILE_FILE} ({self.profiler.samples:,} samples)")
+            self.profiler = None
+    
+    def _request_stop(self, signum, frame):
+        """SIGINT handler: stop at the next safe point; a second Ctrl+C interrupts immediately."""
+        if self._stop_requested:
+            raise KeyboardInterrupt
+        self._stop_requested = True
+        print("\n\n⚠ Pausing at the next safe point... (Ctrl+C again to stop immediately)")
+    
+    @contextmanager
+    def _deferred_interrupts(self):
+        """
+        Defers Ctrl+C to the loops' safe points, so a paused run checkpoints a
+        consistent state and resumes exactly where an uninterrupted run would be.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            yield
+            return
+        previous_handler = signal.signal(signal.SIGINT, self._request_stop)
+        try:
+            yield
+        finally:
+            signal.signal(signal.SIGINT, previous_handler)
+    
+    def save_checkpoint(self, resolve_pending=True):
+        """
+        Saves the current simulation state and generator states to the binary checkpoint, atomically.
+        While the loop runs the state is copied here and written by the writer thread, after the
+        log batches queued before it. With resolve_pending=False the event engine's unassigned normals are saved as a count
+        instead of being drawn, which keeps the random stream identical to an uninterrupted run.
+        """
+        if resolve_pending:
+            self._resolve_pending_normals()
         self._flush_shiny_buffer()
         self._flush_timeline_buffer()
 
@@ -524,107 +1399,190 @@ class ShinySimulation:
             'total_shinies_caught': self.total_shinies_caught,
             'total_shinies_missed': self.total_shinies_missed,
             'total_normals_caught': self.total_normals_caught,
-            'shiny_dex': list(self.shiny_dex),
-            'normal_dex': list(self.normal_dex),
-            'shiny_box_counts': self.shiny_box_counts,
-            'normal_box_counts': self.normal_box_counts,
             'last_checkpoint_time': self.last_checkpoint_time,
             'total_elapsed_seconds': total_elapsed_seconds,
-            'initial_prediction': self.initial_prediction
+            'initial_prediction': self.initial_prediction,
+            'stability_constant': self.STABILITY_CONSTANT,
+            'rarity_exponent': self.RARITY_EXPONENT,
+            'pending_normals': self.pending_normals,
+            'rng': self._rng_state()
         }
         
-        with open(self.CHECKPOINT_FILE, 'w') as f:
-            json.dump(state, f, indent=4)
+        arrays = {
+            'shiny_box_counts': self.shiny_box_counts.copy(),
+            'normal_box_counts': self.normal_box_counts.copy(),
+            'shiny_dex': checkpoint.pack_bitset(self.shiny_dex),
+            'normal_dex': checkpoint.pack_bitset(self.normal_box_counts > 0)
+        }
+        arrays.update((field, values.copy()) for field, values in self.shiny_stats.items())
         
+        self._write(self._write_checkpoint, state, arrays)
+
+    def _write_checkpoint(self, state, arrays):
+        """
+        Writes a checkpoint snapshot and updates the run registry. The logs are flushed and
+        fsynced first, so a crash after the checkpoint lands never loses rows it covers.
+        """
+        self._sync_logs()
+        checkpoint.write_checkpoint(self.CHECKPOINT_FILE, state, self.pokemon_for_encountering, arrays)
         self._update_run_registry()
 
+    def export_shiny_csv(self):
+        """Writes shiny_analysis_log.csv (the Power BI shiny table) from the binary shiny log."""
+        if os.path.exists(self.SHINY_LOG_FILE):
+            shinylog.to_csv(self.SHINY_LOG_FILE, self.SHINY_LOG_CSV)
+            print("✓ Shiny log: shiny_analysis_log.csv")
+
+    def export_checkpoint_json(self):
+        """Writes checkpoint.json from the binary checkpoint for collectorcalc-style consumers."""
+        if os.path.exists(self.CHECKPOINT_FILE):
+            checkpoint.export_checkpoint_json(self.CHECKPOINT_FILE, self.CHECKPOINT_JSON)
+
     def load_checkpoint(self):
-        """Loads simulation state from checkpoint if it exists."""
-        try:
-            with open(self.CHECKPOINT_FILE, 'r') as f:
+        """Loads simulation state from the binary checkpoint, or a legacy checkpoint.json, if one exists."""
+        if os.path.exists(self.CHECKPOINT_FILE):
+            state, species, arrays = checkpoint.read_checkpoint(self.CHECKPOINT_FILE)
+            has_stats = all(field in arrays for field in shinylog.SPECIES_STAT_FIELDS)
+            if list(species) == self.pokemon_for_encountering:
+                self.shiny_dex[:] = checkpoint.unpack_bitset(arrays['shiny_dex'], len(species))
+                self.shiny_box_counts[:] = arrays['shiny_box_counts']
+                self.normal_box_counts[:] = arrays['normal_box_counts']
+                if has_stats:
+                    for field in shinylog.SPECIES_STAT_FIELDS:
+                        self.shiny_stats[field][:] = arrays[field]
+            else:
+                # Species order changed since the checkpoint was written; remap by name
+                shiny_flags = checkpoint.unpack_bitset(arrays['shiny_dex'], len(species))
+                self._load_named_state(
+                    [name for name, flag in zip(species, shiny_flags) if flag],
+                    dict(zip(species, arrays['shiny_box_counts'].tolist())),
+                    dict(zip(species, arrays['normal_box_counts'].tolist()))
+                )
+                has_stats = False
+                self._remap_shiny_log()
+        elif os.path.exists(self.CHECKPOINT_JSON):
+            with open(self.CHECKPOINT_JSON, 'r') as f:
                 state = json.load(f)
-                
-                self.total_encounter = state.get('total_encounter', 0)
-                self.total_shinies_encountered = state.get('total_shinies_encountered', 0)
-                self.total_shinies_caught = state.get('total_shinies_caught', 0)
-                self.total_shinies_missed = state.get('total_shinies_missed', 0)
-                self.total_normals_caught = state.get('total_normals_caught', 0)
-                self.shiny_dex = set(state.get('shiny_dex', []))
-                self.normal_dex = set(state.get('normal_dex', []))
-                self.shiny_box_counts = state.get('shiny_box_counts', {})
-                self.normal_box_counts = state.get('normal_box_counts', {})
-                self.last_checkpoint_time = state.get('last_checkpoint_time', "Loaded")
-                self.past_elapsed_seconds = state.get('total_elapsed_seconds', 0)
-                self.initial_prediction = state.get('initial_prediction')
-                self.start_time = time.time()
-                
-                print(f"\n    Total Encounters: {self.total_encounter:,}")
-                print(f"    Unique Shinies: {len(self.shiny_dex)}/{self.total_pokemon}")
-                print(f"    Elapsed Time: {(self.past_elapsed_seconds / 3600):.2f} hours\n")
-                
-        except FileNotFoundError:
+            self._load_named_state(
+                state.get('shiny_dex', []),
+                state.get('shiny_box_counts', {}),
+                state.get('normal_box_counts', {})
+            )
+            has_stats = False
+        else:
             print(f"\n    Starting fresh simulation...\n")
-
-    def _calculate_encounter_summary_stats(self):
-        """Calculate comprehensive per-Pokemon statistics from logs."""
-        log_path = os.path.join(self.REPORTS_DIR, 'shiny_analysis_log.csv')
+            return
         
-        pokemon_stats = {}
+        self.total_encounter = state.get('total_encounter', 0)
+        self.total_shinies_encountered = state.get('total_shinies_encountered', 0)
+        self.total_shinies_caught = state.get('total_shinies_caught', 0)
+        self.total_shinies_missed = state.get('total_shinies_missed', 0)
+        self.total_normals_caught = state.get('total_normals_caught', 0)
+        self.last_checkpoint_time = state.get('last_checkpoint_time', "Loaded")
+        self.past_elapsed_seconds = state.get('total_elapsed_seconds', 0)
+        self.initial_prediction = state.get('initial_prediction')
+        self.pending_normals = state.get('pending_normals', 0)
+        self.start_time = time.time()
+        self._restore_rng_state(state.get('rng'))
+        saved_model = (state.get('stability_constant', self.STABILITY_CONSTANT), state.get('rarity_exponent', self.RARITY_EXPONENT))
+        if saved_model != (self.STABILITY_CONSTANT, self.RARITY_EXPONENT):
+            print(f"⚠ Warning: Checkpoint was written with stability {saved_model[0]} / rarity {saved_model[1]}; "
+                  f"continuing with {self.STABILITY_CONSTANT} / {self.RARITY_EXPONENT}.")
+        self.unique_shinies = int(self.shiny_dex.sum())
+        
+        if not has_stats:
+            self._rebuild_shiny_stats()
+        
+        print(f"\n    Total Encounters: {self.total_encounter:,}")
+        print(f"    Unique Shinies: {self.unique_shinies}/{self.total_pokemon}")
+        print(f"    Elapsed Time: {(self.past_elapsed_seconds / 3600):.2f} hours\n")
+
+    def _import_legacy_shiny_log(self):
+        """Runs from before the binary log only have the CSV; import it once so stats stay complete."""
+        if not os.path.exists(self.SHINY_LOG_FILE) and os.path.exists(self.SHINY_LOG_CSV):
+            print("Importing shiny_analysis_log.csv into the binary shiny log...")
+            shinylog.import_csv(self.SHINY_LOG_CSV, self.SHINY_LOG_FILE, self.pokemon_for_encountering)
+
+    def _remap_shiny_log(self):
+        """Converts a shiny log written with another species order to the current one, so it can be appended to."""
+        if not os.path.exists(self.SHINY_LOG_FILE):
+            return
+        try:
+            _, log_species = shinylog.open_shiny_log(self.SHINY_LOG_FILE)
+            if list(log_species) == self.pokemon_for_encountering:
+                return
+            dropped = shinylog.remap_species(self.SHINY_LOG_FILE, self.pokemon_for_encountering)
+        except shinylog.ShinyLogError as e:
+            raise ValueError(f"Cannot resume '{self.run_name}': the shiny log could not be converted ({e})")
+        print("✓ Converted the shiny log to the current species order")
+        if dropped:
+            print(f"⚠ Warning: {dropped:,} shiny log records of species no longer in the Pokédex were dropped.")
+
+    def _rebuild_shiny_stats(self):
+        """Recomputes the per-species shiny stats from the shiny log, up to the checkpointed encounter."""
+        self._import_legacy_shiny_log()
+        if not os.path.exists(self.SHINY_LOG_FILE):
+            return
         
-        if os.path.exists(log_path):
-            try:
-                df = pd.read_csv(log_path)
-                for _, row in df.iterrows():
-                    pokemon = row['Pokemon']
-                    encounter_num = row['Encounter_Number']
-                    caught = row['Catch_Successful']
-                    
-                    if pokemon not in pokemon_stats:
-                        pokemon_stats[pokemon] = {
-                            'first_encounter': encounter_num,
-                            'last_encounter': encounter_num,
-                            'first_catch': None,
-                            'last_catch': None,
-                            'total_encountered': 0,
-                            'total_caught': 0,
-                            'total_missed': 0
-                        }
-                    
-                    stats = pokemon_stats[pokemon]
-                    stats['last_encounter'] = encounter_num
-                    stats['total_encountered'] += 1
-                    
-                    if caught:
-                        stats['total_caught'] += 1
-                        stats['last_catch'] = encounter_num
-                        if stats['first_catch'] is None:
-                            stats['first_catch'] = encounter_num
-                    else:
-                        stats['total_missed'] += 1
-                        
-            except Exception as e:
-                print(f"Warning: Could not read shiny log for detailed stats: {e}")
+        try:
+            _, log_species = shinylog.open_shiny_log(self.SHINY_LOG_FILE)
+            stats = shinylog.species_stats(self.SHINY_LOG_FILE, max_encounter=self.total_encounter)
+        except shinylog.ShinyLogError as e:
+            print(f"⚠ Warning: Could not rebuild shiny stats from the shiny log: {e}")
+            return
         
-        return pokemon_stats
+        for field, values in stats.items():
+            for i, name in enumerate(log_species):
+                if name in self.species_index:
+                    self.shiny_stats[field][self.species_index[name]] = values[i]
+        print("✓ Rebuilt per-species shiny stats from the shiny log")
+
+    def _load_named_state(self, shiny_dex, shiny_box_counts, normal_box_counts):
+        """Loads name-keyed dex and box counts into the species-indexed arrays."""
+        missing = set()
+        for name in shiny_dex:
+            if name in self.species_index:
+                self.shiny_dex[self.species_index[name]] = True
+            else:
+                missing.add(name)
+        for counts, target in ((shiny_box_counts, self.shiny_box_counts), (normal_box_counts, self.normal_box_counts)):
+            for name, count in counts.items():
+                if name in self.species_index:
+                    target[self.species_index[name]] = count
+                elif count:
+                    missing.add(name)
+        if missing:
+            print(f"⚠ Warning: {len(missing)} checkpoint species are not in the current Pokédex and were ignored.")
 
     def _save_to_master_results(self, final_stats):
         """Appends or updates the master simulation results CSV."""
-        if os.path.exists(self.MASTER_RESULTS):
+        self.merge_master_results([final_stats])
+
+    @classmethod
+    def merge_master_results(cls, rows):
+        """Merges result rows into the master results CSV in one read/write, replacing rows with the same Run_Name."""
+        if not rows:
+            return
+        import pandas as pd  # Deferred: only reports need pandas
+        
+        if os.path.exists(cls.MASTER_RESULTS):
             try:
-                df = pd.read_csv(self.MASTER_RESULTS)
-                df = df[df['Run_Name'] != self.run_name]
+                df = pd.read_csv(cls.MASTER_RESULTS)
+                df = df[~df['Run_Name'].isin([row['Run_Name'] for row in rows])]
             except:
                 df = pd.DataFrame()
         else:
             df = pd.DataFrame()
         
-        new_row = pd.DataFrame([final_stats])
-        df = pd.concat([df, new_row], ignore_index=True)
+        new_rows = pd.DataFrame(rows)
+        df = pd.concat([df, new_rows], ignore_index=True)
         df = df.sort_values('Completion_Date', ascending=False)
-        df.to_csv(self.MASTER_RESULTS, index=False)
+        df.to_csv(cls.MASTER_RESULTS, index=False)
 
     def output_final_reports(self):
         """Generates and saves consolidated final reports."""
+        import pandas as pd  # Deferred: only reports need pandas
+        
         print("\n" + "="*60)
         print("GENERATING FINAL REPORTS")
         print("="*60)
@@ -663,7 +1621,7 @@ class ShinySimulation:
         print(f"Total Encounters: {self.total_encounter:,}")
         print(f"Total Shinies Encountered: {self.total_shinies_encountered:,}")
         print(f"Total Shinies Caught: {self.total_shinies_caught:,}")
-        print(f"Unique Shinies: {len(self.shiny_box_counts)}/{self.total_pokemon}")
+        print(f"Unique Shinies: {self.unique_shinies}/{self.total_pokemon}")
         print(f"Runtime: {total_hours:.2f} hours")
         
         if prediction_accuracy:
@@ -674,23 +1632,26 @@ class ShinySimulation:
 
         os.makedirs(self.REPORTS_DIR, exist_ok=True)
         
-        # Get detailed per-Pokemon stats
-        pokemon_stats = self._calculate_encounter_summary_stats()
+        # Per-Pokemon shiny stats are kept up to date during the run, so this is O(species)
+        stats = {field: values.tolist() for field, values in self.shiny_stats.items()}
+        shiny_caught_counts = self.shiny_box_counts.tolist()
+        report_normal_counts = self._report_normal_counts()
+        normal_counts = report_normal_counts.tolist()
+        total_weight = sum(self.spawn_weights)
         
         # Build comprehensive encounter summary
         summary_data = []
         
         for name, data in self.pokedex.items():
-            normal_encounters = self.normal_box_counts.get(name, 0)
-            total_weight = sum(self.spawn_weights)
+            i = self.species_index[name]
+            normal_encounters = normal_counts[i]
             expected_proportion = data['Spawn Weight'] / total_weight
             expected_normal = expected_proportion * self.total_normals_caught
             
             # Get shiny stats
-            stats = pokemon_stats.get(name, {})
-            shiny_encountered = stats.get('total_encountered', 0)
-            shiny_caught = stats.get('total_caught', 0)
-            shiny_missed = stats.get('total_missed', 0)
+            shiny_encountered = stats['shiny_encountered'][i]
+            shiny_caught = shiny_caught_counts[i]
+            shiny_missed = shiny_encountered - shiny_caught
             
             total_encounters = normal_encounters + shiny_encountered
             
@@ -709,10 +1670,10 @@ class ShinySimulation:
                 'Shiny_Encounters_Caught': shiny_caught,
                 'Shiny_Encounters_Missed': shiny_missed,
                 'Total_Encounters': total_encounters,
-                'First_Shiny_Encounter': stats.get('first_encounter'),
-                'First_Shiny_Catch': stats.get('first_catch'),
-                'Last_Shiny_Encounter': stats.get('last_encounter'),
-                'Last_Shiny_Catch': stats.get('last_catch')
+                'First_Shiny_Encounter': stats['first_shiny_encounter'][i] or None,
+                'First_Shiny_Catch': stats['first_shiny_catch'][i] or None,
+                'Last_Shiny_Encounter': stats['last_shiny_encounter'][i] or None,
+                'Last_Shiny_Catch': stats['last_shiny_catch'][i] or None
             })
         
         # Save complete encounter summary
@@ -728,7 +1689,7 @@ class ShinySimulation:
             'Shiny_Modifier': self.shiny_modifier,
             'Shiny_Rate_Decimal': self.SHINY_RATE,
             'Guaranteed_Catch': self.guaranteed_catch,
-            'Completion_Status': 'Complete' if len(self.shiny_dex) >= self.total_pokemon else 'Incomplete',
+            'Completion_Status': 'Complete' if self.unique_shinies >= self.total_pokemon else 'Incomplete',
             'Total_Encounters': self.total_encounter,
             'Total_Runtime_Hours': round(total_hours, 2),
             'Total_Runtime_Days': round(total_days, 2),
@@ -738,8 +1699,8 @@ class ShinySimulation:
             'Total_Shinies_Caught': self.total_shinies_caught,
             'Total_Shinies_Missed': self.total_shinies_missed,
             'Catch_Success_Rate_Percent': round(catch_success_rate, 2),
-            'Unique_Shinies_Caught': len(self.shiny_dex),
-            'Unique_Normals_Encountered': len(self.normal_dex),
+            'Unique_Shinies_Caught': self.unique_shinies,
+            'Unique_Normals_Encountered': int(np.count_nonzero(report_normal_counts)),
             'Actual_Shiny_Rate_Decimal': actual_shiny_rate,
             'Expected_Shinies': int(expected_shinies),
             'Shiny_Variance_Percent': round(shiny_variance, 2),
@@ -747,7 +1708,9 @@ class ShinySimulation:
             # Prediction fields
             'Predicted_Total_Encounters': prediction_accuracy.get('predicted_encounters', None),
             'Prediction_Difference': prediction_accuracy.get('difference', None),
-            'Prediction_Difference_Percent': round(prediction_accuracy.get('difference_percent', 0), 2) if prediction_accuracy else None
+            'Prediction_Difference_Percent': round(prediction_accuracy.get('difference_percent', 0), 2) if prediction_accuracy else None,
+            'Stability_Constant': self.STABILITY_CONSTANT,
+            'Rarity_Exponent': self.RARITY_EXPONENT
         }
         
         # Save to individual run results
@@ -756,13 +1719,158 @@ class ShinySimulation:
         run_results_df.to_csv(run_results_filepath, index=False)
         print(f"✓ Simulation results: simulation_results.csv")
         
+        self.run_results = run_results
+        
         # Append to master results
-        self._save_to_master_results(run_results)
-        print(f"✓ Updated master results: {self.MASTER_RESULTS}")
+        if self.save_master_results:
+            self._save_to_master_results(run_results)
+            print(f"✓ Updated master results: {self.MASTER_RESULTS}")
         
         print(f"\n✓ All reports saved to: {self.REPORTS_DIR}/")
         print("="*60)
 
+    def output_analytic_reports(self):
+        """
+        Writes expected-value versions of encounter_summary.csv and simulation_results.csv
+        without simulating, to reports/<run_name>_analytic/. Columns match the simulated
+        reports, plus _SD (and percentile) columns for the spread around each expectation.
+        All of it comes from the Poissonized completion time T (prediction.py):
+        - counts with per-encounter probability q: mean q E[T], variance E[T] q(1-q) + q^2 Var(T)
+        - first events: geometric, mean 1/q, SD sqrt(1-q)/q
+        - last events: last_event_moments, the last event of a rate-q stream before T
+        - the variance columns are deviations from the expected count, which average zero,
+          so they stay empty; their _SD columns hold the binomial spread sqrt(E[T] q(1-q)),
+          and for Shiny_Variance_Percent 100 sqrt((1-r) / (r E[T])).
+        """
+        import pandas as pd  # Deferred: only reports need pandas
+        
+        run_name = f"{self.run_name}_analytic"
+        reports_dir = os.path.join(self.base_reports_dir, run_name)
+        os.makedirs(reports_dir, exist_ok=True)
+        
+        print("\n" + "="*60)
+        print("ANALYTIC REPORTS")
+        print("="*60)
+        
+        r = self.SHINY_RATE
+        spawn = self.spawn_probabilities
+        catch = self.catch_probabilities
+        catch_p = self.completion_probabilities  # spawn * catch * shiny rate
+        shiny_p = spawn * r
+        normal_p = spawn * (1 - r)
+        
+        mean_t, var_t = completion_moments(catch_p)
+        percentiles = completion_percentiles(catch_p, (0.05, 0.5, 0.95))
+        
+        def count_sd(q):
+            """SD of a per-encounter count at completion: E[T] q(1-q) + q^2 Var(T)."""
+            return np.sqrt(mean_t * q * (1 - q) + q ** 2 * var_t)
+        
+        last_encounter, last_encounter_var = last_event_moments(catch_p, shiny_p)
+        last_catch, last_catch_var = last_event_moments(catch_p, catch_p)
+        columns = {
+            'normal': normal_p * mean_t, 'normal_sd': count_sd(normal_p),
+            'shiny': shiny_p * mean_t, 'shiny_sd': count_sd(shiny_p),
+            'caught': catch_p * mean_t, 'caught_sd': count_sd(catch_p),
+            'missed': shiny_p * (1 - catch) * mean_t, 'missed_sd': count_sd(shiny_p * (1 - catch)),
+            'total': spawn * mean_t, 'total_sd': count_sd(spawn),
+            'first_encounter': 1 / shiny_p, 'first_encounter_sd': np.sqrt(1 - shiny_p) / shiny_p,
+            'first_catch': 1 / catch_p, 'first_catch_sd': np.sqrt(1 - catch_p) / catch_p,
+            'last_encounter': last_encounter, 'last_encounter_sd': np.sqrt(last_encounter_var),
+            'last_catch': last_catch, 'last_catch_sd': np.sqrt(last_catch_var),
+            'normal_variance_sd': np.sqrt(mean_t * normal_p * (1 - normal_p))
+        }
+        columns = {key: values.tolist() for key, values in columns.items()}
+        
+        summary_data = []
+        for name, data in self.pokedex.items():
+            i = self.species_index[name]
+            summary_data.append({
+                'Pokemon': name,
+                'Pokedex_Number': data['pokedex number'],
+                'Base_Total': data['base_total'],
+                'Is_Legendary': data.get('is_legendary', False),
+                'Is_Mythical': data.get('is_mythical', False),
+                'Catch_Rate': data['Catch Rate'],
+                'Spawn_Weight': data['Spawn Weight'],
+                'Expected_Normal_Encounters': int(columns['normal'][i]),  # Truncated like the simulated summary
+                'Normal_Encounters': columns['normal'][i],
+                'Normal_Encounter_Variance': None,
+                'Shiny_Encounters_Total': columns['shiny'][i],
+                'Shiny_Encounters_Caught': columns['caught'][i],
+                'Shiny_Encounters_Missed': columns['missed'][i],
+                'Total_Encounters': columns['total'][i],
+                'First_Shiny_Encounter': columns['first_encounter'][i],
+                'First_Shiny_Catch': columns['first_catch'][i],
+                'Last_Shiny_Encounter': columns['last_encounter'][i],
+                'Last_Shiny_Catch': columns['last_catch'][i],
+                'Normal_Encounters_SD': columns['normal_sd'][i],
+                'Shiny_Encounters_Total_SD': columns['shiny_sd'][i],
+                'Shiny_Encounters_Caught_SD': columns['caught_sd'][i],
+                'Shiny_Encounters_Missed_SD': columns['missed_sd'][i],
+                'Total_Encounters_SD': columns['total_sd'][i],
+                'First_Shiny_Encounter_SD': columns['first_encounter_sd'][i],
+                'First_Shiny_Catch_SD': columns['first_catch_sd'][i],
+                'Last_Shiny_Encounter_SD': columns['last_encounter_sd'][i],
+                'Last_Shiny_Catch_SD': columns['last_catch_sd'][i],
+                'Normal_Encounter_Variance_SD': columns['normal_variance_sd'][i]
+            })
+        
+        summary_df = pd.DataFrame(summary_data).sort_values('Pokedex_Number')
+        summary_df.to_csv(os.path.join(reports_dir, 'encounter_summary.csv'), index=False)
+        print(f"✓ Expected encounter summary: {run_name}/encounter_summary.csv")
+        
+        # Run-level expectations; runtime columns stay empty since there is no simulated run
+        expected_shinies = mean_t * r
+        mean_catch = float(np.dot(spawn, catch))
+        expected_caught = expected_shinies * mean_catch
+        expected_unique_normals = float(np.sum(-np.expm1(mean_t * np.log1p(-normal_p))))
+        run_results = {
+            'Run_Name': run_name,
+            'Completion_Date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'Shiny_Modifier': self.shiny_modifier,
+            'Shiny_Rate_Decimal': r,
+            'Guaranteed_Catch': self.guaranteed_catch,
+            'Completion_Status': 'Analytic',
+            'Total_Encounters': mean_t,
+            'Total_Runtime_Hours': None,
+            'Total_Runtime_Days': None,
+            'Avg_Encounters_Per_Second': None,
+            'Avg_Shinies_Per_Second': None,
+            'Total_Shiny_Encounters': expected_shinies,
+            'Total_Shinies_Caught': expected_caught,
+            'Total_Shinies_Missed': expected_shinies - expected_caught,
+            'Catch_Success_Rate_Percent': round(mean_catch * 100, 2),
+            'Unique_Shinies_Caught': self.total_pokemon,
+            'Unique_Normals_Encountered': expected_unique_normals,
+            'Actual_Shiny_Rate_Decimal': r,
+            'Expected_Shinies': int(expected_shinies),
+            'Shiny_Variance_Percent': None,
+            'Total_Pokemon_In_Dex': self.total_pokemon,
+            'Predicted_Total_Encounters': mean_t,
+            'Prediction_Difference': 0,
+            'Prediction_Difference_Percent': 0,
+            'Stability_Constant': self.STABILITY_CONSTANT,
+            'Rarity_Exponent': self.RARITY_EXPONENT,
+            'Total_Encounters_SD': var_t ** 0.5,
+            'Total_Encounters_P05': percentiles[0.05],
+            'Total_Encounters_P50': percentiles[0.5],
+            'Total_Encounters_P95': percentiles[0.95],
+            'Total_Shiny_Encounters_SD': float(np.sqrt(mean_t * r * (1 - r) + r ** 2 * var_t)),
+            'Shiny_Variance_Percent_SD': float(100 * np.sqrt((1 - r) / (r * mean_t)))
+        }
+        pd.DataFrame([run_results]).to_csv(os.path.join(reports_dir, 'simulation_results.csv'), index=False)
+        print(f"✓ Expected simulation results: {run_name}/simulation_results.csv")
+        
+        self.run_results = run_results
+        if self.save_master_results:
+            self._save_to_master_results(run_results)
+            print(f"✓ Updated master results: {self.MASTER_RESULTS}")
+        
+        print(f"\nExpected Encounters: {mean_t:,.0f} ± {var_t ** 0.5:,.0f} (P5 {percentiles[0.05]:,.0f} – P95 {percentiles[0.95]:,.0f})")
+        print("="*60)
+        return run_results
+
     def run(self):
         """Main entry point to start and manage the simulation loop."""
         
@@ -775,88 +1883,82 @@ class ShinySimulation:
         # Display startup prediction
         self._display_startup_prediction()
 
-        shiny_log_path = os.path.join(self.REPORTS_DIR, 'shiny_analysis_log.csv')
-        timeline_log_path = os.path.join(self.REPORTS_DIR, 'encounter_timeline.csv')
-        
+        # Logs that do not reach the checkpoint stop the run here, before anything is written
+        os.makedirs(self.REPORTS_DIR, exist_ok=True)
+        self._import_legacy_shiny_log()
+        self._open_logs()
+
         try:
-            os.makedirs(self.REPORTS_DIR, exist_ok=True)
-            
-            # Open shiny log - append if resuming, write if new
-            shiny_file_exists = os.path.exists(shiny_log_path)
-            shiny_mode = 'a' if shiny_file_exists else 'w'
-            self._shiny_file_handle = open(shiny_log_path, shiny_mode, newline='', encoding='utf-8')
-            self._active_shiny_writer = csv.writer(self._shiny_file_handle)
-            
-            if not shiny_file_exists:
-                self._active_shiny_writer.writerow(['Encounter_Number', 'Pokemon', 'Catch_Successful', 'Is_New_Shiny'])
-            
-            # Open timeline log - append if resuming, write if new
-            timeline_file_exists = os.path.exists(timeline_log_path)
-            timeline_mode = 'a' if timeline_file_exists else 'w'
-            self._timeline_file_handle = open(timeline_log_path, timeline_mode, newline='', encoding='utf-8')
-            self._active_timeline_writer = csv.writer(self._timeline_file_handle)
-            
-            if not timeline_file_exists:
-                self._active_timeline_writer.writerow([
-                    'Encounter_Milestone',
-                    'Timestamp',
-                    'Cumulative_Shinies_Encountered',
-                    'Cumulative_Shinies_Caught',
-                    'Cumulative_Shinies_Missed',
-                    'Unique_Shinies_Caught',
-                    'Unique_Normals_Encountered',
-                    'Current_EPS',
-                    'Current_SPS',
-                    'Elapsed_Seconds'
-                ])
-            
             # Check if already completed
-            if len(self.shiny_dex) >= self.total_pokemon:
+            if self.unique_shinies >= self.total_pokemon:
                 print("✓ Simulation already completed.")
-                self._shiny_file_handle.close()
-                self._timeline_file_handle.close()
+                self._close_logs()
                 self.output_final_reports()
                 return
 
-            print(f"Starting encounter loop...")
+            print(f"Starting encounter loop ({self.engine} engine)...")
             print(f"Target: {self.total_pokemon} unique shiny Pokémon")
             print(f"Logging timeline every {self.TIMELINE_LOG_INTERVAL:,} encounters")
+            print(f"Checkpointing every {self.CHECKPOINT_SECONDS / 60:g} minutes")
             print(f"Press Ctrl+C to pause and save\n")
+            self._start_instrumentation()
+            if self.engine != 'event':
+                self.next_shiny_encounter = 0  # Only the event engine draws shinies ahead
 
-            # Main simulation loop
-            while len(self.shiny_dex) < self.total_pokemon:
-                self.run_encounter()
-                
-                if self.total_encounter % self.PROGRESS_UPDATE_INTERVAL == 0:
-                    self._display_progress()
-                
-                if self.total_encounter % self.CHECKPOINT_INTERVAL == 0:
-                    self.save_checkpoint()
+            # Main simulation loop; leaving it other than at a safe point leaves the state mid-span
+            self._state_consistent = False
+            with self._deferred_interrupts():
+                self._start_monitor()
+                try:
+                    if self.engine == 'batch':
+                        self._run_batch_loop()
+                    elif self.engine == 'event':
+                        self._run_event_loop()
+                    elif self.engine == 'sharded':
+                        self._run_sharded_loop()
+                    else:
+                        self._run_scalar_loop()
+                finally:
+                    self._stop_monitor()
+            self._state_consistent = True
             
-            print("\n\n" + "="*60)
-            print("🎉 SIMULATION COMPLETE! 🎉")
-            print("="*60)
+            if self.unique_shinies < self.total_pokemon:
+                print("\n⚠ Simulation paused by user.")
+            else:
+                print("\n\n" + "="*60)
+                print("🎉 SIMULATION COMPLETE! 🎉")
+                print("="*60)
             
             # Final flush
-            self._flush_shiny_buffer()
-            self._flush_timeline_buffer()
-            self._shiny_file_handle.close()
-            self._timeline_file_handle.close()
+            self._close_logs()
         
         except KeyboardInterrupt:
-            print("\n\n⚠ Simulation paused by user.")
-            if self._shiny_file_handle:
-                self._shiny_file_handle.close()
-            if self._timeline_file_handle:
-                self._timeline_file_handle.close()
+            print("\n\n⚠ Simulation stopped immediately.")
+            self._close_logs()
         
         finally:
-            self._active_shiny_writer = None
-            self._active_timeline_writer = None
-            
+            try:
+                self._close_logs()
+            finally:
+                self._finish_run()
+
+    def _finish_run(self):
+        """Saves the final checkpoint and reports, unless the run stopped between safe points."""
+        if not self._state_consistent:
+            # Stopped mid-span or mid-block: counters, boxes and generators disagree
+            self._stop_instrumentation()
+            if os.path.exists(self.CHECKPOINT_FILE):
+                print("\n⚠ Kept the last checkpoint on disk; resuming continues from it.")
+            else:
+                print("\n⚠ No checkpoint was saved yet; the next start begins fresh.")
+        else:
             print("\nSaving checkpoint...")
-            self.save_checkpoint()
+            self.save_checkpoint(resolve_pending=False)
+            self._stop_instrumentation()
+            self.export_checkpoint_json()
             self.output_final_reports()
+            if self.WRITE_SHINY_CSV:
+                self.export_shiny_csv()
             
             # Final stats display
             current_session_seconds = time.time() - self.start_time
@@ -873,6 +1975,85 @@ class ShinySimulation:
             print("="*60 + "\n")
 
 
+def main():
+    parser = argparse.ArgumentParser(description="Simulate shiny hunting until every Pokémon is caught.")
+    parser.add_argument('--resume', metavar='NAME', help="Resume a registered run ('last' for the last active run)")
+    parser.add_argument('--run', metavar='NAME', help="Start or continue the named run without prompts")
+    parser.add_argument('--modifier', choices=list(ShinySimulation.SHINY_RATES), help="Shiny rate (default: standard)")
+    parser.add_argument('--guaranteed', action=argparse.BooleanOptionalAction, default=None,
+                        help="Use a 100%% catch rate (--no-guaranteed switches a registered run back to normal catch)")
+    parser.add_argument('--engine', choices=list(ShinySimulation.ENGINES), help="Encounter engine (default: scalar)")
+    parser.add_argument('--stability', type=float, help="Spawn-weight stability constant (default: 100)")
+    parser.add_argument('--rarity', type=float, help="Spawn-weight rarity exponent (default: 1.8)")
+    parser.add_argument('--seed', type=int, default=None, help="Seed for a reproducible run")
+    parser.add_argument('--excel', default='Pokemon Stats.xlsx', help="Pokédex source file")
+    parser.add_argument('--analytic', action='store_true', help="Write expected-value reports instead of simulating; never prompts, so needs --resume or --run")
+    parser.add_argument('--metrics', choices=metrics.EXPORT_FORMATS, default=None,
+                        help="Export rolling EPS/SPS and section timings to reports/<run>/metrics.prom or .jsonl")
+    parser.add_argument('--profile', action='store_true', help="Run the sampling profiler (reports/<run>/profile.folded)")
+    parser.add_argument('--shiny-csv', action=argparse.BooleanOptionalAction, default=True,
+                        help="Export shiny_analysis_log.csv from the binary shiny log when the run stops (default: on)")
+    parser.add_argument('--headless', action='store_true', help="Never prompt; fail if --resume or --run is missing")
+    args = parser.parse_args()
+
+    if args.resume and args.run:
+        parser.error("use either --resume or --run, not both")
+
+    settings = None
+    try:
+        if args.resume:
+            settings = ShinySimulation.resume_settings(args.resume)
+        elif args.run:
+            # Continuing a registered run keeps its settings unless they are given explicitly
+            registry = ShinySimulation._load_run_registry()
+            info = registry['runs'].get(args.run, {})
+            settings = {
+                'run_name': args.run,
+                'shiny_modifier': info.get('shiny_modifier', 'standard'),
+                'guaranteed_catch': info.get('guaranteed_catch', False),
+                'engine': info.get('engine', 'scalar'),
+                'stability_constant': info.get('stability_constant', 100),
+                'rarity_exponent': info.get('rarity_exponent', 1.8)
+            }
+        elif args.headless or args.analytic:
+            parser.error(f"--{'analytic' if args.analytic else 'headless'} needs --resume or --run")
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if settings is None:
+        spawn_model = {key: value for key, value in (('stability_constant', args.stability),
+                                                     ('rarity_exponent', args.rarity)) if value is not None}
+        simulation = ShinySimulation(excel_path=args.excel, seed=args.seed, metrics_format=args.metrics,
+                                     profile=args.profile, **spawn_model)
+    else:
+        if args.modifier:
+            settings['shiny_modifier'] = args.modifier
+        if args.guaranteed is not None:
+            settings['guaranteed_catch'] = args.guaranteed
+        if args.engine:
+            settings['engine'] = args.engine
+        if args.stability is not None:
+            settings['stability_constant'] = args.stability
+        if args.rarity is not None:
+            settings['rarity_exponent'] = args.rarity
+        try:
+            simulation = ShinySimulation(excel_path=args.excel, seed=args.seed, metrics_format=args.metrics,
+                                         profile=args.profile, **settings)
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+    
+    simulation.WRITE_SHINY_CSV = args.shiny_csv
+    if args.analytic:
+        simulation.output_analytic_reports()
+    else:
+        try:
+            simulation.run()
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+
+
 if __name__ == "__main__":
-    simulation = ShinySimulation()
-    simulation.run()
\ No newline at end of file
+    main()
\ No newline at end of file
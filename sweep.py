@@ -0,0 +1,233 @@
+# Required libraries: pip install pandas openpyxl numpy
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import numpy as np
+
+import pokedata
+from checkpoint import write_atomic
+from parallel import REPLICATE_ENGINES, _run_replicate, check_replicate_engine
+from prediction import expected_completion_encounters, completion_percentiles
+from simulator import ShinySimulation
+
+
+def manifest_path(name, reports_dir='reports'):
+    """Where a sweep keeps its grid, screening results and replicate status."""
+    return os.path.join(reports_dir, 'sweeps', f"{name}.json")
+
+
+def _save_manifest(manifest, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_atomic(path, json.dumps(manifest, indent=4).encode('utf-8'))
+
+
+def screen_point(base_columns, stability, rarity, shiny_modifier, guaranteed_catch):
+    """Analytic completion estimate for one grid point. Returns (expected, P90) encounters."""
+    base_totals = base_columns['base_total'].astype(np.float64)
+    spawn_weights = 1 / ((base_totals + stability) ** rarity)
+    catch_probabilities = np.ones(len(spawn_weights)) if guaranteed_catch else base_columns['catch_probability']
+    probabilities = (spawn_weights / spawn_weights.sum()) * catch_probabilities * ShinySimulation.SHINY_RATES[shiny_modifier]
+    p90 = completion_percentiles(probabilities, (0.9,))[0.9]
+    return expected_completion_encounters(probabilities), p90
+
+
+def build_manifest(name, stabilities, rarities, modifiers, catch_modes, runs, engine, seed,
+                   max_expected, excel_path):
+    """Screens every grid point analytically and lays out the replicates for the selected ones."""
+    base_columns, _ = pokedata.load_pokedex(excel_path)
+    seed_seq = np.random.SeedSequence(seed)
+
+    points = []
+    grid = itertools.product(stabilities, rarities, modifiers, catch_modes)
+    for i, (stability, rarity, modifier, guaranteed) in enumerate(grid):
+        expected, p90 = screen_point(base_columns, stability, rarity, modifier, guaranteed)
+        selected = max_expected is None or expected <= max_expected
+        point_id = f"p{i:03d}"
+        points.append({
+            'point': point_id,
+            'stability_constant': stability,
+            'rarity_exponent': rarity,
+            'shiny_modifier': modifier,
+            'guaranteed_catch': guaranteed,
+            'expected_encounters': expected,
+            'p90_encounters': p90,
+            'selected': selected,
+            'replicates': {f"{name}_{point_id}_r{j:03d}": {'status': 'pending', 'results': None}
+                           for j in range(1, runs + 1)} if selected else {}
+        })
+
+    return {
+        'name': name,
+        'created': datetime.now().isoformat(),
+        'engine': engine,
+        'excel_path': excel_path,
+        'seed_entropy': seed_seq.entropy,
+        'max_expected': max_expected,
+        'points': points
+    }
+
+
+def _print_screening(manifest):
+    print("\n" + "="*60)
+    print("ANALYTIC SCREENING")
+    print("="*60)
+    for point in manifest['points']:
+        marker = "✓" if point['selected'] else "-"
+        print(f"{marker} {point['point']}: stability {point['stability_constant']:g}, rarity {point['rarity_exponent']:g}, "
+              f"{point['shiny_modifier']}, {'guaranteed' if point['guaranteed_catch'] else 'normal'} | "
+              f"E[T] {point['expected_encounters']:,.0f} | P90 {point['p90_encounters']:,.0f}")
+    selected = sum(point['selected'] for point in manifest['points'])
+    print(f"\n{selected}/{len(manifest['points'])} point(s) selected for simulation")
+    print("="*60 + "\n")
+
+
+def _replicate_task(manifest, point_index, replicate_index, run_name, point, reports_dir):
+    # Seeds depend only on the sweep entropy and grid position, so a resumed sweep reuses them
+    seed = np.random.SeedSequence(manifest['seed_entropy'], spawn_key=(point_index, replicate_index))
+    return {
+        'run_name': run_name,
+        'shiny_modifier': point['shiny_modifier'],
+        'guaranteed_catch': point['guaranteed_catch'],
+        'engine': manifest['engine'],
+        'seed': seed,
+        'excel_path': manifest['excel_path'],
+        'reports_dir': reports_dir,
+        'stability_constant': point['stability_constant'],
+        'rarity_exponent': point['rarity_exponent']
+    }
+
+
+def run_sweep(name, stabilities=(100,), rarities=(1.8,), modifiers=('standard',), catch_modes=(False,),
+              runs=1, engine='event', workers=None, seed=None, max_expected=None, screen_only=False,
+              excel_path='Pokemon Stats.xlsx', reports_dir='reports'):
+    """
+    Runs a parameter sweep over (stability constant, rarity exponent, shiny modifier, catch mode).
+    Every grid point is screened analytically; replicates of the selected points run on a
+    process pool. Progress is kept in a manifest, so rerunning the same sweep name resumes it.
+    Returns the manifest.
+    """
+    path = manifest_path(name, reports_dir)
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            manifest = json.load(f)
+        print(f"✓ Resuming sweep '{name}' from {path} (grid and seeds come from the manifest)")
+    else:
+        manifest = build_manifest(name, stabilities, rarities, modifiers, catch_modes, runs, engine,
+                                  seed, max_expected, excel_path)
+        _save_manifest(manifest, path)
+
+    _print_screening(manifest)
+    if screen_only:
+        return manifest
+    check_replicate_engine(manifest['engine'])
+
+    tasks = {}
+    for point_index, point in enumerate(manifest['points']):
+        for replicate_index, (run_name, replicate) in enumerate(point['replicates'].items()):
+            if replicate['status'] != 'done':
+                tasks[run_name] = (point, _replicate_task(manifest, point_index, replicate_index,
+                                                          run_name, point, reports_dir))
+
+    workers = workers or os.cpu_count()
+    print(f"Running {len(tasks)} replicate(s) on {workers} worker(s)...")
+    start_time = time.time()
+    registry_entries = {}
+
+    def record(run_name, run_results, registry_entry):
+        point = tasks[run_name][0]
+        if run_results and run_results['Completion_Status'] == 'Complete':
+            run_results = dict(run_results, Sweep_Name=name, Sweep_Point=point['point'])
+            point['replicates'][run_name] = {'status': 'done', 'results': run_results}
+            print(f"✓ {run_name}: {run_results['Total_Encounters']:,} encounters")
+        registry_entries[run_name] = registry_entry
+        _save_manifest(manifest, path)
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    futures = {executor.submit(_run_replicate, task): run_name for run_name, (_, task) in tasks.items()}
+    try:
+        for future in as_completed(futures):
+            try:
+                record(*future.result())
+            except Exception as e:
+                print(f"❌ {futures[future]} failed: {e}")
+        executor.shutdown()
+    except KeyboardInterrupt:
+        # Workers checkpoint their own runs; a rerun of this sweep picks them up where they stopped
+        print("\n\n⚠ Sweep paused by user. Recording finished replicates...")
+        executor.shutdown(wait=True, cancel_futures=True)
+        for future in futures:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                record(*future.result())
+
+    if registry_entries:
+        ShinySimulation._register_runs(registry_entries)
+
+    rows = [replicate['results'] for point in manifest['points']
+            for replicate in point['replicates'].values() if replicate['status'] == 'done']
+    ShinySimulation.merge_master_results(rows)
+
+    _print_sweep_summary(manifest)
+    print(f"✓ Merged {len(rows)} sweep row(s) into {ShinySimulation.MASTER_RESULTS}")
+    print(f"  Wall Time: {(time.time() - start_time) / 3600:.2f} hours")
+    return manifest
+
+
+def _print_sweep_summary(manifest):
+    print("\n" + "="*60)
+    print("SWEEP RESULTS")
+    print("="*60)
+    for point in manifest['points']:
+        if not point['selected']:
+            continue
+        done = [replicate['results']['Total_Encounters'] for replicate in point['replicates'].values()
+                if replicate['status'] == 'done']
+        if done:
+            mean = np.mean(done)
+            print(f"{point['point']}: {len(done)}/{len(point['replicates'])} done | "
+                  f"mean {mean:,.0f} vs E[T] {point['expected_encounters']:,.0f} "
+                  f"({(mean / point['expected_encounters'] - 1) * 100:+.2f}%)")
+        else:
+            print(f"{point['point']}: 0/{len(point['replicates'])} done")
+    print("="*60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep the spawn model and shiny-rate settings.")
+    parser.add_argument('--name', required=True, help="Sweep name; rerun with the same name to resume")
+    parser.add_argument('--stability', type=float, nargs='+', default=[100], help="Stability constants")
+    parser.add_argument('--rarity', type=float, nargs='+', default=[1.8], help="Rarity exponents")
+    parser.add_argument('--modifier', nargs='+', default=['standard'], choices=list(ShinySimulation.SHINY_RATES))
+    parser.add_argument('--catch', nargs='+', default=['normal'], choices=['normal', 'guaranteed'])
+    parser.add_argument('--runs', type=int, default=1, help="Replicates per selected point")
+    parser.add_argument('--engine', default='event', choices=list(REPLICATE_ENGINES))
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--seed', type=int, default=None, help="Root seed for the sweep")
+    parser.add_argument('--max-expected', type=float, default=None,
+                        help="Only simulate points whose analytic E[T] is at most this many encounters")
+    parser.add_argument('--screen-only', action='store_true', help="Print the analytic screening and stop")
+    parser.add_argument('--excel', default='Pokemon Stats.xlsx')
+    args = parser.parse_args()
+
+    run_sweep(
+        args.name,
+        stabilities=args.stability,
+        rarities=args.rarity,
+        modifiers=args.modifier,
+        catch_modes=[mode == 'guaranteed' for mode in args.catch],
+        runs=args.runs,
+        engine=args.engine,
+        workers=args.workers,
+        seed=args.seed,
+        max_expected=args.max_expected,
+        screen_only=args.screen_only,
+        excel_path=args.excel
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import json
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from simulator import ShinySimulation
+
+CATCH_RATES = (3, 45, 120, 255)
+
+
+@pytest.fixture
+def pokedex_path(tmp_path):
+    """A 40-species pokedex, small enough that every engine finishes a run in seconds."""
+    path = tmp_path / 'pokedex.json'
+    rows = [{'name': f"Mon{i}", 'pokedex number': i, 'Catch Rate': CATCH_RATES[i % 4], 'base_total': 250 + 10 * i}
+            for i in range(1, 41)]
+    path.write_text(json.dumps({'Pokedex': rows}))
+    return str(path)
+
+
+@pytest.fixture
+def make_simulation(pokedex_path, tmp_path):
+    """Builds headless simulations on the test pokedex, with small blocks so runs have many safe points."""
+    def make(run_name, engine, seed=5, guaranteed_catch=False):
+        simulation = ShinySimulation(excel_path=pokedex_path, reports_dir=str(tmp_path / 'reports'),
+                                     run_name=run_name, shiny_modifier='both', guaranteed_catch=guaranteed_catch,
+                                     engine=engine, seed=seed, save_master_results=False, register_run=False)
+        simulation.TIMELINE_LOG_INTERVAL = 1000
+        simulation.BATCH_SIZE = 10_000
+        simulation.SHARD_BLOCK_SIZE = 50_000
+        simulation.SHARD_WORKERS = 2
+        return simulation
+    return make
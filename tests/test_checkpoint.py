@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+import checkpoint
+
+
+def _sample():
+    state = {'total_encounter': 123_456_789, 'run_name': 'test', 'rng': {'numpy': {'state': 2 ** 100}}}
+    species = ['Bulbasaur', 'Ivysaur', 'Venusaur', 'Charmander', 'Charmeleon']
+    arrays = {
+        'shiny_dex': checkpoint.pack_bitset([True, False, True, False, False]),
+        'normal_dex': checkpoint.pack_bitset([True, True, True, False, True]),
+        'shiny_box_counts': np.array([3, 0, 1, 0, 0], dtype=np.int64),
+        'normal_box_counts': np.array([10, 2 ** 40, 7, 0, 1], dtype=np.int64),
+        'spawn_weight': np.linspace(0.1, 0.5, 5)
+    }
+    return state, species, arrays
+
+
+def test_round_trip(tmp_path):
+    state, species, arrays = _sample()
+    path = str(tmp_path / 'checkpoint.bin')
+    checkpoint.write_checkpoint(path, state, species, arrays)
+
+    read_state, read_species, read_arrays = checkpoint.read_checkpoint(path)
+    assert read_state == state
+    assert read_species == species
+    assert list(read_arrays) == list(arrays)
+    for name, array in arrays.items():
+        assert read_arrays[name].dtype == array.dtype
+        np.testing.assert_array_equal(read_arrays[name], array)
+
+
+def test_bitset_round_trip():
+    flags = np.random.default_rng(1).random(1000) < 0.3
+    np.testing.assert_array_equal(checkpoint.unpack_bitset(checkpoint.pack_bitset(flags), len(flags)), flags)
+
+
+def test_truncated_checkpoint(tmp_path):
+    path = tmp_path / 'checkpoint.bin'
+    data = checkpoint.encode_checkpoint(*_sample())
+    path.write_bytes(data[:-8])
+    with pytest.raises(checkpoint.CheckpointError, match='truncated'):
+        checkpoint.read_checkpoint(str(path))
+
+
+def test_not_a_checkpoint(tmp_path):
+    path = tmp_path / 'checkpoint.bin'
+    path.write_bytes(b'{"total_encounter": 1}')
+    with pytest.raises(checkpoint.CheckpointError):
+        checkpoint.read_checkpoint(str(path))
+
+
+def test_json_export():
+    exported = checkpoint.checkpoint_to_json(*_sample())
+    assert exported['shiny_dex'] == ['Bulbasaur', 'Venusaur']
+    assert exported['normal_dex'] == ['Bulbasaur', 'Ivysaur', 'Venusaur', 'Charmeleon']
+    assert exported['shiny_box_counts'] == {'Bulbasaur': 3, 'Venusaur': 1}
+    assert exported['total_encounter'] == 123_456_789
+
+
+def test_write_atomic_cleans_up_after_a_failed_write(tmp_path, monkeypatch):
+    path = tmp_path / 'data.bin'
+    checkpoint.write_atomic(str(path), b'old')
+
+    def fail(src, dst):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(checkpoint.os, 'replace', fail)
+    with pytest.raises(OSError, match='disk full'):
+        checkpoint.write_atomic(str(path), b'new')
+    assert path.read_bytes() == b'old'
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['data.bin']
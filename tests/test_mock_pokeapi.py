@@ -0,0 +1,56 @@
+import json
+import os
+
+import pandas as pd
+
+from mock_pokeapi import MockPokeAPI, fixtures_from_database
+from pokeapi import PokemonDataScraper
+
+DATABASE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'pokemon_complete_database.csv')
+
+
+def _body(bodies, path):
+    return json.loads(bodies[path])
+
+
+def test_forms_share_their_species_and_chain():
+    names, bodies = fixtures_from_database(DATABASE)
+    species_urls = {name: _body(bodies, f"pokemon/{name}")['species']['url'] for name in names}
+    assert species_urls['rotom-wash'] == species_urls['rotom-heat'] == species_urls['rotom']
+    assert species_urls['deoxys-attack'] == species_urls['deoxys-normal']
+    assert species_urls['bulbasaur'] != species_urls['ivysaur']
+
+    bulbasaur = _body(bodies, 'pokemon-species/1')
+    ivysaur = _body(bodies, 'pokemon-species/2')
+    assert bulbasaur['evolution_chain'] == ivysaur['evolution_chain']
+    chain = _body(bodies, 'evolution-chain/1')['chain']
+    assert chain['species']['name'] == 'bulbasaur'
+    assert chain['evolves_to'][0]['species']['name'] == 'ivysaur'
+    assert chain['evolves_to'][0]['evolves_to'][0]['species']['name'] == 'venusaur'
+
+    # One species per default form; alternate forms have ids above 10000
+    database = pd.read_csv(DATABASE)
+    assert sum(path.startswith('pokemon-species/') for path in bodies) == (database['id'] < 10000).sum()
+
+
+def test_spreadsheet_booleans():
+    _, bodies = fixtures_from_database(DATABASE, 151)
+    mewtwo = _body(bodies, 'pokemon-species/150')
+    bulbasaur = _body(bodies, 'pokemon-species/1')
+    assert mewtwo['is_legendary'] is True
+    assert bulbasaur['is_legendary'] is False
+    versions = {index['version']['url'].rstrip('/').rsplit('/', 1)[1]
+                for index in _body(bodies, 'pokemon/bulbasaur')['game_indices']}
+    assert '1' in versions and '38' not in versions  # In red, not in scarlet
+
+
+def test_scrape_fetches_each_species_and_chain_once(tmp_path):
+    names, bodies = fixtures_from_database(DATABASE, 60)
+    species = sum(path.startswith('pokemon-species/') for path in bodies)
+    chains = sum(path.startswith('evolution-chain/') for path in bodies)
+    with MockPokeAPI(names, bodies) as api:
+        scraper = PokemonDataScraper(base_url=api.base_url, max_workers=8, requests_per_second=0, cache_mode='off')
+        scraper.scrape_all_pokemon(output=str(tmp_path / 'scraped.csv'))
+    assert chains < species
+    assert scraper.stats['requests'] == 1 + len(names) + species + chains
+    assert scraper.stats['memo_hits'] == 2 * len(names) - species - chains
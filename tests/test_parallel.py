@@ -0,0 +1,22 @@
+import os
+
+import pytest
+
+from parallel import _run_replicate, run_replicates
+
+
+def test_replicates_reject_the_sharded_engine(tmp_path):
+    with pytest.raises(ValueError, match='sharded'):
+        run_replicates('sharded', 2, engine='sharded', reports_dir=str(tmp_path))
+
+
+def test_replicate_log_keeps_milestones_only(pokedex_path, tmp_path):
+    task = {'run_name': 'replicate', 'shiny_modifier': 'both', 'guaranteed_catch': False, 'engine': 'scalar',
+            'seed': 3, 'excel_path': pokedex_path, 'reports_dir': str(tmp_path)}
+    _, run_results, _ = _run_replicate(task)
+    assert run_results['Completion_Status'] == 'Complete'
+
+    with open(os.path.join(str(tmp_path), 'replicate', 'console.log'), 'r', encoding='utf-8') as f:
+        log = f.read()
+    assert log.count('Gotcha!') == 40
+    assert '_Enc:' not in log
@@ -0,0 +1,32 @@
+import os
+import threading
+
+import numpy as np
+
+from pokedata import load_pokedex
+
+
+def test_concurrent_cold_cache_loads(pokedex_path):
+    results, errors = [], []
+
+    def load():
+        try:
+            results.append(load_pokedex(pokedex_path, supplements=[]))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=load) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    for columns, _ in results:
+        np.testing.assert_array_equal(columns['spawn_weight'], results[0][0]['spawn_weight'])
+    columns, from_cache = load_pokedex(pokedex_path, supplements=[])
+    assert from_cache
+    # Every temp file was renamed into place
+    cache_dir = os.path.dirname(pokedex_path)
+    leftovers = [name for _, _, files in os.walk(cache_dir) for name in files if name.endswith('.tmp')]
+    assert leftovers == []
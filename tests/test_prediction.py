@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from prediction import (CompletionEstimator, expected_completion_encounters, completion_percentiles, completion_cdf,
+                        last_event_moments)
+
+
+def _probabilities(count=300, seed=7):
+    """Dex-like per-encounter probabilities spanning several orders of magnitude."""
+    rng = np.random.default_rng(seed)
+    weights = 1 / (rng.integers(200, 700, count) + 100.0) ** 1.8
+    catch = rng.choice([3, 45, 120, 255], count) / 255
+    return weights / weights.sum() * catch / 4096
+
+
+def test_uniform_matches_closed_form():
+    # Equal probabilities p: E[T] = H_n / p for the Poissonized collector
+    n, p = 50, 1e-4
+    harmonic = sum(1 / k for k in range(1, n + 1))
+    assert expected_completion_encounters([p] * n) == pytest.approx(harmonic / p, rel=1e-3)
+
+
+def test_empty_and_zero_probabilities():
+    assert expected_completion_encounters([]) == 0
+    assert expected_completion_encounters([0.0, 0.0]) == 0
+    assert expected_completion_encounters([1e-3, 0.0]) == pytest.approx(expected_completion_encounters([1e-3]))
+
+
+def test_estimator_tracks_the_full_expectation():
+    probabilities = _probabilities()
+    estimator = CompletionEstimator(dict(enumerate(probabilities.tolist())))
+    assert estimator.expected_remaining == pytest.approx(expected_completion_encounters(probabilities), rel=1e-3)
+
+    # Collect the common items first, as a run does, and compare at several points
+    order = np.argsort(probabilities)[::-1]
+    remaining = np.ones(len(probabilities), dtype=bool)
+    for count, key in enumerate(order[:-1].tolist(), start=1):
+        estimator.remove(key)
+        remaining[key] = False
+        if count % 50 == 0 or count == len(order) - 1:
+            expected = expected_completion_encounters(probabilities[remaining])
+            assert estimator.expected_remaining == pytest.approx(expected, rel=1e-3), count
+
+    estimator.remove(int(order[-1]))
+    assert estimator.expected_remaining == 0
+
+
+def test_estimator_ignores_repeat_removals():
+    probabilities = _probabilities(20)
+    estimator = CompletionEstimator(dict(enumerate(probabilities.tolist())))
+    estimator.remove(3)
+    once = estimator.expected_remaining
+    estimator.remove(3)
+    assert estimator.expected_remaining == once
+
+
+def test_percentiles_bracket_the_mean():
+    probabilities = _probabilities()
+    mean = expected_completion_encounters(probabilities)
+    percentiles = completion_percentiles(probabilities, (0.1, 0.5, 0.9))
+    assert percentiles[0.1] < mean < percentiles[0.9]
+    assert percentiles[0.1] < percentiles[0.5] < percentiles[0.9]
+
+
+def test_cdf_is_the_product_of_per_item_catches():
+    probabilities = [1e-3, 5e-4, 2e-4]
+    encounters = [10, 1000, 20_000]
+    expected = [np.prod([1 - (1 - p) ** n for p in probabilities]) for n in encounters]
+    np.testing.assert_allclose(completion_cdf(probabilities, encounters), expected, rtol=1e-12)
+
+
+def test_last_event_matches_monte_carlo():
+    # T is the last of three exponential waits; each stream's last event before T, given it has one
+    probabilities = np.array([0.01, 0.004, 0.002])
+    rates = np.array([0.05, 0.003, 0.0005])
+    mean, variance = last_event_moments(probabilities, rates)
+
+    rng = np.random.default_rng(1)
+    t = rng.exponential(1 / probabilities, (400_000, 3)).max(axis=1)
+    for j, rate in enumerate(rates):
+        gap = rng.exponential(1 / rate, len(t))
+        last = (t - gap)[gap <= t]
+        assert mean[j] == pytest.approx(last.mean(), rel=0.01), rate
+        assert variance[j] ** 0.5 == pytest.approx(last.std(), rel=0.01), rate
@@ -0,0 +1,162 @@
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+import checkpoint
+import shinylog
+
+from conftest import ROOT
+from simulator import ShinySimulation
+
+TIMELINE_COLUMNS = ['Encounter_Milestone', 'Cumulative_Shinies_Encountered', 'Cumulative_Shinies_Caught',
+                    'Cumulative_Shinies_Missed', 'Unique_Shinies_Caught', 'Unique_Normals_Encountered']
+
+
+def _ctrl_c_at(simulation, encounter):
+    """Sends SIGINT to this process, as Ctrl+C does, once the run has passed `encounter`."""
+    def watch():
+        while simulation.total_encounter < encounter:
+            time.sleep(0.0005)
+        os.kill(os.getpid(), signal.SIGINT)
+
+    watcher = threading.Thread(target=watch, daemon=True)
+    watcher.start()
+    return watcher
+
+
+def _outputs(simulation):
+    """The run's deterministic outputs: state, shiny log, per-species summary and timeline counters."""
+    with open(simulation.SHINY_LOG_FILE, 'rb') as f:
+        shiny_log = f.read()
+    summary = pd.read_csv(os.path.join(simulation.REPORTS_DIR, 'encounter_summary.csv'))
+    timeline = pd.read_csv(os.path.join(simulation.REPORTS_DIR, 'encounter_timeline.csv'))[TIMELINE_COLUMNS]
+    state = (simulation.total_encounter, simulation.total_shinies_encountered, simulation.total_shinies_caught,
+             simulation.unique_shinies, simulation.shiny_box_counts.tolist(), simulation.normal_box_counts.tolist())
+    return state, shiny_log, summary, timeline
+
+
+@pytest.mark.parametrize('engine', list(ShinySimulation.ENGINES))
+def test_pause_and_resume_matches_uninterrupted_run(make_simulation, engine):
+    guaranteed_catch = engine == 'scalar'  # Keeps the scalar run short
+    full = make_simulation('full', engine, guaranteed_catch=guaranteed_catch)
+    full.run()
+    assert full.unique_shinies == full.total_pokemon
+
+    paused = make_simulation('paused', engine, guaranteed_catch=guaranteed_catch)
+    watcher = _ctrl_c_at(paused, full.total_encounter // 10)
+    paused.run()
+    watcher.join()
+    assert 0 < paused.total_encounter < full.total_encounter
+    assert paused.unique_shinies < paused.total_pokemon
+
+    # A fresh process would pass a different seed; the checkpoint's generator state must win
+    resumed = make_simulation('paused', engine, seed=99, guaranteed_catch=guaranteed_catch)
+    resumed.run()
+
+    full_state, full_log, full_summary, full_timeline = _outputs(full)
+    state, shiny_log, summary, timeline = _outputs(resumed)
+    assert state == full_state
+    assert shiny_log == full_log
+    pd.testing.assert_frame_equal(summary, full_summary)
+    pd.testing.assert_frame_equal(timeline, full_timeline)
+    with open(resumed.SHINY_LOG_CSV) as paused_csv, open(full.SHINY_LOG_CSV) as full_csv:
+        assert paused_csv.read() == full_csv.read()
+
+
+
+def _paused_run(make_simulation):
+    paused = make_simulation('paused', 'batch')
+    watcher = _ctrl_c_at(paused, 500_000)
+    paused.run()
+    watcher.join()
+    assert paused.total_encounter >= 500_000 and paused.unique_shinies < paused.total_pokemon
+    return paused
+
+
+def test_resume_refuses_a_timeline_that_ends_before_the_checkpoint(make_simulation):
+    paused = _paused_run(make_simulation)
+    timeline_path = os.path.join(paused.REPORTS_DIR, 'encounter_timeline.csv')
+    with open(timeline_path, 'r', encoding='utf-8') as f:
+        header = f.readline()
+    with open(timeline_path, 'w', encoding='utf-8') as f:
+        f.write(header)
+    with open(paused.CHECKPOINT_FILE, 'rb') as f:
+        saved = f.read()
+
+    with pytest.raises(ValueError, match='encounter_timeline.csv ends at encounter 0'):
+        make_simulation('paused', 'batch').run()
+    with open(paused.CHECKPOINT_FILE, 'rb') as f:
+        assert f.read() == saved
+
+
+def test_resume_refuses_a_shiny_log_that_ends_before_the_checkpoint(make_simulation):
+    paused = _paused_run(make_simulation)
+    records, _ = shinylog.open_shiny_log(paused.SHINY_LOG_FILE)
+    dropped = len(records) // 2
+    del records
+    size = os.path.getsize(paused.SHINY_LOG_FILE)
+    os.truncate(paused.SHINY_LOG_FILE, size - dropped * shinylog.RECORD_DTYPE.itemsize)
+
+    with pytest.raises(ValueError, match='shiny_log.bin ends at encounter'):
+        make_simulation('paused', 'batch').run()
+
+
+def test_empty_timeline_gets_its_header(make_simulation):
+    simulation = make_simulation('fresh', 'batch')
+    os.makedirs(simulation.REPORTS_DIR)
+    open(os.path.join(simulation.REPORTS_DIR, 'encounter_timeline.csv'), 'w').close()
+    simulation.run()
+    timeline = pd.read_csv(os.path.join(simulation.REPORTS_DIR, 'encounter_timeline.csv'))
+    assert timeline['Encounter_Milestone'].iloc[0] == 1000
+
+
+KILLED_RUN = """
+import sys
+sys.path.insert(0, {root!r})
+from simulator import ShinySimulation
+simulation = ShinySimulation(excel_path={pokedex!r}, reports_dir={reports!r}, run_name='killed', shiny_modifier='both',
+                             engine='scalar', seed=5, save_master_results=False, register_run=False)
+simulation.TIMELINE_LOG_INTERVAL = 1000
+simulation.CHECKPOINT_SECONDS = 0.2
+simulation.run()
+"""
+
+
+def test_hard_kill_after_checkpoint_keeps_the_logs_it_covers(make_simulation, pokedex_path, tmp_path):
+    script = tmp_path / 'killed_run.py'
+    script.write_text(KILLED_RUN.format(root=ROOT, pokedex=pokedex_path, reports=str(tmp_path / 'reports')))
+    process = subprocess.Popen([sys.executable, str(script)], stdout=subprocess.DEVNULL)
+    checkpoint_path = tmp_path / 'reports' / 'killed' / 'checkpoint.bin'
+    deadline = time.monotonic() + 60
+    while not checkpoint_path.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.3)  # Let rows after the checkpoint pile up in the buffers too
+    assert process.poll() is None, "the run finished before it could be killed"
+    process.kill()
+    process.wait()
+
+    # Everything the checkpoint covers is on disk
+    state, _, _ = checkpoint.read_checkpoint(str(checkpoint_path))
+    records, _ = shinylog.open_shiny_log(str(checkpoint_path.with_name('shiny_log.bin')))
+    assert (records['encounter'] <= state['total_encounter']).sum() == state['total_shinies_encountered']
+    del records
+    timeline = pd.read_csv(checkpoint_path.with_name('encounter_timeline.csv'))
+    assert timeline['Encounter_Milestone'].tolist()[:state['total_encounter'] // 1000] == \
+        list(range(1000, state['total_encounter'] + 1, 1000))
+
+    full = make_simulation('full', 'scalar')
+    full.run()
+    resumed = make_simulation('killed', 'scalar', seed=99)
+    resumed.run()
+    full_state, full_log, full_summary, full_timeline = _outputs(full)
+    state, shiny_log, summary, timeline = _outputs(resumed)
+    assert state == full_state
+    assert shiny_log == full_log
+    pd.testing.assert_frame_equal(summary, full_summary)
+    pd.testing.assert_frame_equal(timeline, full_timeline)
@@ -0,0 +1,139 @@
+import csv
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+import pokeapi
+from mock_pokeapi import MockPokeAPI, fixtures_from_database
+from pokeapi import PokemonDataScraper, ScrapeError, TokenBucket
+
+DATABASE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'pokemon_complete_database.csv')
+COUNT = 30
+
+
+@pytest.fixture(scope='module')
+def fixtures():
+    return fixtures_from_database(DATABASE, COUNT)
+
+
+@pytest.fixture
+def api(fixtures):
+    names, bodies = fixtures
+    with MockPokeAPI(names, bodies) as api:
+        yield api
+
+
+def _scraper(api):
+    return PokemonDataScraper(base_url=api.base_url, max_workers=4, requests_per_second=0, max_retries=1,
+                              backoff=0.01, cache_mode='off')
+
+
+def _manifest(output):
+    with open(PokemonDataScraper.manifest_path(output), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_schema_matches_the_database(api, tmp_path):
+    output = str(tmp_path / 'scraped.csv')
+    df = _scraper(api).scrape_all_pokemon(output=output)
+
+    with open(DATABASE, 'r', newline='', encoding='utf-8') as f:
+        database_columns = next(csv.reader(f))
+    assert list(df.columns) == database_columns
+    assert df['name'].tolist() == api.names
+
+    # Fixtures were synthesized from the database, so the scraped values come back
+    database = pd.read_csv(DATABASE).head(COUNT)
+    for column in ('id', 'stat_total', 'capture_rate', 'evolution_chain_id', 'type_1', 'genus'):
+        assert df[column].tolist() == database[column].tolist(), column
+
+    manifest = _manifest(output)
+    assert {entry['status'] for entry in manifest['entries'].values()} == {'done'}
+    assert manifest['committed_bytes'] == os.path.getsize(output)
+
+
+def test_retries_injected_errors(fixtures, tmp_path):
+    names, bodies = fixtures
+    with MockPokeAPI(names, bodies, error_rate=0.2, seed=1) as api:
+        scraper = PokemonDataScraper(base_url=api.base_url, max_workers=4, requests_per_second=0, max_retries=8,
+                                     backoff=0.001, cache_mode='off')
+        df = scraper.scrape_all_pokemon(output=str(tmp_path / 'scraped.csv'))
+    assert api.stats['errors'] > 0
+    assert df['name'].tolist() == names
+
+
+def test_token_bucket_limits_the_rate():
+    bucket = TokenBucket(rate=200, capacity=5)
+    start = time.monotonic()
+    threads = [threading.Thread(target=lambda: [bucket.acquire() for _ in range(10)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # 40 tokens: a burst of 5, then 35 at 200 per second
+    assert time.monotonic() - start >= 35 / 200 * 0.9
+
+
+def test_resume_after_interrupt(api, tmp_path, monkeypatch):
+    monkeypatch.setattr(pokeapi, 'MANIFEST_SAVE_INTERVAL', 5)
+    complete = _scraper(api).scrape_all_pokemon(output=str(tmp_path / 'complete.csv'))
+
+    output = str(tmp_path / 'scraped.csv')
+    scraper = _scraper(api)
+    fetch = scraper.get_complete_pokemon_data
+    fetched = []
+
+    def interrupted_fetch(name):
+        fetched.append(name)
+        if len(fetched) > 12:
+            raise KeyboardInterrupt
+        return fetch(name)
+
+    scraper.get_complete_pokemon_data = interrupted_fetch
+    with pytest.raises(KeyboardInterrupt):
+        scraper.scrape_all_pokemon(output=output)
+
+    manifest = _manifest(output)
+    done = [name for name, entry in manifest['entries'].items() if entry['status'] == 'done']
+    assert 0 < len(done) < COUNT
+    assert manifest['committed_bytes'] == os.path.getsize(output)
+
+    # A partial row with a quoted multi-line field, as left by a crash mid-write
+    with open(output, 'a', encoding='utf-8') as f:
+        f.write('999,missingno,"line one\nline two')
+
+    resumed = _scraper(api)
+    df = resumed.scrape_all_pokemon(output=output)
+    pd.testing.assert_frame_equal(df, complete)
+    # Only the Pokémon that were not done are fetched again
+    scraped_again = resumed.stats['requests'] - 1  # Minus the listing
+    assert scraped_again <= 3 * (COUNT - len(done))
+    assert _manifest(output)['committed_bytes'] == os.path.getsize(output)
+
+
+def test_failed_pokemon_are_retried(api, tmp_path):
+    missing = api.names[4]
+    body = api.bodies.pop(f"pokemon/{missing}")  # Answered with 404
+    output = str(tmp_path / 'scraped.csv')
+    df = _scraper(api).scrape_all_pokemon(output=output)
+    assert missing not in df['name'].tolist()
+    assert _manifest(output)['entries'][missing]['status'] == 'failed'
+
+    api.bodies[f"pokemon/{missing}"] = body
+    scraper = _scraper(api)
+    df = scraper.scrape_all_pokemon(output=output)
+    assert df['name'].tolist() == api.names
+    assert scraper.stats['requests'] == 4  # Listing, pokemon, species and chain of the failed Pokémon only
+    assert _manifest(output)['entries'][missing]['status'] == 'done'
+
+
+def test_refuses_a_csv_it_did_not_write(api, tmp_path):
+    output = tmp_path / 'pokemon_complete_database.csv'
+    output.write_text('id,name\n1,bulbasaur\n')
+    with pytest.raises(ScrapeError, match='no manifest'):
+        _scraper(api).scrape_all_pokemon(output=str(output))
+    assert output.read_text() == 'id,name\n1,bulbasaur\n'
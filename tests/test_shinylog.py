@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import shinylog
+
+SPECIES = ['Bulbasaur', 'Ivysaur', 'Venusaur', 'Charmander']
+
+
+def _rows(count=500, seed=3):
+    """[encounter, species_id, caught, is_new_shiny] rows in encounter order."""
+    rng = np.random.default_rng(seed)
+    encounters = np.cumsum(rng.integers(1, 1000, count))
+    species = rng.integers(0, len(SPECIES), count)
+    caught = rng.random(count) < 0.6
+    seen = set()
+    rows = []
+    for encounter, species_id, is_caught in zip(encounters.tolist(), species.tolist(), caught.tolist()):
+        is_new = is_caught and species_id not in seen
+        if is_new:
+            seen.add(species_id)
+        rows.append([encounter, species_id, is_caught, is_new])
+    return rows
+
+
+def _write(path, rows):
+    writer = shinylog.ShinyLogWriter(path, SPECIES)
+    writer.append(rows)
+    writer.close()
+
+
+def _expected_stats(rows, max_encounter=None):
+    """Per-species stats computed row by row."""
+    stats = shinylog.empty_species_stats(len(SPECIES))
+    for encounter, species_id, caught, _ in rows:
+        if max_encounter is not None and encounter > max_encounter:
+            continue
+        stats['shiny_encountered'][species_id] += 1
+        if not stats['first_shiny_encounter'][species_id]:
+            stats['first_shiny_encounter'][species_id] = encounter
+        stats['last_shiny_encounter'][species_id] = encounter
+        if caught:
+            if not stats['first_shiny_catch'][species_id]:
+                stats['first_shiny_catch'][species_id] = encounter
+            stats['last_shiny_catch'][species_id] = encounter
+    return stats
+
+
+def test_write_read_round_trip(tmp_path):
+    path = str(tmp_path / 'shiny_log.bin')
+    rows = _rows()
+    _write(path, rows)
+
+    records, species = shinylog.open_shiny_log(path)
+    assert species == SPECIES
+    assert records['encounter'].tolist() == [row[0] for row in rows]
+    assert records['species'].tolist() == [row[1] for row in rows]
+    assert ((records['flags'] & shinylog.FLAG_CAUGHT) != 0).tolist() == [row[2] for row in rows]
+    assert ((records['flags'] & shinylog.FLAG_NEW_SHINY) != 0).tolist() == [row[3] for row in rows]
+
+
+@pytest.mark.parametrize('max_encounter', [None, 100_000])
+def test_species_stats(tmp_path, max_encounter):
+    path = str(tmp_path / 'shiny_log.bin')
+    rows = _rows()
+    _write(path, rows)
+
+    stats = shinylog.species_stats(path, max_encounter=max_encounter, chunk_records=64)
+    expected = _expected_stats(rows, max_encounter)
+    for field in shinylog.SPECIES_STAT_FIELDS:
+        np.testing.assert_array_equal(stats[field], expected[field], err_msg=field)
+
+
+def test_reopen_drops_records_past_the_checkpoint(tmp_path):
+    path = str(tmp_path / 'shiny_log.bin')
+    rows = _rows()
+    _write(path, rows)
+    with open(path, 'ab') as f:
+        f.write(b'\x01\x02\x03')  # Partial record from an interrupted write
+
+    checkpoint_encounter = rows[200][0]
+    writer = shinylog.ShinyLogWriter(path, SPECIES, max_encounter=checkpoint_encounter)
+    writer.close()
+    records, _ = shinylog.open_shiny_log(path)
+    assert records['encounter'].tolist() == [row[0] for row in rows[:201]]
+
+
+def test_reopen_with_other_species_order(tmp_path):
+    path = str(tmp_path / 'shiny_log.bin')
+    _write(path, _rows(10))
+    with pytest.raises(shinylog.ShinyLogError, match='species order'):
+        shinylog.ShinyLogWriter(path, SPECIES[::-1])
+
+
+def test_remap_species(tmp_path):
+    path = str(tmp_path / 'shiny_log.bin')
+    rows = _rows()
+    _write(path, rows)
+
+    new_order = ['Charmander', 'Venusaur', 'Bulbasaur']  # Ivysaur is no longer in the pokedex
+    dropped = shinylog.remap_species(path, new_order, chunk_records=64)
+    kept = [row for row in rows if SPECIES[row[1]] != 'Ivysaur']
+    assert dropped == len(rows) - len(kept)
+
+    records, species = shinylog.open_shiny_log(path)
+    assert species == new_order
+    assert records['encounter'].tolist() == [row[0] for row in kept]
+    assert [new_order[i] for i in records['species'].tolist()] == [SPECIES[row[1]] for row in kept]
+
+
+def test_csv_export(tmp_path):
+    path = str(tmp_path / 'shiny_log.bin')
+    csv_path = str(tmp_path / 'shiny_analysis_log.csv')
+    rows = _rows()
+    _write(path, rows)
+    shinylog.to_csv(path, csv_path)
+
+    frame = pd.read_csv(csv_path)
+    assert list(frame.columns) == shinylog.CSV_COLUMNS
+    assert frame['Encounter_Number'].tolist() == [row[0] for row in rows]
+    assert frame['Pokemon'].tolist() == [SPECIES[row[1]] for row in rows]
+    assert frame['Catch_Successful'].tolist() == [row[2] for row in rows]
+
+    # And back: importing the CSV rebuilds the same binary log
+    rebuilt = str(tmp_path / 'rebuilt.bin')
+    shinylog.import_csv(csv_path, rebuilt, SPECIES)
+    with open(path, 'rb') as original, open(rebuilt, 'rb') as copy:
+        assert original.read() == copy.read()